@@ -0,0 +1,343 @@
+import os
+import sys
+import json
+import hashlib
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import threading
+import subprocess
+
+import setup_vscode_extension as creator
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "setup_vscode_extension.py")
+DIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dist")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+
+# Launch commands compared by --startup: the plain script and both PyInstaller build profiles
+STARTUP_TARGETS = {
+    "script": [sys.executable, SCRIPT_PATH],
+    "onefile": [os.path.join(DIST_DIR, "vscode_extension_creator" + EXE_SUFFIX)],
+    "faststart": [os.path.join(DIST_DIR, "vscode_extension_creator_faststart", "vscode_extension_creator_faststart" + EXE_SUFFIX)]
+}
+
+# Tools that exist on a fresh build host before anything is provisioned
+BASE_STUBS = ["sudo", "apt-get", "brew", "curl", "wget", "tar", "unzip", "nvm"]
+
+# Binaries each system package provides, used by the apt-get/brew stubs
+PACKAGE_BINARIES = {
+    "maven": ["mvn"],
+    "ruby-full": ["ruby"],
+    "ruby": ["ruby"],
+    "php": ["php"],
+    "golang": ["go"],
+    "go": ["go"]
+}
+
+# Dispatcher shared by every stub executable. It sleeps for the configured latency, prints the
+# configured number of output lines, records the call and "installs" tools by creating more stubs.
+STUB_PROGRAM = r'''
+import os, sys, time, json
+
+tool, args = sys.argv[1], sys.argv[2:]
+stub_dir = os.environ["BENCH_STUB_DIR"]
+installed_dir = os.environ["BENCH_INSTALLED_DIR"]
+with open(os.path.join(stub_dir, "calls.log"), "a") as log:
+    log.write(json.dumps([tool] + args) + "\n")
+
+def install(*names):
+    for name in names:
+        path = os.path.join(installed_dir, name)
+        with open(os.path.join(stub_dir, "_template")) as template:
+            content = template.read().replace("__TOOL__", name)
+        with open(path, "w") as file:
+            file.write(content)
+        os.chmod(path, 0o755)
+
+def chatter(prefix):
+    time.sleep(float(os.environ.get("BENCH_STUB_LATENCY", "0.05")))
+    for i in range(int(os.environ.get("BENCH_STUB_OUTPUT_LINES", "200"))):
+        sys.stdout.write(f"{prefix}: {i} stub output line with some realistic padding to look like a progress log\n")
+
+if tool == "sudo":
+    # Checked before delegating to the tar stub, which would not know it is unpacking the dotnet SDK
+    if args[:1] == ["tar"] and "/usr/share/dotnet" in args:
+        chatter("tar")
+        install("dotnet")
+        sys.exit(0)
+    if args and os.path.exists(os.path.join(stub_dir, args[0])):
+        os.execv(os.path.join(stub_dir, args[0]), [args[0]] + args[1:])
+    sys.exit(0)
+
+if args[:1] in (["--version"], ["-version"], ["version"], ["-v"]):
+    print(f"{tool} 1.0.0-stub")
+elif tool in ("apt-get", "brew"):
+    chatter(tool)
+    if "install" in args:
+        packages = [arg for arg in args[args.index("install") + 1:] if not arg.startswith("-")]
+        for package in packages:
+            install(*json.loads(os.environ["BENCH_PACKAGE_BINARIES"]).get(package, [package]))
+elif tool == "nvm":
+    chatter(tool)
+    install("node", "npm")
+elif tool == "npm":
+    chatter(tool)
+    if args[:2] == ["install", "-g"]:
+        install("yo")
+    elif args[:1] == ["install"]:
+        for subdir in (".", "client", "server"):
+            modules = os.path.join(subdir, "node_modules", "stub-package")
+            os.makedirs(modules, exist_ok=True)
+            with open(os.path.join(modules, "index.js"), "w") as file:
+                file.write("module.exports = {};\n" * 200)
+elif tool == "node":
+    chatter(tool)
+    identifier = [arg.split("=", 1)[1].strip('"') for arg in args if arg.startswith("--extensionIdentifier=")]
+    if identifier:
+        os.makedirs(identifier[0], exist_ok=True)
+        with open(os.path.join(identifier[0], "package.json"), "w") as file:
+            file.write("{}\n")
+else:
+    chatter(tool)
+'''
+
+# Runs inside the benchmarked process: answers the create prompts and reports resource usage
+DRIVER_PROGRAM = r'''
+import builtins, json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+import setup_vscode_extension as creator
+answers = iter(json.loads(sys.argv[2]))
+builtins.input = lambda prompt="": next(answers)
+started = time.perf_counter()
+creator.process_command("create")
+elapsed = time.perf_counter() - started
+print("BENCH_RESULT " + json.dumps({"elapsed": elapsed,
+                                    "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+'''
+
+def create_stub_environment(root, latency, output_lines):
+    """Create stub executables and an isolated HOME, cache and download mirror under root."""
+    stub_dir = os.path.join(root, "stubs")
+    installed_dir = os.path.join(root, "installed")
+    mirror_dir = os.path.join(root, "mirror")
+    for directory in (stub_dir, installed_dir, mirror_dir, os.path.join(root, "home"), os.path.join(root, "work")):
+        os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(stub_dir, "stub.py"), "w") as file:
+        file.write(STUB_PROGRAM)
+    template = f'#!/bin/sh\nexec "{sys.executable}" -S -E "{stub_dir}/stub.py" __TOOL__ "$@"\n'
+    with open(os.path.join(stub_dir, "_template"), "w") as file:
+        file.write(template)
+    for tool in BASE_STUBS:
+        path = os.path.join(stub_dir, tool)
+        with open(path, "w") as file:
+            file.write(template.replace("__TOOL__", tool))
+        os.chmod(path, 0o755)
+    # nvm is a shell function loaded from nvm.sh; this one forwards to the nvm stub
+    os.makedirs(os.path.join(root, "home", ".nvm"), exist_ok=True)
+    with open(os.path.join(root, "home", ".nvm", "nvm.sh"), "w") as file:
+        file.write(f'nvm() {{ "{stub_dir}/nvm" "$@"; }}\n')
+    # The dotnet install downloads its SDK; serve a small fake archive from a file:// mirror instead
+    archive = os.urandom(256 * 1024)
+    with open(os.path.join(mirror_dir, "dotnet-sdk-6.0.414-linux-x64.tar.gz"), "wb") as file:
+        file.write(archive)
+    # Pin the fake archive, since unpinned downloads are refused
+    pins = {creator.PROVISION_ARTIFACTS["dotnet"]["Linux"]["url"]: hashlib.sha256(archive).hexdigest()}
+    with open(os.path.join(root, "pins.json"), "w") as file:
+        json.dump(pins, file)
+    return {
+        "PATH": os.pathsep.join([installed_dir, stub_dir]),
+        "HOME": os.path.join(root, "home"),
+        "VSCODE_EXT_CREATOR_CACHE": os.path.join(root, "cache"),
+        "VSCODE_EXT_CREATOR_DOWNLOAD_MIRROR": "file://" + mirror_dir,
+        "VSCODE_EXT_CREATOR_ARTIFACT_PINS": os.path.join(root, "pins.json"),
+        # The stubs do not emulate Yeoman, so the built-in renderer generates the extensions
+        "VSCODE_EXT_CREATOR_GENERATOR": "native",
+        "BENCH_STUB_DIR": stub_dir,
+        "BENCH_INSTALLED_DIR": installed_dir,
+        "BENCH_STUB_LATENCY": str(latency),
+        "BENCH_STUB_OUTPUT_LINES": str(output_lines),
+        "BENCH_PACKAGE_BINARIES": json.dumps(PACKAGE_BINARIES),
+        "LANG": "C.UTF-8"
+    }
+
+def run_create(root, env, language, framework, name):
+    """Run one non-interactive create in a child process and return its measurements."""
+    languages = list(creator.LANGUAGE_FRAMEWORKS)
+    answers = [name, "Benchmark extension", str(languages.index(language) + 1),
+               str(creator.LANGUAGE_FRAMEWORKS[language].index(framework) + 1)]
+    calls_log = os.path.join(env["BENCH_STUB_DIR"], "calls.log")
+    calls_before = _count_lines(calls_log)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", DRIVER_PROGRAM, os.path.dirname(SCRIPT_PATH), json.dumps(answers)],
+                            cwd=os.path.join(root, "work"), env=env, capture_output=True, text=True)
+    latency = time.perf_counter() - started
+    report = [line for line in result.stdout.splitlines() if line.startswith("BENCH_RESULT ")]
+    if result.returncode != 0 or not report:
+        raise RuntimeError(f"create {language}/{framework} failed:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+    measured = json.loads(report[-1].split(" ", 1)[1])
+    return {"latency_s": latency, "create_s": measured["elapsed"], "peak_rss_kb": measured["peak_rss_kb"],
+            "subprocesses": _count_lines(calls_log) - calls_before}
+
+def _count_lines(path):
+    """Count the lines of a file that may not exist yet."""
+    try:
+        with open(path) as file:
+            return sum(1 for _ in file)
+    except OSError:
+        return 0
+
+def run_matrix(latency, output_lines, repeat, only=None):
+    """Benchmark a cold and a warm create for every language/framework pair."""
+    results = {}
+    for language, frameworks in creator.LANGUAGE_FRAMEWORKS.items():
+        for framework in frameworks:
+            case = f"{language}/{framework}"
+            if only and not any(pattern.lower() in case.lower() for pattern in only):
+                continue
+            runs = {"cold": [], "warm": []}
+            for attempt in range(repeat):
+                root = tempfile.mkdtemp(prefix="vscode-ext-bench-")
+                try:
+                    env = create_stub_environment(root, latency, output_lines)
+                    runs["cold"].append(run_create(root, env, language, framework, f"Cold {attempt}"))
+                    runs["warm"].append(run_create(root, env, language, framework, f"Warm {attempt}"))
+                finally:
+                    shutil.rmtree(root, ignore_errors=True)
+            for phase, samples in runs.items():
+                results[f"{case} [{phase}]"] = {
+                    "latency_s": statistics.median(sample["latency_s"] for sample in samples),
+                    "create_s": statistics.median(sample["create_s"] for sample in samples),
+                    "peak_rss_kb": max(sample["peak_rss_kb"] for sample in samples),
+                    "subprocesses": max(sample["subprocesses"] for sample in samples)
+                }
+            print(f"{case}: cold {results[case + ' [cold]']['latency_s']:.2f}s, "
+                  f"warm {results[case + ' [warm]']['latency_s']:.2f}s", flush=True)
+    return results
+
+def measure_startup(command, repeat):
+    """Measure time-to-first-prompt and time-to-exit of the interactive prompt."""
+    samples = {"first_prompt_s": [], "exit_s": []}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        prompt_seen = threading.Event()
+
+        def read_output():
+            output = b""
+            while True:
+                chunk = process.stdout.read1(4096)
+                if not chunk:
+                    break
+                output += chunk
+                if output.rstrip(b" ").endswith(b">"):
+                    prompt_seen.set()
+            prompt_seen.set()
+
+        reader = threading.Thread(target=read_output, daemon=True)
+        reader.start()
+        prompt_seen.wait(60)
+        first_prompt = time.perf_counter() - started
+        process.stdin.write(b"exit\n")
+        process.stdin.flush()
+        process.wait(60)
+        samples["first_prompt_s"].append(first_prompt)
+        samples["exit_s"].append(time.perf_counter() - started)
+        reader.join(5)
+    return {key: {"median": statistics.median(values), "min": min(values)} for key, values in samples.items()}
+
+def run_startup_benchmark(targets, repeat):
+    """Measure startup of each available launch target and print a comparison table."""
+    results = {}
+    for name in targets:
+        command = STARTUP_TARGETS.get(name) or [name]
+        if not (os.path.exists(command[0]) or shutil.which(command[0])):
+            print(f"Skipping {name}: {command[0]} not found (build it with pyinstaller first)")
+            continue
+        results[name] = measure_startup(command, repeat)
+    print(f"\n{'target':<12} {'first prompt s (median/min)':>28} {'exit s (median/min)':>22}")
+    for name, result in results.items():
+        prompt, exit_ = result["first_prompt_s"], result["exit_s"]
+        print(f"{name:<12} {prompt['median']:>18.3f} / {prompt['min']:.3f} {exit_['median']:>13.3f} / {exit_['min']:.3f}")
+    return results
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return human-readable regressions of results against a stored baseline."""
+    regressions = []
+    for case, current in results.items():
+        previous = baseline.get("results", {}).get(case)
+        if previous is None:
+            continue
+        # Allow a small absolute slack so sub-100ms cases do not flap on scheduler noise
+        if current["latency_s"] > previous["latency_s"] * (1 + tolerance) + 0.05:
+            regressions.append(f"{case}: latency {previous['latency_s']:.3f}s -> {current['latency_s']:.3f}s")
+        if current["peak_rss_kb"] > previous["peak_rss_kb"] * (1 + tolerance):
+            regressions.append(f"{case}: peak RSS {previous['peak_rss_kb']} KB -> {current['peak_rss_kb']} KB")
+        if current["subprocesses"] > previous["subprocesses"]:
+            regressions.append(f"{case}: subprocesses {previous['subprocesses']} -> {current['subprocesses']}")
+    return regressions
+
+def print_results(results):
+    """Print the benchmark results as a table."""
+    print(f"\n{'case':<40} {'latency s':>10} {'create s':>9} {'peak RSS MB':>12} {'subprocs':>9}")
+    for case, result in results.items():
+        print(f"{case:<40} {result['latency_s']:>10.3f} {result['create_s']:>9.3f} "
+              f"{result['peak_rss_kb'] / 1024:>12.1f} {result['subprocesses']:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Hermetic end-to-end benchmark of extension creation using stub toolchains.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each stub command sleeps (default: 0.05)")
+    parser.add_argument("--output-lines", type=int, default=200, help="Lines of output each stub command prints (default: 200)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the median latency is reported")
+    parser.add_argument("--only", nargs="*", help="Only run cases containing one of these substrings, e.g. python go/Gin")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file to compare against (default: bench_baseline.json next to this script)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before flagging a regression (default: 0.2)")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    parser.add_argument("--startup", nargs="*", metavar="TARGET",
+                        help="Measure time-to-first-prompt and time-to-exit instead; targets are "
+                             f"{', '.join(STARTUP_TARGETS)} or a path to an executable (default: all)")
+    options = parser.parse_args()
+
+    if options.startup is not None:
+        results = run_startup_benchmark(options.startup or list(STARTUP_TARGETS), max(options.repeat, 10))
+        if options.output:
+            with open(options.output, "w") as file:
+                json.dump({"created_at": time.time(), "startup": results}, file, indent=2)
+        return
+
+    if sys.platform != "linux":
+        print("The benchmark stubs target Linux build hosts.")
+        sys.exit(1)
+
+    results = run_matrix(options.latency, options.output_lines, options.repeat, options.only)
+    print_results(results)
+    report = {"created_at": time.time(), "python": sys.version.split()[0],
+              "stub_latency_s": options.latency, "stub_output_lines": options.output_lines, "results": results}
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if options.save_baseline:
+        with open(options.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nSaved baseline to {options.baseline}")
+        return
+    if not os.path.exists(options.baseline):
+        print(f"\nNo baseline at {options.baseline}; run with --save-baseline to record one.")
+        sys.exit(1)
+
+    with open(options.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare_to_baseline(results, baseline, options.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regressions against {options.baseline}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions against {options.baseline}.")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,32 @@ import platform
 import time
 import shutil
 import shlex
+import tarfile
+import hashlib
+import json
+import re
+import tempfile
+import threading
+import argparse
+import bisect
+import asyncio
+import codecs
+import contextlib
+import functools
+import select
+import signal
+import socket
+import socketserver
+import collections
+import http.server
+import importlib.resources
+import difflib
+import secrets
+import multiprocessing
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
 
 LANGUAGE_FRAMEWORKS = {
     "python": ["Flask", "Django", "FastAPI"],
@@ -17,54 +43,844 @@ LANGUAGE_FRAMEWORKS = {
     "go": ["Gin", "Echo", "Fiber"]
 }
 
-def run_command(command, cwd=None, stream_output=False):
+# Provisioning steps needed by each language; dependencies are resolved by run_provisioning_plan
+LANGUAGE_PROVISION_STEPS = {
+    "python": ["python"],
+    "javascript": ["yeoman"],
+    "typescript": ["yeoman"],
+    "c#": ["dotnet"],
+    "java": ["maven"],
+    "ruby": ["ruby"],
+    "php": ["php"],
+    "go": ["go"]
+}
+
+# Extension generator used by create_extension_project: Yeoman, or the built-in renderer, which stays
+# opt-in until tests/test_template_parity.py checks it against a recorded generator run
+EXTENSION_GENERATOR = os.environ.get("VSCODE_EXT_CREATOR_GENERATOR", "yeoman")
+
+# Provisioning steps each extension generator needs, whatever the server language is
+EXTENSION_SCAFFOLD_STEPS = {
+    "native": [],
+    "yeoman": ["yeoman"]
+}
+
+PROVISION_MAX_WORKERS = 4
+
+CACHE_DIR = os.environ.get("VSCODE_EXT_CREATOR_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "vscode-extension-creator"))
+DOWNLOAD_CACHE_DIR = os.path.join(CACHE_DIR, "downloads")
+DOWNLOAD_CACHE_MAX_BYTES = 4 * 1024 ** 3
+
+# Archives the provisioning steps download, by step and OS, with the SHA-256 each download must match;
+# `--fleet` pushes them to targets from the local cache. An archive without a pinned digest (here or in
+# ARTIFACT_PINS_FILE) is refused unless ALLOW_UNPINNED_ARTIFACTS is set.
+PROVISION_ARTIFACTS = {
+    "dotnet": {
+        "Windows": {"url": "https://download.visualstudio.microsoft.com/download/pr/5b53e378-9dd8-4a8e-8c1f-8e37a58079c0/36e2b99aecc0d8b1e79dc49e678338d6/dotnet-sdk-6.0.414-win-x64.zip", "sha256": None},
+        "Linux": {"url": "https://download.visualstudio.microsoft.com/download/pr/23a2d5e5-8e30-41db-91e2-4d4336f132c2/95f0c1ab08c4dd7795b1f8f75f527c29/dotnet-sdk-6.0.414-linux-x64.tar.gz", "sha256": None}
+    },
+    "maven": {"Windows": {"url": "https://archive.apache.org/dist/maven/maven-3/3.8.8/binaries/apache-maven-3.8.8-bin.zip", "sha256": None}},
+    "ruby": {"Windows": {"url": "https://rubyinstaller.org/downloads/rubyinstaller-3.2.1-1-x64.exe", "sha256": None}},
+    "php": {"Windows": {"url": "https://windows.php.net/downloads/releases/php-8.1.11-Win32-vs16-x64.zip", "sha256": None}},
+    "go": {"Windows": {"url": "https://golang.org/dl/go1.20.3.windows-amd64.msi", "sha256": None}}
+}
+
+# Optional JSON file mapping archive URLs to the SHA-256 they must match, for archives not pinned above
+ARTIFACT_PINS_FILE = os.environ.get("VSCODE_EXT_CREATOR_ARTIFACT_PINS")
+
+# Explicit opt-out that trusts archives with no pinned digest as they arrive, printing their SHA-256
+ALLOW_UNPINNED_ARTIFACTS = os.environ.get("VSCODE_EXT_CREATOR_ALLOW_UNPINNED") == "1"
+
+# Optional base URL (e.g. an internal mirror or file:// directory) serving the pinned archives by file name
+DOWNLOAD_MIRROR = os.environ.get("VSCODE_EXT_CREATOR_DOWNLOAD_MIRROR")
+
+# Tools probed by the toolchain inventory, with the arguments that print their version
+KNOWN_TOOLS = {
+    "node": ["--version"],
+    "npm": ["--version"],
+    "dotnet": ["--version"],
+    "mvn": ["--version"],
+    "java": ["-version"],
+    "ruby": ["--version"],
+    "php": ["--version"],
+    "go": ["version"],
+    "python3": ["--version"],
+    "git": ["--version"]
+}
+
+# Bytes of recent output kept per command for error reports, and where per-step logs are written
+COMMAND_OUTPUT_TAIL_BYTES = 64 * 1024
+COMMAND_LOG_DIR = os.path.join(CACHE_DIR, "logs")
+
+# How generated extensions get their node_modules: "install" runs npm install in every project,
+# "shared" materializes them from a content-addressed store with hardlinks/reflinks
+NODE_MODULES_MODE = os.environ.get("VSCODE_EXT_CREATOR_NODE_MODULES", "install")
+NODE_STORE_DIR = os.path.join(CACHE_DIR, "node-store")
+
+# Global npm packages the Yeoman generator needs, with the version ranges that satisfy it
+NPM_GLOBAL_PACKAGES = {"yo": ">=4.0.0", "generator-code": ">=1.7.0"}
+
+# Local caching proxy for package registries (--registry-proxy). Generated projects are configured
+# to build through it when VSCODE_EXT_CREATOR_REGISTRY_PROXY is set to its URL. Metadata such as npm
+# packuments or PyPI index pages is re-validated after REGISTRY_METADATA_TTL seconds; artifacts never.
+REGISTRY_PROXY_URL = os.environ.get("VSCODE_EXT_CREATOR_REGISTRY_PROXY")
+REGISTRY_CACHE_DIR = os.path.join(CACHE_DIR, "registry")
+REGISTRY_METADATA_TTL = 600
+REGISTRY_UPSTREAMS = {
+    "npm": os.environ.get("VSCODE_EXT_CREATOR_UPSTREAM_NPM", "https://registry.npmjs.org"),
+    "maven2": os.environ.get("VSCODE_EXT_CREATOR_UPSTREAM_MAVEN", "https://repo.maven.apache.org/maven2"),
+    "go": os.environ.get("VSCODE_EXT_CREATOR_UPSTREAM_GO", "https://proxy.golang.org"),
+    "pypi": os.environ.get("VSCODE_EXT_CREATOR_UPSTREAM_PYPI", "https://pypi.org"),
+    "pypi-files": os.environ.get("VSCODE_EXT_CREATOR_UPSTREAM_PYPI_FILES", "https://files.pythonhosted.org")
+}
+
+# Seconds after which the apt/brew package index is considered stale and refreshed again
+PACKAGE_INDEX_TTL = 3600
+
+# Toolchains `env export` can bundle (provisioning step -> binary), the bundle format version,
+# where `env import` unpacks bundles, install prefixes owned by the system package manager, and the
+# trees (apt's /usr/share/maven, /usr/lib/go-1.x, Homebrew's Cellar) where the package manager is asked
+ENV_BUNDLE_COMPONENTS = {"dotnet": "dotnet", "node": "node", "maven": "mvn", "ruby": "ruby", "php": "php", "go": "go"}
+ENV_BUNDLE_FORMAT = 1
+ENV_DIR = os.path.join(CACHE_DIR, "toolchains")
+ENV_SYSTEM_PREFIXES = {"/", "/usr", "/usr/local", "/opt/homebrew", "/bin", "/sbin", "/usr/bin", "/usr/sbin"}
+ENV_PACKAGE_MANAGED_TREES = ("/usr", "/lib", "/opt/homebrew/Cellar")
+
+# Journals of interactive create runs, so a failed run can be continued with `resume`
+RUN_JOURNAL_DIR = os.path.join(CACHE_DIR, "runs")
+RUN_JOURNAL_KEEP = 20
+
+# Written into each project: the inputs of every generation step and hashes of the files it wrote
+PROJECT_STATE_FILE = ".vscode-extension-creator.json"
+
+# Trace spans recorded when --trace is given; exported in Chrome trace-event format
+_trace = {"enabled": False, "events": []}
+_trace_lock = threading.Lock()
+_trace_local = threading.local()
+
+def enable_tracing():
+    """Start recording trace spans."""
+    _trace["enabled"] = True
+
+@contextlib.contextmanager
+def span(name, category="run", **args):
+    """Record the wall and CPU time of a block as a trace span when tracing is enabled."""
+    if not _trace["enabled"]:
+        yield
+        return
+    depth = getattr(_trace_local, "depth", 0)
+    _trace_local.depth = depth + 1
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        _trace_local.depth = depth
+        wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+        event = {"name": name, "cat": category, "ph": "X", "ts": wall_start * 1e6, "dur": wall * 1e6,
+                 "pid": os.getpid(), "tid": threading.get_ident(),
+                 "args": dict(args, cpu_ms=round(cpu * 1000, 3), depth=depth)}
+        with _trace_lock:
+            _trace["events"].append(event)
+
+def traced(category):
+    """Decorator recording every call of a function as a trace span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(func.__name__, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def write_trace(path):
+    """Write the recorded spans as a Chrome trace-event JSON file."""
+    with _trace_lock:
+        events = list(_trace["events"])
+    with open(path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+    print(f"Wrote {len(events)} trace events to {path}")
+
+def print_trace_summary(limit=20):
+    """Print the spans that took the most wall time in total."""
+    totals = {}
+    with _trace_lock:
+        for event in _trace["events"]:
+            total = totals.setdefault((event["cat"], event["name"]), {"count": 0, "wall": 0.0, "cpu": 0.0, "max": 0.0})
+            total["count"] += 1
+            total["wall"] += event["dur"] / 1e6
+            total["cpu"] += event["args"]["cpu_ms"] / 1000
+            total["max"] = max(total["max"], event["dur"] / 1e6)
+    if not totals:
+        return
+    rows = sorted(totals.items(), key=lambda item: item[1]["wall"], reverse=True)[:limit]
+    print("\nTrace summary (top spans by total wall time):")
+    print(f"  {'category':<10} {'span':<50} {'count':>5} {'wall s':>9} {'cpu s':>8} {'max s':>8}")
+    for (category, name), total in rows:
+        label = name if len(name) <= 50 else name[:47] + "..."
+        print(f"  {category:<10} {label:<50} {total['count']:>5} {total['wall']:>9.3f} {total['cpu']:>8.3f} {total['max']:>8.3f}")
+
+# Per-thread command settings; the provisioning scheduler points each step at its own log file
+# and prefixes its console output with the step name
+_command_context = threading.local()
+
+def _prefix_lines(text, prefix, line_start):
+    """Prefix every line of a chunk of output. Returns the text and whether the chunk ended a line."""
+    if not text:
+        return text, line_start
+    lines = text.split("\n")
+    text = "\n".join(prefix + line if line and (i or line_start) else line for i, line in enumerate(lines))
+    return text, not lines[-1]
+
+def _kill_process_tree(process):
+    """Kill a shell command together with the processes it started."""
+    if process.returncode is not None:
+        return
+    try:
+        if platform.system() == "Windows":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+async def _pump_output(reader, sinks, tail):
+    """Copy a child's output to its sinks chunk by chunk, keeping only a bounded tail in memory."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    line_start = True
+    while True:
+        chunk = await reader.read(65536)
+        if not chunk:
+            break
+        for sink in sinks:
+            if isinstance(sink, tuple):
+                # (text stream, line prefix) pairs are consoles; everything else receives raw bytes
+                text, line_start = _prefix_lines(decoder.decode(chunk), sink[1], line_start) if sink[1] else (decoder.decode(chunk), line_start)
+                sink[0].write(text)
+                sink[0].flush()
+            else:
+                sink.write(chunk)
+        if tail is not None:
+            tail.extend(chunk)
+            del tail[:-COMMAND_OUTPUT_TAIL_BYTES]
+
+async def run_command_async(command, cwd=None, stream_output=False, timeout=None, log_path=None, prefix=None):
+    """Run a shell command and stream or capture its output without buffering it all in memory."""
+    log_file = None
+    if log_path:
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        log_file = open(log_path, "ab")
+        log_file.write(f"$ {command}\n".encode())
+    session = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if platform.system() == "Windows" else {"start_new_session": True}
+    tail = bytearray()
+    started = time.perf_counter()
+    timed_out = False
+    try:
+        if stream_output:
+            process = await asyncio.create_subprocess_shell(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, **session)
+            sinks = [(sys.stdout, prefix)] + ([log_file] if log_file else [])
+            readers = [_pump_output(process.stdout, sinks, tail)]
+            stdout_spool = stderr_spool = None
+        else:
+            process = await asyncio.create_subprocess_shell(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **session)
+            # Spill large captured output to disk instead of holding it in memory
+            stdout_spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+            stderr_spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+            extra = [log_file] if log_file else []
+            readers = [_pump_output(process.stdout, [stdout_spool] + extra, None),
+                       _pump_output(process.stderr, [stderr_spool] + extra, tail)]
+        try:
+            await asyncio.wait_for(asyncio.gather(*readers, process.wait()), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            _kill_process_tree(process)
+            await process.wait()
+            print(f"Command timed out after {timeout}s: {command}")
+        except asyncio.CancelledError:
+            _kill_process_tree(process)
+            raise
+
+        if not stream_output:
+            for title, spool, stream in (("STDOUT:", stdout_spool, sys.stdout), ("STDERR:", stderr_spool, sys.stderr)):
+                print(f"{prefix or ''}{title}", file=stream)
+                spool.seek(0)
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                line_start = True
+                for chunk in iter(lambda: spool.read(65536), b""):
+                    text, line_start = _prefix_lines(decoder.decode(chunk), prefix, line_start) if prefix else (decoder.decode(chunk), line_start)
+                    stream.write(text)
+                print(file=stream)
+                spool.close()
+    finally:
+        if log_file:
+            log_file.close()
+    return {"returncode": process.returncode, "timed_out": timed_out,
+            "elapsed": time.perf_counter() - started,
+            "tail": tail.decode("utf-8", errors="replace")}
+
+# The event loop every child process runs on, in its own thread, whichever thread started the command
+_command_loop = {"loop": None}
+_command_loop_lock = threading.Lock()
+
+def _command_supervisor():
+    """Return the shared command event loop, starting its thread on first use."""
+    with _command_loop_lock:
+        if _command_loop["loop"] is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="command-supervisor", daemon=True).start()
+            _command_loop["loop"] = loop
+        return _command_loop["loop"]
+
+async def _gather_commands(specs):
+    """Run commands concurrently; cancelling this cancels them all and kills their process trees."""
+    return await asyncio.gather(*(run_command_async(**spec) for spec in specs))
+
+def run_commands(specs):
+    """Run several commands at once on the shared loop, each with its own timeout; returns their results in order."""
+    # Commands inherit the calling thread's step log and output prefix
+    context = {"log_path": getattr(_command_context, "log_path", None), "prefix": getattr(_command_context, "prefix", None)}
+    specs = [dict(context, **{key: value for key, value in spec.items() if value is not None}) for spec in specs]
+    future = asyncio.run_coroutine_threadsafe(_gather_commands(specs), _command_supervisor())
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+def cancel_all_commands():
+    """Cancel every command running on the shared loop, killing their process trees."""
+    loop = _command_loop["loop"]
+    if loop is not None:
+        loop.call_soon_threadsafe(lambda: [task.cancel() for task in asyncio.all_tasks(loop)])
+
+def execute_command(command, cwd=None, stream_output=False, timeout=None, log_path=None):
+    """Run a shell command to completion and return its exit code, elapsed time and output tail."""
+    with span(f"$ {command}", "subprocess"):
+        return run_commands([{"command": command, "cwd": cwd, "stream_output": stream_output,
+                              "timeout": timeout, "log_path": log_path}])[0]
+
+def run_command(command, cwd=None, stream_output=False, timeout=None, log_path=None):
     """Run a shell command and print its output."""
     if platform.system() == "Windows":
         command = command.replace("/", "\\")
-    print(f"Running command: {command}")
-    
-    if stream_output:
-        process = subprocess.Popen(command, shell=True, cwd=cwd, text=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding="utf-8", errors="ignore")
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                print(output.strip())
-        return process.poll()
-    else:
-        result = subprocess.run(command, shell=True, cwd=cwd, text=True, capture_output=True, encoding="utf-8", errors="ignore")
-        print("STDOUT:")
-        print(result.stdout)
-        print("STDERR:")
-        print(result.stderr, file=sys.stderr)
-        return result.returncode
+    print(f"{getattr(_command_context, 'prefix', None) or ''}Running command: {command}")
+    return execute_command(command, cwd, stream_output, timeout, log_path)["returncode"]
+
+_toolchain_lock = threading.Lock()
+_toolchain_inventory = None
+
+def _path_fingerprint():
+    """Fingerprint PATH and the modification times of its directories."""
+    digest = hashlib.sha256(os.environ.get("PATH", "").encode())
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            mtime = -1
+        digest.update(f"{directory}\0{mtime}\0".encode())
+    return digest.hexdigest()
+
+def _inventory_is_current(inventory, fingerprint):
+    """Check an inventory against the PATH fingerprint and the binaries it recorded."""
+    if inventory is None or inventory.get("fingerprint") != fingerprint:
+        return False
+    if set(inventory["tools"]) != set(KNOWN_TOOLS):
+        return False
+    for tool in inventory["tools"].values():
+        if tool["path"] is None:
+            continue
+        try:
+            if os.stat(tool["path"]).st_mtime_ns != tool["mtime"]:
+                return False
+        except OSError:
+            return False
+    return True
+
+def _probe_tool(name):
+    """Locate a tool on PATH and capture the first line of its version output."""
+    path = shutil.which(name)
+    if path is None:
+        return {"path": None, "version": None, "mtime": None}
+    try:
+        result = subprocess.run([path] + KNOWN_TOOLS[name], capture_output=True, text=True,
+                                encoding="utf-8", errors="ignore", timeout=30)
+        output = (result.stdout.strip() or result.stderr.strip()).splitlines()
+        version = output[0] if output else None
+    except (OSError, subprocess.TimeoutExpired):
+        version = None
+    return {"path": path, "version": version, "mtime": os.stat(path).st_mtime_ns}
+
+def get_toolchain_inventory(refresh=False):
+    """Return the path and version of every known tool, probing only when PATH or a binary changed."""
+    global _toolchain_inventory
+    inventory_path = os.path.join(CACHE_DIR, "toolchains.json")
+    with _toolchain_lock:
+        fingerprint = _path_fingerprint()
+        if not refresh and _inventory_is_current(_toolchain_inventory, fingerprint):
+            return _toolchain_inventory["tools"]
+        if not refresh:
+            try:
+                with open(inventory_path) as file:
+                    stored = json.load(file)
+            except (OSError, ValueError):
+                stored = None
+            if _inventory_is_current(stored, fingerprint):
+                _toolchain_inventory = stored
+                return stored["tools"]
+
+        with ThreadPoolExecutor(max_workers=len(KNOWN_TOOLS)) as pool:
+            probes = dict(zip(KNOWN_TOOLS, pool.map(_probe_tool, KNOWN_TOOLS)))
+        _toolchain_inventory = {"fingerprint": fingerprint, "probed_at": time.time(), "tools": probes}
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(inventory_path + ".tmp", "w") as file:
+            json.dump(_toolchain_inventory, file, indent=2)
+        os.replace(inventory_path + ".tmp", inventory_path)
+        return probes
+
+def invalidate_toolchain_inventory():
+    """Forget the in-memory toolchain inventory so the next lookup re-validates it."""
+    global _toolchain_inventory
+    with _toolchain_lock:
+        _toolchain_inventory = None
+
+def find_tool(name):
+    """Return the path of a tool, answering known tools from the toolchain inventory."""
+    if name in KNOWN_TOOLS:
+        return get_toolchain_inventory()[name]["path"]
+    return shutil.which(name)
+
+def handle_tools_command(args):
+    """Handle the 'tools' and 'tools refresh' REPL commands."""
+    if args and args[0] != "refresh":
+        print("Usage: tools [refresh]")
+        return
+    tools = get_toolchain_inventory(refresh=bool(args))
+    width = max(len(name) for name in tools)
+    for name, tool in tools.items():
+        if tool["path"] is None:
+            print(f"{name.ljust(width)}  not installed")
+        else:
+            print(f"{name.ljust(width)}  {tool['version'] or 'unknown version'}  ({tool['path']})")
+
+_APT_INSTALL_RE = re.compile(r"^sudo apt-get update && sudo apt-get install -y ((?:[a-z0-9][a-z0-9.+-]*\s*)+)$")
+_BREW_INSTALL_RE = re.compile(r"^brew install ((?:[a-z0-9][a-z0-9@.+/-]*\s*)+)$")
+
+_package_index_lock = threading.Lock()
+_refreshed_package_indexes = set()
+
+def _parse_system_install(install_command):
+    """Return (manager, packages) if the command is a plain apt-get or brew install, else None."""
+    match = _APT_INSTALL_RE.match(install_command.strip())
+    if match:
+        return "apt", match.group(1).split()
+    match = _BREW_INSTALL_RE.match(install_command.strip())
+    if match:
+        return "brew", match.group(1).split()
+    return None
+
+def refresh_package_index(manager):
+    """Refresh the apt or brew package index at most once per session and per PACKAGE_INDEX_TTL."""
+    with _package_index_lock:
+        if manager in _refreshed_package_indexes:
+            return 0
+        stamp = os.path.join(CACHE_DIR, f"package-index.{manager}.stamp")
+        try:
+            age = time.time() - os.path.getmtime(stamp)
+        except OSError:
+            age = None
+        if age is not None and age < PACKAGE_INDEX_TTL:
+            print(f"{manager} package index refreshed {age / 60:.0f} minutes ago, skipping update.")
+            _refreshed_package_indexes.add(manager)
+            return 0
+        result = run_command("sudo apt-get update" if manager == "apt" else "brew update", stream_output=True)
+        if result == 0:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(stamp, "w"):
+                pass
+            _refreshed_package_indexes.add(manager)
+        return result
+
+def install_system_packages(manager, packages):
+    """Install several packages with a single apt-get or brew transaction."""
+    # Other runs on this host wait instead of failing on the dpkg lock
+    with host_lease(manager):
+        result = refresh_package_index(manager)
+        if result != 0:
+            return result
+        if manager == "apt":
+            command = f"sudo apt-get install -y {' '.join(packages)}"
+        else:
+            command = f"HOMEBREW_NO_AUTO_UPDATE=1 brew install {' '.join(packages)}"
+        return run_command(command, stream_output=True)
 
 def install_package(package_name, install_command):
     """Install a package if it is not already installed."""
-    if shutil.which(package_name) is None:
+    if find_tool(package_name) is None:
         print(f"{package_name} is not installed. Installing...")
-        result = run_command(install_command, stream_output=True)
+        system_install = _parse_system_install(install_command)
+        if system_install:
+            result = install_system_packages(*system_install)
+        else:
+            result = run_command(install_command, stream_output=True)
+        invalidate_toolchain_inventory()
         if result != 0:
             print(f"Failed to install {package_name}.")
             sys.exit(result)
     else:
         print(f"{package_name} is already installed.")
 
+# Host-wide leases: lock files that make concurrent runs of this tool on one machine take turns
+# downloading an archive or installing a toolchain, instead of racing each other
+LOCK_DIR = os.path.join(CACHE_DIR, "locks")
+
+# A lease holder refreshes its lock file's mtime every LEASE_HEARTBEAT seconds; a lock file older
+# than LEASE_STALE_AFTER, or left by a process that no longer exists, is abandoned and may be broken
+LEASE_HEARTBEAT = 5
+LEASE_STALE_AFTER = 60
+
+# Leases held by this process, by name, and how long this process has waited for each lease
+_leases_held = {}
+_leases_guard = threading.Lock()
+_lease_stats = {}
+_lease_heartbeat = {"thread": None}
+
+def _lease_path(name):
+    """Return the lock file of a lease."""
+    return os.path.join(LOCK_DIR, re.sub(r"[^A-Za-z0-9_.-]", "_", name) + ".lock")
+
+def _read_lease(path):
+    """Return the holder recorded in a lock file and the age of its heartbeat, or None if there is no lock file."""
+    try:
+        age = time.time() - os.path.getmtime(path)
+        with open(path) as file:
+            holder = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        # Created but not yet written by its holder
+        holder = {}
+    holder["age"] = age
+    return holder
+
+def _lease_is_stale(holder):
+    """Return whether the holder of a lock file is gone or stopped refreshing it."""
+    if holder["age"] > LEASE_STALE_AFTER:
+        return True
+    # os.kill(pid, 0) terminates the process on Windows, where only the heartbeat is checked
+    if holder.get("host") == socket.gethostname() and holder.get("pid") and platform.system() != "Windows":
+        try:
+            os.kill(holder["pid"], 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+    return False
+
+def _break_stale_lease(path, holder):
+    """Remove an abandoned lock file. Returns False if another process broke or re-took it first."""
+    broken_path = f"{path}.{secrets.token_hex(4)}.stale"
+    try:
+        os.rename(path, broken_path)
+    except OSError:
+        return False
+    current = _read_lease(broken_path)
+    if current is not None and current.get("token") != holder.get("token"):
+        # The lease changed hands between reading and renaming it: give it back to its new holder
+        with contextlib.suppress(OSError):
+            os.link(broken_path, path)
+        os.remove(broken_path)
+        return False
+    os.remove(broken_path)
+    return True
+
+def _refresh_leases():
+    """Touch the lock file of every lease this process holds, for as long as the process runs."""
+    while True:
+        time.sleep(LEASE_HEARTBEAT)
+        with _leases_guard:
+            paths = [held["path"] for held in _leases_held.values()]
+        for path in paths:
+            with contextlib.suppress(OSError):
+                os.utime(path)
+
+@contextlib.contextmanager
+def host_lease(name, timeout=None):
+    """Hold a re-entrant host-wide lease for a block, yielding the seconds spent waiting for it."""
+    thread = threading.get_ident()
+    with _leases_guard:
+        held = _leases_held.get(name)
+        if held and held["thread"] == thread:
+            held["depth"] += 1
+        else:
+            held = None
+    if held:
+        try:
+            yield 0.0
+        finally:
+            with _leases_guard:
+                held["depth"] -= 1
+        return
+
+    path = _lease_path(name)
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    token = secrets.token_hex(8)
+    started = time.perf_counter()
+    delay, announced, broken = 0.01, False, 0
+    with span(f"lease {name}", "lease"):
+        while True:
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                holder = _read_lease(path)
+                if holder is None:
+                    continue
+                if _lease_is_stale(holder):
+                    if _break_stale_lease(path, holder):
+                        broken += 1
+                        print(f"Broke the stale {name} lock of pid {holder.get('pid', '?')} on {holder.get('host', '?')} "
+                              f"(last heartbeat {holder['age']:.0f}s ago).")
+                    continue
+                waited = time.perf_counter() - started
+                if timeout is not None and waited > timeout:
+                    raise TimeoutError(f"Timed out after {timeout}s waiting for the {name} lock held by pid {holder.get('pid', '?')} ({path})")
+                if not announced and waited >= 1:
+                    print(f"Waiting for {name}, held by pid {holder.get('pid', '?')} on {holder.get('host', '?')}...")
+                    announced = True
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+                continue
+            with os.fdopen(fd, "w") as file:
+                json.dump({"name": name, "pid": os.getpid(), "host": socket.gethostname(), "token": token,
+                           "acquired": time.time()}, file)
+            break
+    waited = time.perf_counter() - started
+
+    with _leases_guard:
+        _leases_held[name] = {"path": path, "token": token, "thread": thread, "depth": 1}
+        stats = _lease_stats.setdefault(name, {"acquired": 0, "contended": 0, "waited": 0.0, "max_wait": 0.0, "stale_broken": 0})
+        stats["acquired"] += 1
+        stats["contended"] += waited >= 0.05
+        stats["waited"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+        stats["stale_broken"] += broken
+        if _lease_heartbeat["thread"] is None:
+            _lease_heartbeat["thread"] = threading.Thread(target=_refresh_leases, name="lease-heartbeat", daemon=True)
+            _lease_heartbeat["thread"].start()
+    try:
+        yield waited
+    finally:
+        with _leases_guard:
+            del _leases_held[name]
+        # A holder declared stale and replaced must not remove its successor's lock file
+        current = _read_lease(path)
+        if current is not None and current.get("token") == token:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+def lease_stats():
+    """Return how often this process acquired each lease and how long it waited for it."""
+    with _leases_guard:
+        return {name: dict(stats) for name, stats in _lease_stats.items()}
+
+def handle_locks_command(args):
+    """Handle the 'cache locks' REPL command."""
+    try:
+        lock_files = sorted(entry for entry in os.listdir(LOCK_DIR) if entry.endswith(".lock"))
+    except FileNotFoundError:
+        lock_files = []
+    for lock_file in lock_files:
+        holder = _read_lease(os.path.join(LOCK_DIR, lock_file))
+        if holder is None:
+            continue
+        state = "stale" if _lease_is_stale(holder) else "held"
+        print(f"{lock_file[:-len('.lock')]}  {state}  pid {holder.get('pid', '?')} on {holder.get('host', '?')}, "
+              f"heartbeat {holder['age']:.0f}s ago")
+    if not lock_files:
+        print(f"No leases are held ({LOCK_DIR}).")
+    for name, stats in sorted(lease_stats().items()):
+        print(f"{name}: acquired {stats['acquired']}x, waited {stats['waited']:.2f}s in total "
+              f"({stats['contended']} contended, longest {stats['max_wait']:.2f}s, {stats['stale_broken']} stale broken)")
+
+_download_cache_lock = threading.Lock()
+
+@contextlib.contextmanager
+def _download_index_locked():
+    """Hold the download cache index against other threads and other runs on this host."""
+    with _download_cache_lock, host_lease("download-index"):
+        yield
+
+def _load_download_index():
+    """Load the download cache index, mapping URLs to cached objects."""
+    try:
+        with open(os.path.join(DOWNLOAD_CACHE_DIR, "index.json")) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def _save_download_index(index):
+    """Atomically write the download cache index."""
+    os.makedirs(DOWNLOAD_CACHE_DIR, exist_ok=True)
+    index_path = os.path.join(DOWNLOAD_CACHE_DIR, "index.json")
+    with open(index_path + ".tmp", "w") as file:
+        json.dump(index, file, indent=2)
+    os.replace(index_path + ".tmp", index_path)
+
+def _cached_object_path(entry):
+    """Return the on-disk path of a cache index entry."""
+    return os.path.join(DOWNLOAD_CACHE_DIR, "objects", entry["sha256"], entry["filename"])
+
+def _sha256_of_file(path):
+    """Compute the SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _pinned_sha256(url):
+    """Return the SHA-256 pinned for an archive in PROVISION_ARTIFACTS or ARTIFACT_PINS_FILE, if any."""
+    for artifacts in PROVISION_ARTIFACTS.values():
+        for artifact in artifacts.values():
+            if artifact["url"] == url and artifact["sha256"]:
+                return artifact["sha256"]
+    if ARTIFACT_PINS_FILE:
+        with open(ARTIFACT_PINS_FILE) as file:
+            return json.load(file).get(url)
+    return None
+
+def _require_pin(url, sha256):
+    """Refuse an archive with no pinned SHA-256 unless unpinned archives are explicitly allowed."""
+    if sha256 is None and not ALLOW_UNPINNED_ARTIFACTS:
+        raise RuntimeError(f"No SHA-256 is pinned for {url}. Pin it in PROVISION_ARTIFACTS or the file named by "
+                           "VSCODE_EXT_CREATOR_ARTIFACT_PINS, or set VSCODE_EXT_CREATOR_ALLOW_UNPINNED=1 to trust it.")
+
+@traced("download")
+def fetch_artifact(url, sha256=None):
+    """Return a cached local path to the archive at url, downloaded only if needed and checked against its SHA-256."""
+    sha256 = sha256 or _pinned_sha256(url)
+    _require_pin(url, sha256)
+    # Concurrent runs download each archive once: the others wait here, then find it cached
+    with host_lease(f"download-{hashlib.sha256(url.encode()).hexdigest()[:16]}"):
+        filename = url.rsplit("/", 1)[-1]
+        with _download_index_locked():
+            index = _load_download_index()
+            entry = index.get(url)
+            if entry and (sha256 is None or entry["sha256"] == sha256):
+                path = _cached_object_path(entry)
+                if os.path.exists(path) and _sha256_of_file(path) == entry["sha256"]:
+                    print(f"Using cached {filename} ({entry['sha256'][:12]})")
+                    entry["last_used"] = time.time()
+                    _save_download_index(index)
+                    return path
+                print(f"Cached {filename} is missing or corrupt. Downloading again...")
+
+        source = f"{DOWNLOAD_MIRROR.rstrip('/')}/{filename}" if DOWNLOAD_MIRROR else url
+        print(f"Downloading {source}...")
+        os.makedirs(DOWNLOAD_CACHE_DIR, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, partial_path = tempfile.mkstemp(dir=DOWNLOAD_CACHE_DIR, suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as file, urllib.request.urlopen(source) as response:
+                expected_size = response.headers.get("Content-Length")
+                for chunk in iter(lambda: response.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    file.write(chunk)
+                    size += len(chunk)
+            if expected_size is not None and size != int(expected_size):
+                raise RuntimeError(f"Download of {source} was truncated: got {size} of {expected_size} bytes")
+            actual = digest.hexdigest()
+            if sha256 is not None and actual != sha256:
+                raise RuntimeError(f"Checksum mismatch for {url}: expected {sha256}, got {actual}")
+            if sha256 is None:
+                print(f"Warning: {filename} has no pinned SHA-256; trusting this download as allowed ({actual}).")
+            object_dir = os.path.join(DOWNLOAD_CACHE_DIR, "objects", actual)
+            os.makedirs(object_dir, exist_ok=True)
+            path = os.path.join(object_dir, filename)
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        print(f"Downloaded {filename} ({size / 1024 ** 2:.1f} MB, sha256 {actual[:12]})")
+
+        with _download_index_locked():
+            index = _load_download_index()
+            index[url] = {"sha256": actual, "filename": filename, "size": size, "last_used": time.time()}
+            _prune_download_index(index, DOWNLOAD_CACHE_MAX_BYTES, keep=url)
+            _save_download_index(index)
+        return path
+
+def _prune_download_index(index, max_bytes, keep=None):
+    """Evict least recently used entries until the cache fits in max_bytes. Returns evicted URLs."""
+    evicted = []
+    total = sum(entry["size"] for entry in index.values())
+    for url, entry in sorted(index.items(), key=lambda item: item[1]["last_used"]):
+        if total <= max_bytes:
+            break
+        if url == keep:
+            continue
+        del index[url]
+        total -= entry["size"]
+        evicted.append(url)
+        # Identical content may be referenced by several URLs
+        if not any(other["sha256"] == entry["sha256"] for other in index.values()):
+            shutil.rmtree(os.path.dirname(_cached_object_path(entry)), ignore_errors=True)
+    return evicted
+
+def prune_download_cache(max_bytes=DOWNLOAD_CACHE_MAX_BYTES):
+    """Evict least recently used downloads until the cache fits in max_bytes."""
+    with _download_index_locked():
+        index = _load_download_index()
+        evicted = _prune_download_index(index, max_bytes)
+        _save_download_index(index)
+    return evicted
+
+def parse_size(text):
+    """Parse a size such as 512M or 2G into bytes."""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def handle_cache_command(args):
+    """Handle the 'cache list', 'cache prune [size]' and 'cache locks' REPL commands."""
+    if not args or args[0] == "list":
+        index = _load_download_index()
+        if not index:
+            print(f"Download cache is empty ({DOWNLOAD_CACHE_DIR}).")
+            return
+        total = 0
+        for url, entry in sorted(index.items(), key=lambda item: item[1]["last_used"], reverse=True):
+            last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+            print(f"{entry['sha256'][:12]}  {entry['size'] / 1024 ** 2:9.1f} MB  {last_used}  {url}")
+            total += entry["size"]
+        print(f"{len(index)} entries, {total / 1024 ** 2:.1f} MB in {DOWNLOAD_CACHE_DIR} (limit {DOWNLOAD_CACHE_MAX_BYTES / 1024 ** 2:.0f} MB)")
+    elif args[0] == "locks":
+        handle_locks_command(args[1:])
+    elif args[0] == "prune":
+        max_bytes = parse_size(args[1]) if len(args) > 1 else DOWNLOAD_CACHE_MAX_BYTES
+        evicted = prune_download_cache(max_bytes)
+        for url in evicted:
+            print(f"Evicted {url}")
+        print(f"Pruned {len(evicted)} entries.")
+    else:
+        print("Usage: cache list | cache prune [size] | cache locks")
+
 def check_and_install_dotnet():
     """Check if dotnet is installed, and if not, install it."""
-    if shutil.which("dotnet") is None:
+    if find_tool("dotnet") is None:
         print("dotnet is not installed. Installing dotnet...")
         if platform.system() == "Windows":
-            dotnet_url = "https://download.visualstudio.microsoft.com/download/pr/5b53e378-9dd8-4a8e-8c1f-8e37a58079c0/36e2b99aecc0d8b1e79dc49e678338d6/dotnet-sdk-6.0.414-win-x64.zip"
-            dotnet_zip = "dotnet-sdk-6.0.414-win-x64.zip"
+            dotnet_artifact = PROVISION_ARTIFACTS["dotnet"]["Windows"]
             dotnet_dir = "dotnet-sdk-6.0.414-win-x64"
-            run_command(f"curl -O {dotnet_url}", stream_output=True)
-            run_command(f"tar -xzf {dotnet_zip}", stream_output=True)
+            dotnet_zip = fetch_artifact(dotnet_artifact["url"], dotnet_artifact["sha256"])
+            run_command(f"tar -xzf \"{dotnet_zip}\"", stream_output=True)
             os.environ["PATH"] += os.pathsep + os.path.abspath(dotnet_dir + "/dotnet")
             run_command(f"setx PATH \"%PATH%;{os.path.abspath(dotnet_dir + '/dotnet')}\"", stream_output=True)
         elif platform.system() == "Linux":
-            install_package("dotnet", "wget https://download.visualstudio.microsoft.com/download/pr/23a2d5e5-8e30-41db-91e2-4d4336f132c2/95f0c1ab08c4dd7795b1f8f75f527c29/dotnet-sdk-6.0.414-linux-x64.tar.gz && sudo mkdir -p /usr/share/dotnet && sudo tar zxf dotnet-sdk-6.0.414-linux-x64.tar.gz -C /usr/share/dotnet && sudo ln -s /usr/share/dotnet/dotnet /usr/bin/dotnet")
+            dotnet_artifact = PROVISION_ARTIFACTS["dotnet"]["Linux"]
+            dotnet_tarball = fetch_artifact(dotnet_artifact["url"], dotnet_artifact["sha256"])
+            install_package("dotnet", f"sudo mkdir -p /usr/share/dotnet && sudo tar zxf \"{dotnet_tarball}\" -C /usr/share/dotnet && sudo ln -s /usr/share/dotnet/dotnet /usr/bin/dotnet")
         elif platform.system() == "Darwin":
             install_package("dotnet", "brew install --cask dotnet-sdk")
         else:
@@ -73,44 +889,133 @@ def check_and_install_dotnet():
     else:
         print("dotnet is already installed.")
 
+def nvm_command(args):
+    """Return a shell command running nvm, which is a shell function rather than an executable outside Windows."""
+    if platform.system() == "Windows":
+        # nvm-windows is an executable
+        return f"nvm {args}"
+    return f"bash -c '. \"${{NVM_DIR:-$HOME/.nvm}}/nvm.sh\" && nvm {args}'"
+
 def install_node():
     """Install Node.js if not already installed."""
-    install_package("node", "nvm install node")
+    install_package("node", nvm_command("install node"))
+
+def install_npm():
+    """Install npm if not already installed."""
+    install_package("npm", nvm_command("install-latest-npm"))
+
+# npm's global prefix, keyed by the inputs it is derived from
+_npm_prefix_cache = {}
+
+def _user_npmrc_prefix():
+    """Return the prefix set in the user's .npmrc, if any."""
+    npmrc = os.environ.get("NPM_CONFIG_USERCONFIG") or os.path.join(os.path.expanduser("~"), ".npmrc")
+    try:
+        with open(npmrc) as file:
+            for line in file:
+                key, _, value = line.partition("=")
+                if key.strip() == "prefix":
+                    return os.path.expanduser(value.strip().strip('"'))
+    except OSError:
+        pass
+    return None
+
+def npm_global_prefix():
+    """Return npm's global prefix without running npm: from the environment, ~/.npmrc or the Node.js install."""
+    node = find_tool("node")
+    key = (node, os.environ.get("NPM_CONFIG_PREFIX") or os.environ.get("npm_config_prefix"))
+    if key not in _npm_prefix_cache:
+        prefix = key[1] or _user_npmrc_prefix()
+        if prefix is None and platform.system() == "Windows":
+            prefix = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "npm")
+        elif prefix is None and node is not None:
+            # node lives in <prefix>/bin, and npm installs global packages under the same prefix
+            prefix = os.path.dirname(os.path.dirname(os.path.realpath(node)))
+        _npm_prefix_cache[key] = prefix
+    return _npm_prefix_cache[key]
+
+def npm_global_modules_dir():
+    """Return the directory global npm packages are installed into, or None if Node.js is missing."""
+    prefix = npm_global_prefix()
+    if prefix is None:
+        return None
+    if platform.system() == "Windows":
+        return os.path.join(prefix, "node_modules")
+    return os.path.join(prefix, "lib", "node_modules")
+
+def _parse_version(version):
+    """Parse the numeric major.minor.patch part of a version string."""
+    numbers = re.match(r"v?(\d+)(?:\.(\d+))?(?:\.(\d+))?", version.strip())
+    if not numbers:
+        raise ValueError(f"Invalid version: {version}")
+    return tuple(int(part or 0) for part in numbers.groups())
+
+def version_satisfies(version, requirement):
+    """Check a version against an npm-style range: *, x.y.z, >=x.y.z, ^x.y.z or ~x.y.z, space-separated for AND."""
+    if version is None:
+        return False
+    actual = _parse_version(version)
+    for clause in requirement.split():
+        if clause in ("*", "latest"):
+            continue
+        operator = re.match(r"[>=<^~]*", clause).group()
+        wanted = _parse_version(clause[len(operator):])
+        if operator == "^":
+            major = next((i for i, part in enumerate(wanted) if part), 2)
+            ok = actual >= wanted and actual[:major + 1] == wanted[:major + 1]
+        elif operator == "~":
+            ok = actual >= wanted and actual[:2] == wanted[:2]
+        else:
+            ok = {">=": actual >= wanted, ">": actual > wanted, "<=": actual <= wanted,
+                  "<": actual < wanted, "": actual == wanted, "=": actual == wanted}[operator]
+        if not ok:
+            return False
+    return True
+
+def unmet_global_npm_packages(requirements=NPM_GLOBAL_PACKAGES):
+    """Return the global npm packages whose installed version does not satisfy its range."""
+    modules = npm_global_modules_dir()
+    installed = read_npm_packages(modules) if modules else {}
+    return {name: requirement for name, requirement in requirements.items()
+            if not version_satisfies(installed.get(name), requirement)}
 
 def install_yeoman_and_generator():
-    """Install Yeoman and VSCode Extension Generator."""
+    """Install Yeoman and VSCode Extension Generator unless the installed versions already satisfy NPM_GLOBAL_PACKAGES."""
+    unmet = unmet_global_npm_packages()
+    if not unmet:
+        print(f"Yeoman and VSCode Extension Generator are already installed in {npm_global_modules_dir()}.")
+        return
+
     print("Installing Yeoman and VSCode Extension Generator...")
-    result = run_command("npm install -g yo generator-code", stream_output=True)
+    specs = " ".join(f'"{name}@{requirement}"' for name, requirement in unmet.items())
+    result = run_command(f"npm install -g {specs}", stream_output=True)
     if result != 0:
         print("Failed to install Yeoman and generator-code.")
         sys.exit(result)
-    
+
     # Verify installation
-    yo_path = os.path.join(os.path.expanduser("~"), "AppData", "Roaming", "npm", "node_modules", "yo", "lib", "cli.js")
-    if os.path.exists(yo_path):
-        print(f"Yeoman installed successfully at: {yo_path}")
-    else:
-        print("Yeoman installation not found. Please check your npm configuration.")
+    unmet = unmet_global_npm_packages()
+    if unmet:
+        print(f"{', '.join(unmet)} not found in {npm_global_modules_dir()}. Please check your npm configuration.")
         sys.exit(1)
-    
+
     print("Yeoman and VSCode Extension Generator installed successfully.")
 
 def install_maven():
     """Check if Maven is installed, and if not, install it."""
-    if shutil.which("mvn") is None:
+    if find_tool("mvn") is None:
         print("Maven is not installed. Installing Maven...")
         if platform.system() == "Windows":
-            maven_url = "https://archive.apache.org/dist/maven/maven-3/3.8.8/binaries/apache-maven-3.8.8-bin.zip"
-            maven_zip = "apache-maven-3.8.8-bin.zip"
+            maven_artifact = PROVISION_ARTIFACTS["maven"]["Windows"]
             maven_dir = "apache-maven-3.8.8"
-            run_command(f"curl -O {maven_url}", stream_output=True)
-            run_command(f"unzip {maven_zip}", stream_output=True)
+            maven_zip = fetch_artifact(maven_artifact["url"], maven_artifact["sha256"])
+            run_command(f"unzip -o \"{maven_zip}\"", stream_output=True)
             os.environ["PATH"] += os.pathsep + os.path.abspath(maven_dir + "/bin")
             run_command(f"setx PATH \"%PATH%;{os.path.abspath(maven_dir + '/bin')}\"", stream_output=True)
         elif platform.system() == "Linux":
             install_package("mvn", "sudo apt-get update && sudo apt-get install -y maven")
         elif platform.system() == "Darwin":
-            install_package("maven", "brew install maven")
+            install_package("mvn", "brew install maven")
         else:
             print("Unsupported operating system for automatic Maven installation.")
             sys.exit(1)
@@ -119,13 +1024,12 @@ def install_maven():
 
 def install_ruby():
     """Check if Ruby is installed, and if not, install it."""
-    if shutil.which("ruby") is None:
+    if find_tool("ruby") is None:
         print("Ruby is not installed. Installing Ruby...")
         if platform.system() == "Windows":
-            ruby_url = "https://rubyinstaller.org/downloads/rubyinstaller-3.2.1-1-x64.exe"
-            ruby_installer = "rubyinstaller-3.2.1-1-x64.exe"
-            run_command(f"curl -O {ruby_url}", stream_output=True)
-            run_command(f"{ruby_installer}", stream_output=True)
+            ruby_artifact = PROVISION_ARTIFACTS["ruby"]["Windows"]
+            ruby_installer = fetch_artifact(ruby_artifact["url"], ruby_artifact["sha256"])
+            run_command(f"\"{ruby_installer}\"", stream_output=True)
         elif platform.system() == "Linux":
             install_package("ruby", "sudo apt-get update && sudo apt-get install -y ruby-full")
         elif platform.system() == "Darwin":
@@ -138,14 +1042,13 @@ def install_ruby():
 
 def install_php():
     """Check if PHP is installed, and if not, install it."""
-    if shutil.which("php") is None:
+    if find_tool("php") is None:
         print("PHP is not installed. Installing PHP...")
         if platform.system() == "Windows":
-            php_url = "https://windows.php.net/downloads/releases/php-8.1.11-Win32-vs16-x64.zip"
-            php_zip = "php-8.1.11-Win32-vs16-x64.zip"
+            php_artifact = PROVISION_ARTIFACTS["php"]["Windows"]
             php_dir = "php-8.1.11-Win32-vs16-x64"
-            run_command(f"curl -O {php_url}", stream_output=True)
-            run_command(f"unzip {php_zip}", stream_output=True)
+            php_zip = fetch_artifact(php_artifact["url"], php_artifact["sha256"])
+            run_command(f"unzip -o \"{php_zip}\" -d {php_dir}", stream_output=True)
             os.environ["PATH"] += os.pathsep + os.path.abspath(php_dir + "/")
             run_command(f"setx PATH \"%PATH%;{os.path.abspath(php_dir)}\"", stream_output=True)
         elif platform.system() == "Linux":
@@ -160,11 +1063,11 @@ def install_php():
 
 def install_go():
     """Check if Go is installed, and if not, install it."""
-    if shutil.which("go") is None:
+    if find_tool("go") is None:
         print("Go is not installed. Installing Go...")
         if platform.system() == "Windows":
-            go_url = "https://golang.org/dl/go1.20.3.windows-amd64.msi"
-            run_command(f"curl -O {go_url}", stream_output=True)
+            go_artifact = PROVISION_ARTIFACTS["go"]["Windows"]
+            fetch_artifact(go_artifact["url"], go_artifact["sha256"])
         elif platform.system() == "Linux":
             install_package("go", "sudo apt-get update && sudo apt-get install -y golang")
         elif platform.system() == "Darwin":
@@ -175,80 +1078,1223 @@ def install_go():
     else:
         print("Go is already installed.")
 
+# Provisioning graph: each step lists the steps it depends on and, per OS, the
+# resources it must hold exclusively while running (package manager locks, setx PATH)
+# and the system packages (binary -> package) that can be batched into one transaction.
+PROVISION_STEPS = {
+    "python": {"func": lambda: setup_python_environment(), "deps": [], "resources": {}},
+    "node": {"func": install_node, "deps": [], "resources": {}},
+    "npm": {"func": install_npm, "deps": ["node"], "resources": {}},
+    "yeoman": {"func": install_yeoman_and_generator, "deps": ["npm"], "resources": {"Linux": ["npm-global"], "Darwin": ["npm-global"], "Windows": ["npm-global"]}},
+    "dotnet": {"func": check_and_install_dotnet, "deps": [], "resources": {"Darwin": ["brew"], "Windows": ["path-env"]}},
+    "maven": {"func": install_maven, "deps": [], "resources": {"Linux": ["apt"], "Darwin": ["brew"], "Windows": ["path-env"]},
+               "packages": {"Linux": {"mvn": "maven"}, "Darwin": {"mvn": "maven"}}},
+    "ruby": {"func": install_ruby, "deps": [], "resources": {"Linux": ["apt"], "Darwin": ["brew"], "Windows": ["path-env"]},
+               "packages": {"Linux": {"ruby": "ruby-full"}, "Darwin": {"ruby": "ruby"}}},
+    "php": {"func": install_php, "deps": [], "resources": {"Linux": ["apt"], "Darwin": ["brew"], "Windows": ["path-env"]},
+               "packages": {"Linux": {"php": "php"}, "Darwin": {"php": "php"}}},
+    "go": {"func": install_go, "deps": [], "resources": {"Linux": ["apt"], "Darwin": ["brew"], "Windows": ["path-env"]},
+               "packages": {"Linux": {"go": "golang"}, "Darwin": {"go": "go"}}}
+}
+
+def provision_steps_for_languages(languages, generator=None):
+    """Return the provisioning steps needed to scaffold extensions for the given languages."""
+    steps = []
+    for language in languages:
+        for step in LANGUAGE_PROVISION_STEPS[language] + EXTENSION_SCAFFOLD_STEPS[generator or EXTENSION_GENERATOR]:
+            if step not in steps:
+                steps.append(step)
+    return steps
+
+def resolve_provision_plan(step_names):
+    """Expand the requested steps with their dependencies, in dependency order."""
+    order = []
+
+    def visit(name, trail):
+        if name in order:
+            return
+        if name in trail:
+            raise ValueError(f"Dependency cycle in provisioning plan: {' -> '.join(trail + [name])}")
+        if name not in PROVISION_STEPS:
+            raise ValueError(f"Unknown provisioning step: {name}")
+        for dep in PROVISION_STEPS[name]["deps"]:
+            visit(dep, trail + [name])
+        order.append(name)
+
+    for name in step_names:
+        visit(name, [])
+    return order
+
+def collect_system_packages(plan):
+    """Return the package manager and the packages still missing for the steps of a plan."""
+    system = platform.system()
+    manager = {"Linux": "apt", "Darwin": "brew"}.get(system)
+    packages = {}
+    for name in plan:
+        for binary, package in PROVISION_STEPS[name].get("packages", {}).get(system, {}).items():
+            if find_tool(binary) is None:
+                packages.setdefault(name, []).append(package)
+    return manager, packages
+
+def _critical_path(plan, results, steps):
+    """Return the longest chain of dependent steps and its total duration."""
+    best = {}
+    for name in plan:
+        duration = results[name]["duration"]
+        chain, length = [], 0.0
+        for dep in steps[name]["deps"]:
+            if best[dep][1] > length:
+                chain, length = best[dep]
+        best[name] = (chain + [name], length + duration)
+    if not best:
+        return [], 0.0
+    return max(best.values(), key=lambda item: item[1])
+
+def print_provisioning_summary(plan, results, elapsed, steps=PROVISION_STEPS):
+    """Print per-step timings, total wall time and the critical path of a provisioning run."""
+    print("\nProvisioning summary:")
+    width = max(len(name) for name in plan)
+    for name in plan:
+        result = results[name]
+        line = f"  {name.ljust(width)}  {result['status'].ljust(7)}  {result['duration']:.2f}s"
+        if result["wait"] >= 0.01:
+            line += f" (waited {result['wait']:.2f}s for {', '.join(result['resources'])})"
+        if result["error"]:
+            line += f" - {result['error']}"
+        if result.get("resumed"):
+            line += " (completed in an earlier run)"
+        print(line)
+    chain, length = _critical_path(plan, results, steps)
+    print(f"Total wall time: {elapsed:.2f}s")
+    print(f"Critical path: {' -> '.join(chain)} ({length:.2f}s)")
+
+def run_provisioning_plan(step_names, max_workers=PROVISION_MAX_WORKERS):
+    """Run provisioning steps on a bounded worker pool, starting each step once its dependencies succeed."""
+    plan = resolve_provision_plan(step_names)
+    if not plan:
+        return {}
+    system = platform.system()
+    steps = {name: dict(PROVISION_STEPS[name]) for name in plan}
+
+    # Install every missing apt/brew package of the plan in one transaction up front;
+    # the steps then find their binaries already present.
+    manager, packages = collect_system_packages(plan)
+    if packages:
+        batch = sorted({package for names in packages.values() for package in names})
+        steps["system-packages"] = {"func": lambda: _install_batch(manager, batch), "deps": [],
+                                    "resources": {system: [manager]}}
+        for name in packages:
+            steps[name]["deps"] = steps[name]["deps"] + ["system-packages"]
+        plan = ["system-packages"] + plan
+
+    resource_locks = {}
+    for name in plan:
+        for resource in steps[name]["resources"].get(system, []):
+            resource_locks.setdefault(resource, threading.Lock())
+
+    def run_step(name):
+        step = steps[name]
+        # Acquire in a fixed order so two steps sharing resources cannot deadlock
+        resources = sorted(step["resources"].get(system, []))
+        queued = time.perf_counter()
+        for resource in resources:
+            resource_locks[resource].acquire()
+        leases = contextlib.ExitStack()
+        started = time.perf_counter()
+        status, error = "ok", None
+        try:
+            # Other runs on this host holding the same resources or installing the same toolchain go first;
+            # once they finish, the step finds their result instead of installing it again
+            if sum(leases.enter_context(host_lease(lease)) for lease in resources + [f"provision-{name}"]):
+                invalidate_toolchain_inventory()
+            started = time.perf_counter()
+            _command_context.log_path = os.path.join(log_dir, f"{name}.log")
+            _command_context.prefix = f"[{name}] "
+            with span(f"provision {name}", "provision", waited_s=round(started - queued, 3)):
+                step["func"]()
+        except SystemExit as e:
+            status, error = "failed", f"exited with status {e.code}"
+        except Exception as e:
+            status, error = "failed", str(e)
+        finally:
+            _command_context.log_path = None
+            _command_context.prefix = None
+            leases.close()
+            for resource in reversed(resources):
+                resource_locks[resource].release()
+        return {"status": status, "error": error, "resources": resources,
+                "wait": started - queued, "duration": time.perf_counter() - started}
+
+    log_dir = os.path.join(COMMAND_LOG_DIR, time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}")
+    results = {}
+    journal = current_run_journal()
+    for name in plan:
+        if journal_step_done(journal, name):
+            results[name] = {"status": "ok", "error": None, "resources": [], "wait": 0.0, "duration": 0.0, "resumed": True}
+    pending = [name for name in plan if name not in results]
+    running = {}
+    run_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(plan)))) as pool, _cancel_commands_on_interrupt():
+        while pending or running:
+            for name in list(pending):
+                deps = steps[name]["deps"]
+                if any(results.get(dep, {}).get("status") in ("failed", "skipped") for dep in deps):
+                    results[name] = {"status": "skipped", "error": "dependency failed", "resources": [],
+                                     "wait": 0.0, "duration": 0.0}
+                    pending.remove(name)
+                elif all(results.get(dep, {}).get("status") == "ok" for dep in deps):
+                    running[pool.submit(run_step, name)] = name
+                    pending.remove(name)
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                record_journal_step(journal, name, results[name]["status"], results[name]["error"])
+
+    results = {name: results[name] for name in plan}
+    print_provisioning_summary(plan, results, time.perf_counter() - run_started, steps)
+    if os.path.isdir(log_dir):
+        print(f"Step logs: {log_dir}")
+    return results
+
+@contextlib.contextmanager
+def _cancel_commands_on_interrupt():
+    """Kill every running command when the block is interrupted, so worker threads stop waiting on them."""
+    try:
+        yield
+    except KeyboardInterrupt:
+        cancel_all_commands()
+        raise
+
+def _install_batch(manager, packages):
+    """Install a batch of system packages, exiting like install_package on failure."""
+    print(f"Installing system packages in one {manager} transaction: {', '.join(packages)}")
+    result = install_system_packages(manager, packages)
+    if result != 0:
+        print(f"Failed to install {', '.join(packages)}.")
+        sys.exit(result)
+
+def provision_or_raise(step_names):
+    """Run a provisioning plan and raise if any step did not complete."""
+    results = run_provisioning_plan(step_names)
+    failed = [name for name, result in results.items() if result["status"] != "ok"]
+    if failed:
+        raise RuntimeError(f"Provisioning failed for: {', '.join(failed)}")
+    return results
+
+# The run journal of the create run executing on this thread, if any
+_journal_local = threading.local()
+
+def start_run_journal(inputs):
+    """Start a journal recording the inputs and completed steps of a create run."""
+    os.makedirs(RUN_JOURNAL_DIR, exist_ok=True)
+    run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    journal = {"path": os.path.join(RUN_JOURNAL_DIR, f"{run_id}.json"), "run_id": run_id,
+               "pid": os.getpid(), "host": socket.gethostname(),
+               "inputs": inputs, "status": "running", "error": None, "steps": {}}
+    save_run_journal(journal)
+    # Keep only the most recent journals
+    names = sorted(name for name in os.listdir(RUN_JOURNAL_DIR) if name.endswith(".json"))
+    for name in names[:-RUN_JOURNAL_KEEP]:
+        os.remove(os.path.join(RUN_JOURNAL_DIR, name))
+    return journal
+
+def save_run_journal(journal):
+    """Atomically write a run journal."""
+    with open(journal["path"] + ".tmp", "w") as file:
+        json.dump(journal, file, indent=2)
+    os.replace(journal["path"] + ".tmp", journal["path"])
+
+def _journal_owner_alive(journal):
+    """Return whether the process that recorded a running journal is still executing it."""
+    if journal.get("status") != "running" or journal.get("host") != socket.gethostname() or not journal.get("pid"):
+        return False
+    # os.kill(pid, 0) terminates the process on Windows, so a running journal there counts as owned
+    if platform.system() == "Windows":
+        return True
+    try:
+        os.kill(journal["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def load_latest_run_journal():
+    """Return the journal of the most recent create run that did not complete and no live process owns, or None."""
+    if not os.path.isdir(RUN_JOURNAL_DIR):
+        return None
+    for name in sorted(os.listdir(RUN_JOURNAL_DIR), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(RUN_JOURNAL_DIR, name)) as file:
+                journal = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if journal.get("status") != "complete" and not _journal_owner_alive(journal):
+            journal["path"] = os.path.join(RUN_JOURNAL_DIR, name)
+            return journal
+    return None
+
+def current_run_journal():
+    """Return the run journal of the create run executing on this thread, if any."""
+    return getattr(_journal_local, "journal", None)
+
+def journal_step_done(journal, name):
+    """Whether a run journal records the step as completed."""
+    return journal is not None and journal["steps"].get(name, {}).get("status") == "ok"
+
+def record_journal_step(journal, name, status, error=None):
+    """Record a step's outcome in a run journal, if one is active."""
+    if journal is None:
+        return
+    journal["steps"][name] = {"status": status, "error": error, "finished": time.time()}
+    save_run_journal(journal)
+
+def run_journaled_create(journal):
+    """Provision and generate the project described by a run journal, skipping the steps it records as done."""
+    inputs = journal["inputs"]
+    # Claim the journal so a concurrent resume elsewhere leaves it alone
+    journal.update(pid=os.getpid(), host=socket.gethostname(), status="running")
+    save_run_journal(journal)
+    _journal_local.journal = journal
+    try:
+        provision_or_raise(provision_steps_for_languages([inputs["language"]], inputs.get("generator")))
+        project_dir = create_project(inputs["name"], inputs["description"], inputs["language"], inputs["framework"],
+                                     inputs.get("base_dir"), inputs.get("generator"), inputs.get("force", False),
+                                     inputs.get("bundle", False), inputs.get("server_template", "sample"),
+                                     inputs.get("profile", "dev"))
+    except Exception as e:
+        journal["status"], journal["error"] = "failed", str(e)
+        save_run_journal(journal)
+        raise
+    finally:
+        _journal_local.journal = None
+    journal["status"], journal["error"] = "complete", None
+    save_run_journal(journal)
+    return project_dir
+
+def resume_run():
+    """Continue the most recent incomplete create run from its first incomplete step. Returns the project directory or None."""
+    journal = load_latest_run_journal()
+    if journal is None:
+        print("There is no incomplete run to resume.")
+        return None
+    inputs = journal["inputs"]
+    done = [name for name in journal["steps"] if journal_step_done(journal, name)]
+    print(f"Resuming run {journal['run_id']}: '{inputs['name']}' ({inputs['language']}/{inputs['framework']})")
+    if done:
+        print(f"Already completed: {', '.join(done)}")
+    return run_journaled_create(journal)
+
+def _owned_by_package_manager(root):
+    """Return whether an install root under a package-managed tree belongs to Homebrew, dpkg or rpm."""
+    if not any(root.startswith(tree + "/") for tree in ENV_PACKAGE_MANAGED_TREES):
+        return False
+    if "/Cellar/" in root:
+        return True
+    for command in (["dpkg", "-S", root], ["rpm", "-qf", root]):
+        if shutil.which(command[0]) and subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+            return True
+    return False
+
+def _is_within(root, path):
+    """Return whether path, with symlinks resolved, is root or lies under it."""
+    path = os.path.realpath(path)
+    return os.path.splitdrive(path)[0] == os.path.splitdrive(root)[0] and os.path.commonpath([root, path]) == root
+
+def _escaping_symlinks(root):
+    """Return the symlinks under root that are absolute or point outside it."""
+    root = os.path.realpath(root)
+    escaping = []
+    for directory, dirs, files in os.walk(root):
+        for name in dirs + files:
+            path = os.path.join(directory, name)
+            if os.path.islink(path):
+                link = os.readlink(path)
+                if os.path.isabs(link) or not _is_within(root, os.path.join(directory, link)):
+                    escaping.append(f"{os.path.relpath(path, root)} -> {link}")
+    return escaping
+
+def _toolchain_root(binary_path):
+    """Return (install root, bin directory relative to it) for a self-contained toolchain, or None if it lives in a system prefix."""
+    bin_dir = os.path.dirname(os.path.realpath(binary_path))
+    root = os.path.dirname(bin_dir) if os.path.basename(bin_dir) == "bin" else bin_dir
+    if root in ENV_SYSTEM_PREFIXES or os.path.splitdrive(root)[1] in ("", os.sep) or _owned_by_package_manager(root):
+        return None
+    escaping = _escaping_symlinks(root)
+    if escaping:
+        raise RuntimeError(f"Refusing to bundle {root}: it links outside itself ({', '.join(escaping[:3])})")
+    return root, os.path.relpath(bin_dir, root)
+
+def _global_npm_packages(root):
+    """Return the versions of the npm packages installed globally under a Node.js root."""
+    modules = os.path.join(root, "lib", "node_modules")
+    return read_npm_packages(modules if os.path.isdir(modules) else os.path.join(root, "node_modules"))
+
+def read_npm_packages(modules):
+    """Return the versions of the packages in a node_modules directory, read from their package.json files."""
+    names = []
+    for name in sorted(os.listdir(modules)) if os.path.isdir(modules) else []:
+        if name.startswith("@"):
+            names += [f"{name}/{scoped}" for scoped in sorted(os.listdir(os.path.join(modules, name)))]
+        elif not name.startswith("."):
+            names.append(name)
+    packages = {}
+    for name in names:
+        try:
+            with open(os.path.join(modules, name, "package.json")) as file:
+                packages[name] = json.load(file).get("version")
+        except (OSError, ValueError):
+            continue
+    return packages
+
+def _pack_component(root, archive_path):
+    """Compress a toolchain install root into its own tarball and return its sha256 and size."""
+    with tarfile.open(archive_path, "w:gz", compresslevel=6) as tar:
+        for name in sorted(os.listdir(root)):
+            tar.add(os.path.join(root, name), arcname=name)
+    return _sha256_of_file(archive_path), os.path.getsize(archive_path)
+
+@traced("env")
+def export_environment(bundle_path, components=None):
+    """Bundle the installed toolchains into one checksummed archive with a lock file of exact versions. Returns the lock."""
+    system = platform.system()
+    manager = {"Linux": "apt", "Darwin": "brew"}.get(system)
+    inventory = get_toolchain_inventory(refresh=True)
+    lock = {"format": ENV_BUNDLE_FORMAT, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "system": system, "machine": platform.machine(), "components": {}, "system_packages": {}}
+    for name in components or ENV_BUNDLE_COMPONENTS:
+        if name not in ENV_BUNDLE_COMPONENTS:
+            raise ValueError(f"Unknown toolchain '{name}'. Choose from: {', '.join(ENV_BUNDLE_COMPONENTS)}")
+        binary = ENV_BUNDLE_COMPONENTS[name]
+        tool = inventory[binary]
+        if tool["path"] is None:
+            print(f"{name} is not installed; leaving it out of the bundle.")
+            continue
+        located = _toolchain_root(tool["path"])
+        if located is None:
+            # Owned by apt/brew: record the package so import installs the same one
+            package = PROVISION_STEPS[name].get("packages", {}).get(system, {}).get(binary)
+            lock["system_packages"][name] = {"version": tool["version"], "manager": manager, "package": package}
+            continue
+        root, bin_dir = located
+        lock["components"][name] = {"version": tool["version"], "source": root, "bin": bin_dir,
+                                    "archive": f"components/{name}.tar.gz"}
+        if name == "node":
+            lock["components"][name]["global_packages"] = _global_npm_packages(root)
+    if not lock["components"] and not lock["system_packages"]:
+        raise RuntimeError("None of the requested toolchains are installed.")
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as staging:
+        names = list(lock["components"])
+        with ThreadPoolExecutor(max_workers=max(1, min(PROVISION_MAX_WORKERS, len(names)))) as pool:
+            packed = pool.map(lambda name: _pack_component(lock["components"][name]["source"],
+                                                           os.path.join(staging, f"{name}.tar.gz")), names)
+            for name, (sha256, size) in zip(names, packed):
+                lock["components"][name].update(sha256=sha256, size=size)
+                print(f"Packed {name} {lock['components'][name]['version']} ({size / 1024 ** 2:.1f} MB)")
+        lock_path = os.path.join(staging, "lock.json")
+        with open(lock_path, "w") as file:
+            json.dump(lock, file, indent=2)
+        # The outer archive is uncompressed; each component is compressed on its own so import can unpack them in parallel
+        with tarfile.open(bundle_path + ".partial", "w") as bundle:
+            bundle.add(lock_path, arcname="lock.json")
+            for name in names:
+                bundle.add(os.path.join(staging, f"{name}.tar.gz"), arcname=lock["components"][name]["archive"])
+        os.replace(bundle_path + ".partial", bundle_path)
+    print(f"Wrote {bundle_path} ({os.path.getsize(bundle_path) / 1024 ** 2:.1f} MB) in {time.perf_counter() - started:.2f}s")
+    return lock
+
+def _check_tar_members(tar, target):
+    """Reject archive entries that would be written, or link, outside target, or that are device files."""
+    root = os.path.realpath(target)
+    for member in tar.getmembers():
+        path = os.path.join(root, member.name)
+        if os.path.isabs(member.name) or not _is_within(root, path):
+            raise ValueError(f"Archive entry {member.name!r} is outside the extraction directory")
+        if member.issym() and (os.path.isabs(member.linkname) or not _is_within(root, os.path.join(os.path.dirname(path), member.linkname))):
+            raise ValueError(f"Archive entry {member.name!r} links outside the extraction directory")
+        if member.islnk() and (os.path.isabs(member.linkname) or not _is_within(root, os.path.join(root, member.linkname))):
+            raise ValueError(f"Archive entry {member.name!r} links outside the extraction directory")
+        if member.isdev():
+            raise ValueError(f"Archive entry {member.name!r} is a device file")
+
+def _unpack_component(archive_path, target):
+    """Extract a component tarball into target, replacing any previous copy atomically."""
+    partial = target + ".partial"
+    if os.path.exists(partial):
+        shutil.rmtree(partial)
+    with tarfile.open(archive_path, "r:gz") as tar:
+        # Every archive gets the same check, which also rejects absolute symlinks the "tar" filter lets
+        # through; the filter (Python 3.12, backported to 3.8.17+) is kept on top where it exists
+        _check_tar_members(tar, partial)
+        if hasattr(tarfile, "tar_filter"):
+            tar.extractall(partial, filter="tar")
+        else:
+            tar.extractall(partial)
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.replace(partial, target)
+
+@traced("env")
+def import_environment(bundle_path, dest=None):
+    """Unpack a toolchain bundle in parallel, install its system packages and put its toolchains on PATH. Returns the lock."""
+    dest = os.path.abspath(dest or ENV_DIR)
+    started = time.perf_counter()
+    with tarfile.open(bundle_path, "r:") as bundle:
+        lock = json.load(bundle.extractfile("lock.json"))
+        if lock.get("format") != ENV_BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported bundle format {lock.get('format')}; expected {ENV_BUNDLE_FORMAT}")
+        if (lock["system"], lock["machine"]) != (platform.system(), platform.machine()):
+            raise ValueError(f"Bundle was built for {lock['system']} {lock['machine']}, this is {platform.system()} {platform.machine()}")
+        os.makedirs(dest, exist_ok=True)
+        pending = {}
+        for name, component in lock["components"].items():
+            marker = os.path.join(dest, name, ".bundle-sha256")
+            if os.path.basename(name) != name or name in ("", ".", ".."):
+                raise ValueError(f"Invalid toolchain name {name!r} in {bundle_path}")
+            if os.path.exists(marker):
+                with open(marker) as file:
+                    if file.read() == component["sha256"]:
+                        print(f"{name} {component['version']} is already unpacked.")
+                        continue
+            archive_path = os.path.join(dest, f".{name}.tar.gz")
+            with bundle.extractfile(component["archive"]) as source, open(archive_path, "wb") as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            if _sha256_of_file(archive_path) != component["sha256"]:
+                os.remove(archive_path)
+                raise RuntimeError(f"Checksum mismatch for {name} in {bundle_path}")
+            pending[name] = archive_path
+
+    def unpack(name):
+        target = os.path.join(dest, name)
+        _unpack_component(pending[name], target)
+        with open(os.path.join(target, ".bundle-sha256"), "w") as file:
+            file.write(lock["components"][name]["sha256"])
+        os.remove(pending[name])
+        print(f"Unpacked {name} {lock['components'][name]['version']}")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(PROVISION_MAX_WORKERS, len(pending)))) as pool:
+        list(pool.map(unpack, pending))
+
+    missing = [entry["package"] for name, entry in lock["system_packages"].items()
+               if entry["package"] and find_tool(ENV_BUNDLE_COMPONENTS[name]) is None]
+    if missing:
+        manager = lock["system_packages"][next(iter(lock["system_packages"]))]["manager"]
+        if install_system_packages(manager, missing) != 0:
+            raise RuntimeError(f"Failed to install {', '.join(missing)}")
+
+    bin_dirs = [os.path.normpath(os.path.join(dest, name, component["bin"])) for name, component in lock["components"].items()]
+    path_entries = os.environ.get("PATH", "").split(os.pathsep)
+    os.environ["PATH"] = os.pathsep.join([entry for entry in bin_dirs if entry not in path_entries] + path_entries)
+    if platform.system() == "Windows":
+        run_command(f"setx PATH \"%PATH%;{';'.join(bin_dirs)}\"", stream_output=True)
+    else:
+        with open(os.path.join(dest, "env.sh"), "w") as file:
+            file.write(f"export PATH=\"{':'.join(bin_dirs)}:$PATH\"\n")
+        print(f"Add '. {os.path.join(dest, 'env.sh')}' to your shell profile to use these toolchains in new shells.")
+    invalidate_toolchain_inventory()
+    inventory = get_toolchain_inventory()
+    for name, entry in list(lock["components"].items()) + list(lock["system_packages"].items()):
+        version = inventory[ENV_BUNDLE_COMPONENTS[name]]["version"]
+        if version != entry["version"]:
+            print(f"Warning: {name} reports version {version!r}, the bundle locked {entry['version']!r}")
+    print(f"Imported {len(lock['components'])} toolchains from {bundle_path} in {time.perf_counter() - started:.2f}s")
+    return lock
+
+def handle_env_command(args):
+    """Handle the 'env export [bundle] [toolchain...]' and 'env import <bundle> [dest]' REPL commands."""
+    if args[:1] == ["export"]:
+        bundle_path = args[1] if len(args) > 1 else f"toolchains-{platform.system()}-{platform.machine()}-{time.strftime('%Y%m%d')}.tar".lower()
+        export_environment(bundle_path, args[2:] or None)
+    elif args[:1] == ["import"] and len(args) in (2, 3):
+        import_environment(args[1], args[2] if len(args) > 2 else None)
+        # Carry the new PATH into the running shell session
+        if _shell_session["process"] is not None and _shell_session["process"].poll() is None:
+            run_in_shell_session(f"export PATH={shlex.quote(os.environ['PATH'])}")
+    else:
+        print("Usage: env export [bundle] [toolchain...] | env import <bundle> [dest]")
+
+@functools.lru_cache(maxsize=None)
+def load_template(name):
+    """Return the files of a template directory in the templates package as {relative path: content}."""
+    files = {}
+    pending = [("", importlib.resources.files("templates").joinpath(name))]
+    while pending:
+        prefix, directory = pending.pop()
+        for entry in directory.iterdir():
+            if entry.name == "__pycache__":
+                continue
+            if entry.is_dir():
+                pending.append((prefix + entry.name + "/", entry))
+            else:
+                files[prefix + entry.name] = entry.read_bytes().decode("utf-8")
+    return dict(sorted(files.items()))
+
+# templates/ext-language-server is a snapshot of the files generator-code writes for
+# `yo code --type=ext-language-server`. Placeholders are substituted by render_language_server_template;
+# bump the version when the snapshot changes so existing projects can tell which template they were built from.
+LANGUAGE_SERVER_TEMPLATE_VERSION = "1.0.0"
+
+# Language-server variants selectable at create time, as template directories whose files replace or extend
+# the sample server. templates/fast-server has incremental sync, debounced and cancellable validation, a
+# per-document cache of analysis results by line, and uncached lines analyzed on worker threads.
+SERVER_TEMPLATES = {"sample": None, "fast": "fast-server"}
+
+def apply_server_template(files, server_template):
+    """Swap the sample language server of rendered extension files for another SERVER_TEMPLATES variant."""
+    if server_template == "sample":
+        return files
+    files = dict(files, **load_template(SERVER_TEMPLATES[server_template]))
+    manifest = json.loads(files["package.json"])
+    identifier = manifest["name"]
+    manifest["contributes"]["configuration"]["properties"][f"{identifier}.validationDelay"] = {
+        "scope": "resource",
+        "type": "number",
+        "default": 150,
+        "description": "Milliseconds to wait after the last edit before validating a document."
+    }
+    manifest["scripts"]["stress"] = "tsc -b && node scripts/stress-large-document.js"
+    files["package.json"] = json.dumps(manifest, indent="\t", ensure_ascii=False) + "\n"
+    return files
+
+def apply_bundle_overlay(files):
+    """Switch rendered extension files to the bundled build: esbuild output in dist/, a package script and the activation benchmark."""
+    # templates/bundle holds an esbuild build of both entry points into dist/, and a headless benchmark
+    # of server load and initialize-handshake time
+    files = dict(files, **load_template("bundle"))
+    if "server/src/analysisWorker.ts" in files:
+        # Worker threads load their script from disk, so the analysis worker is its own entry point
+        files["esbuild.js"] = files["esbuild.js"].replace(
+            "server: 'server/src/server.ts'", "server: 'server/src/server.ts',\n\t\t\tanalysisWorker: 'server/src/analysisWorker.ts'")
+    manifest = json.loads(files["package.json"])
+    manifest["main"] = "./dist/extension.js"
+    manifest["scripts"].update({
+        "vscode:prepublish": "tsc -b && node esbuild.js --production",
+        "compile": "tsc -b && node esbuild.js",
+        "watch:bundle": "node esbuild.js --watch",
+        "package": "vsce package --no-dependencies",
+        "bench:activation": "npm run compile && node esbuild.js --production && node scripts/bench-activation.js"
+    })
+    manifest["devDependencies"].update({"esbuild": "^0.20.2", "@vscode/vsce": "^2.24.0"})
+    files["package.json"] = json.dumps(manifest, indent="\t", ensure_ascii=False) + "\n"
+    # The bundled client sits next to the bundled server in dist/; the tsc build keeps its own layout
+    files["client/src/extension.ts"] = files["client/src/extension.ts"].replace(
+        """	const serverModule = context.asAbsolutePath(
+		path.join('server', 'out', 'server.js')
+	);""",
+        """	const serverModule = path.basename(__dirname) === 'dist'
+		? path.join(__dirname, 'server.js')
+		: context.asAbsolutePath(path.join('server', 'out', 'server.js'));""")
+    files[".vscode/launch.json"] = files[".vscode/launch.json"].replace(
+        '"outFiles": ["${workspaceRoot}/client/out/**/*.js"]', '"outFiles": ["${workspaceRoot}/dist/**/*.js"]').replace(
+        '"script": "watch"', '"script": "compile"')
+    files[".gitignore"] = files[".gitignore"] + "dist\nbench-activation.json\n"
+    return files
+
 def generate_extension_name_and_identifier(extension_name):
     """Automatically generate the extension name and identifier."""
     identifier = extension_name.lower().replace(" ", "-")
     return extension_name, identifier
 
-def create_extension_project(extension_name, extension_description):
-    """Generate a new VSCode extension project using Yeoman."""
+def render_language_server_template(extension_name, identifier, extension_description):
+    """Return the language-server template files with the extension details substituted."""
+    files = {}
+    for relpath, content in load_template("ext-language-server").items():
+        values = {
+            "__EXTENSION_IDENTIFIER__": identifier,
+            "__EXTENSION_DISPLAY_NAME__": extension_name,
+            "__EXTENSION_DESCRIPTION__": extension_description
+        }
+        for placeholder, value in values.items():
+            if relpath.endswith(".json"):
+                value = json.dumps(value)[1:-1]
+            content = content.replace(placeholder, value)
+        files[relpath] = content
+    return files
+
+@traced("generate")
+def install_extension_dependencies(extension_dir, mode=None):
+    """Install the npm dependencies of a generated extension if npm is available, raising if npm install fails."""
+    mode = mode or NODE_MODULES_MODE
+    if mode == "shared":
+        tree_key = _node_modules_tree_key(extension_dir)
+        if os.path.exists(os.path.join(NODE_STORE_DIR, "trees", tree_key + ".json")):
+            materialize_node_modules(extension_dir, tree_key)
+            return
+    if find_tool("npm") is None:
+        print(f"npm not found. Skipping dependency installation; run 'npm install' in {final_project_path(extension_dir)} later.")
+        return
+    started = time.perf_counter()
+    result = run_command("npm install", cwd=extension_dir, stream_output=True)
+    if result != 0:
+        # A half-written node_modules would make the next run skip the install, so it goes
+        shutil.rmtree(os.path.join(extension_dir, "node_modules"), ignore_errors=True)
+        raise RuntimeError(f"'npm install' exited with status {result} in {final_project_path(extension_dir)}")
+    print(f"npm install took {time.perf_counter() - started:.2f}s")
+    if mode == "shared":
+        ingest_node_modules(extension_dir, tree_key)
+
+# Files outside node_modules that npm install produces and that belong to the stored tree
+_NODE_TREE_EXTRA_FILES = ["package-lock.json", "client/package-lock.json", "server/package-lock.json"]
+
+def _node_modules_tree_key(extension_dir):
+    """Key a project's dependency tree by its declared dependencies, Node version and platform."""
+    digest = hashlib.sha256()
+    node = get_toolchain_inventory()["node"]["version"] if find_tool("node") else None
+    digest.update(f"{platform.system()}\0{platform.machine()}\0{node}\0".encode())
+    for relpath in ("package.json", "client/package.json", "server/package.json"):
+        path = os.path.join(extension_dir, relpath)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as file:
+            manifest = json.load(file)
+        # Names and descriptions differ per project; only the dependency sets and install scripts matter
+        relevant = {key: manifest.get(key) for key in ("dependencies", "devDependencies", "optionalDependencies")}
+        relevant["postinstall"] = manifest.get("scripts", {}).get("postinstall")
+        digest.update(relpath.encode() + b"\0" + json.dumps(relevant, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def _iter_node_tree_files(extension_dir):
+    """Yield the relative paths of every file, symlink and empty directory npm install produced in a project."""
+    for relpath in _NODE_TREE_EXTRA_FILES:
+        if os.path.isfile(os.path.join(extension_dir, relpath)):
+            yield relpath
+    for subdir in ("", "client", "server"):
+        modules_dir = os.path.join(extension_dir, subdir, "node_modules")
+        for directory, subdirs, filenames in os.walk(modules_dir):
+            if not subdirs and not filenames:
+                yield os.path.relpath(directory, extension_dir).replace(os.sep, "/")
+            for name in subdirs + filenames:
+                path = os.path.join(directory, name)
+                if name in filenames or os.path.islink(path):
+                    yield os.path.relpath(path, extension_dir).replace(os.sep, "/")
+
+def _make_writable(path):
+    """Give the owner write access to a private copy of a read-only store object."""
+    os.chmod(path, os.stat(path).st_mode | 0o200)
+
+def _link_or_copy(source, destination):
+    """Reflink, else hardlink, else copy source to destination; return "linked" if storage is shared, else "copied"."""
+    # Reflinks and copies are writable; a hardlink shares the read-only store object, so editing it in
+    # place fails instead of changing every project that uses it
+    if platform.system() == "Linux":
+        import fcntl
+        try:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), 0x40049409, src.fileno())  # FICLONE
+            shutil.copystat(source, destination)
+            _make_writable(destination)
+            return "linked"
+        except OSError:
+            if os.path.exists(destination):
+                os.remove(destination)
+    # Read-only files cannot be deleted on Windows, so projects there get copies
+    if platform.system() != "Windows":
+        try:
+            os.link(source, destination)
+            return "linked"
+        except OSError:
+            pass
+    shutil.copy2(source, destination)
+    _make_writable(destination)
+    return "copied"
+
+def ingest_node_modules(extension_dir, tree_key):
+    """Move a freshly installed node_modules tree into the store and hardlink the project back to it."""
+    objects_dir = os.path.join(NODE_STORE_DIR, "objects")
+    os.makedirs(objects_dir, exist_ok=True)
+    tree = {}
+    new_bytes = shared_bytes = 0
+    for relpath in _iter_node_tree_files(extension_dir):
+        path = os.path.join(extension_dir, relpath)
+        if os.path.islink(path):
+            tree[relpath] = {"symlink": os.readlink(path)}
+            continue
+        if os.path.isdir(path):
+            tree[relpath] = {"dir": True}
+            continue
+        executable = bool(os.stat(path).st_mode & 0o111)
+        sha256 = _sha256_of_file(path)
+        object_path = os.path.join(objects_dir, sha256[:2], sha256 + (".x" if executable else ""))
+        size = os.path.getsize(path)
+        if os.path.exists(object_path):
+            shared_bytes += size
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            staging = f"{object_path}.{os.getpid()}.tmp"
+            if relpath in _NODE_TREE_EXTRA_FILES:
+                shutil.copy2(path, staging)
+            else:
+                _link_or_copy(path, staging)
+            # Objects are shared by every project linked to them; read-only keeps an in-place edit in one
+            # project from silently changing the others
+            os.chmod(staging, 0o555 if executable else 0o444)
+            os.replace(staging, object_path)
+            new_bytes += size
+        # Point the project at the stored object so it shares storage with future projects;
+        # lock files stay private copies because npm rewrites them in place
+        if relpath not in _NODE_TREE_EXTRA_FILES and not os.path.samefile(path, object_path):
+            staging = f"{path}.{os.getpid()}.tmp"
+            if _link_or_copy(object_path, staging) == "linked":
+                os.replace(staging, path)
+            else:
+                os.remove(staging)
+        tree[relpath] = {"object": os.path.relpath(object_path, objects_dir).replace(os.sep, "/")}
+    trees_dir = os.path.join(NODE_STORE_DIR, "trees")
+    os.makedirs(trees_dir, exist_ok=True)
+    tree_path = os.path.join(trees_dir, tree_key + ".json")
+    with open(f"{tree_path}.{os.getpid()}.tmp", "w") as file:
+        json.dump(tree, file)
+    os.replace(f"{tree_path}.{os.getpid()}.tmp", tree_path)
+    print(f"Stored {len(tree)} dependency files in {NODE_STORE_DIR}: "
+          f"{new_bytes / 1024 ** 2:.1f} MB new, {shared_bytes / 1024 ** 2:.1f} MB already shared")
+
+def materialize_node_modules(extension_dir, tree_key):
+    """Populate a project's node_modules from the content-addressed store instead of running npm install."""
+    started = time.perf_counter()
+    objects_dir = os.path.join(NODE_STORE_DIR, "objects")
+    with open(os.path.join(NODE_STORE_DIR, "trees", tree_key + ".json")) as file:
+        tree = json.load(file)
+    counts = {"linked": 0, "copied": 0}
+    saved_bytes = 0
+    for relpath, entry in tree.items():
+        path = os.path.join(extension_dir, relpath)
+        if "dir" in entry:
+            os.makedirs(path, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.lexists(path):
+            os.remove(path)
+        if "symlink" in entry:
+            os.symlink(entry["symlink"], path)
+            continue
+        object_path = os.path.join(objects_dir, entry["object"])
+        if relpath in _NODE_TREE_EXTRA_FILES:
+            shutil.copy2(object_path, path)
+            _make_writable(path)
+            continue
+        method = _link_or_copy(object_path, path)
+        counts[method] += 1
+        if method == "linked":
+            saved_bytes += os.path.getsize(object_path)
+    print(f"Materialized {len(tree)} dependency files from the shared store in {time.perf_counter() - started:.2f}s "
+          f"({counts['linked']} linked, {counts['copied']} copied, {saved_bytes / 1024 ** 2:.1f} MB of disk saved)")
+
+def create_extension_project(extension_name, extension_description, base_dir=None, generator=None, project_dir=None, bundle=False,
+                             server_template="sample"):
+    """Generate a new VSCode extension project and return its directory."""
     print(f"Creating VSCode extension project '{extension_name}'...")
+    project_dir = os.path.abspath(project_dir or os.path.join(base_dir or os.getcwd(), extension_name))
     try:
-        os.makedirs(extension_name, exist_ok=True)
-        os.chdir(extension_name)
+        os.makedirs(project_dir, exist_ok=True)
     except Exception as e:
-        print(f"Error creating or changing to directory: {e}")
+        print(f"Error creating directory: {e}")
         return
 
     extension_name, identifier = generate_extension_name_and_identifier(extension_name)
     
     print(f"Generated extension name: {extension_name}")
     print(f"Generated extension identifier: {identifier}")
-    
+
+    generator = generator or EXTENSION_GENERATOR
+    if generator == "native":
+        created = render_extension_project(project_dir, extension_name, identifier, extension_description, bundle=bundle,
+                                           server_template=server_template)
+    elif generator == "yeoman":
+        created = run_yeoman_generator(project_dir, extension_name, identifier, extension_description)
+        if created and (bundle or server_template != "sample"):
+            created = overlay_generated_extension(os.path.join(project_dir, identifier), bundle, server_template)
+    else:
+        print(f"Unknown extension generator: {generator}")
+        return
+    if not created:
+        return
+
+    print("Project creation completed.")
+    return project_dir
+
+@traced("generate")
+def render_extension_project(project_dir, extension_name, identifier, extension_description, install_dependencies=True, bundle=False,
+                             server_template="sample"):
+    """Write the language-server template directly, producing the same tree as Yeoman."""
+    extension_dir = os.path.join(project_dir, identifier)
+    print(f"Rendering language-server template {LANGUAGE_SERVER_TEMPLATE_VERSION} into {extension_dir}")
+    try:
+        files = apply_server_template(render_language_server_template(extension_name, identifier, extension_description),
+                                      server_template)
+        if bundle:
+            files = apply_bundle_overlay(files)
+        written = [relpath for relpath, content in files.items() if write_project_file(extension_dir, relpath, content)]
+    except OSError as e:
+        print(f"Error writing extension template: {e}")
+        return False
+    dependencies_changed = any(relpath.endswith("package.json") for relpath in written)
+    if install_dependencies and (dependencies_changed or not os.path.isdir(os.path.join(extension_dir, "node_modules"))):
+        install_extension_dependencies(extension_dir)
+    print("VSCode extension project created successfully.")
+    return True
+
+def overlay_generated_extension(extension_dir, bundle=False, server_template="sample"):
+    """Apply the server template and bundle overlays to an extension Yeoman generated and reinstall its dependencies."""
+    files = {}
+    for relpath in ("package.json", "client/src/extension.ts", ".vscode/launch.json", ".gitignore"):
+        with open(os.path.join(extension_dir, relpath), encoding="utf-8") as file:
+            files[relpath] = file.read()
+    try:
+        files = apply_server_template(files, server_template)
+        if bundle:
+            files = apply_bundle_overlay(files)
+        # Yeoman has just rewritten these files, so the overlay replaces them outright instead of going
+        # through the tracked step's conflict check; create_project records the finished tree afterwards
+        step, _generation_local.step = getattr(_generation_local, "step", None), None
+        try:
+            for relpath, content in files.items():
+                write_project_file(extension_dir, relpath, content)
+        finally:
+            _generation_local.step = step
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error adding the {server_template} server or bundler configuration: {e}")
+        return False
+    install_extension_dependencies(extension_dir)
+    return True
+
+@traced("generate")
+def run_yeoman_generator(project_dir, extension_name, identifier, extension_description, extra_args=""):
+    """Generate the extension with Yeoman and generator-code."""
     # Use Node.js to run Yeoman
-    node_path = shutil.which("node")
+    node_path = find_tool("node")
     if node_path is None:
         print("Error: Node.js not found. Please ensure Node.js is installed and in your PATH.")
-        return
+        return False
 
-    yo_path = os.path.join(os.path.expanduser("~"), "AppData", "Roaming", "npm", "node_modules", "yo", "lib", "cli.js")
+    yo_path = os.path.join(npm_global_modules_dir() or "", "yo", "lib", "cli.js")
     if not os.path.exists(yo_path):
         print(f"Error: Yeoman CLI not found at expected path: {yo_path}")
         print("Please ensure Yeoman is installed globally using 'npm install -g yo generator-code'")
-        return
+        return False
 
     # Construct the command with correct flags, including the description
-    command = f'"{node_path}" "{yo_path}" code --type=ext-language-server --extensionName="{extension_name}" --extensionDisplayName="{extension_name}" --extensionDescription="{extension_description}" --extensionIdentifier="{identifier}" --gitInit=false --pkgManager=npm'
+    command = f'"{node_path}" "{yo_path}" code --type=ext-language-server --extensionName="{extension_name}" --extensionDisplayName="{extension_name}" --extensionDescription="{extension_description}" --extensionIdentifier="{identifier}" --gitInit=false --pkgManager=npm{extra_args}'
     
     print(f"Executing command: {command}")
 
     try:
-        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="ignore")
-        
-        output = []
-        while True:
-            line = process.stdout.readline()
-            if not line and process.poll() is not None:
-                break
-            if line:
-                print(line.strip())
-                output.append(line.strip())
-
-        if process.returncode != 0:
-            print(f"Yeoman process exited with non-zero status: {process.returncode}")
+        result = execute_command(command, cwd=project_dir, stream_output=True)
+        if result["returncode"] != 0:
+            print(f"Yeoman process exited with non-zero status: {result['returncode']}")
             print("Last few lines of output:")
-            print("\n".join(output[-10:]))  # Print the last 10 lines of output
-            return
+            print("\n".join(result["tail"].splitlines()[-10:]))  # Print the last 10 lines of output
+            return False
 
         print("VSCode extension project created successfully.")
     except Exception as e:
         print(f"Error during extension project creation: {e}")
-        return
+        return False
+    return True
 
-    print("Project creation completed.")
+def check_template_parity():
+    """Render the built-in template and the Yeoman output for the same inputs and diff them."""
+    extension_name, identifier = generate_extension_name_and_identifier("Parity Check")
+    description = "Template parity check"
+    with tempfile.TemporaryDirectory() as native_dir, tempfile.TemporaryDirectory() as yeoman_dir:
+        render_extension_project(native_dir, extension_name, identifier, description, install_dependencies=False)
+        if not run_yeoman_generator(yeoman_dir, extension_name, identifier, description, " --skip-install"):
+            print("Could not run Yeoman; parity not checked.")
+            return False
+        native_files = _list_project_files(os.path.join(native_dir, identifier))
+        yeoman_files = _list_project_files(os.path.join(yeoman_dir, identifier))
+        differences = 0
+        for relpath in sorted(set(native_files) | set(yeoman_files)):
+            if relpath not in yeoman_files:
+                print(f"Only in built-in template: {relpath}")
+            elif relpath not in native_files:
+                print(f"Only in Yeoman output: {relpath}")
+            else:
+                with open(native_files[relpath], encoding="utf-8", errors="replace") as file:
+                    native = file.read().splitlines(keepends=True)
+                with open(yeoman_files[relpath], encoding="utf-8", errors="replace") as file:
+                    yeoman = file.read().splitlines(keepends=True)
+                if native == yeoman:
+                    continue
+                sys.stdout.writelines(difflib.unified_diff(yeoman, native, f"yeoman/{relpath}", f"native/{relpath}"))
+            differences += 1
+    if differences:
+        print(f"Template {LANGUAGE_SERVER_TEMPLATE_VERSION} differs from Yeoman output in {differences} files.")
+        return False
+    print(f"Template {LANGUAGE_SERVER_TEMPLATE_VERSION} matches Yeoman output.")
+    return True
 
-def setup_environment_for_language(language):
-    """Set up the environment based on the language chosen and select a framework."""
-    if language not in LANGUAGE_FRAMEWORKS:
-        print("Unsupported language.")
-        sys.exit(1)
-    
+def _list_project_files(root):
+    """Map relative paths to absolute paths for the files of a generated project, skipping node_modules."""
+    files = {}
+    for directory, subdirs, filenames in os.walk(root):
+        subdirs[:] = [subdir for subdir in subdirs if subdir not in ("node_modules", ".git")]
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            files[os.path.relpath(path, root).replace(os.sep, "/")] = path
+    return files
+
+# The generation step whose writes write_project_file is currently tracking, per thread
+_generation_local = threading.local()
+
+def _text_digest(data):
+    """Hash file content with line endings normalized, so text-mode writes on Windows compare equal."""
+    return hashlib.sha256(data.replace(b"\r\n", b"\n")).hexdigest()
+
+def _file_digest(path):
+    """Hash a file on disk the same way as generated content."""
+    with open(path, "rb") as file:
+        return _text_digest(file.read())
+
+def load_project_state(project_dir):
+    """Load a project's generation state, or an empty state if it was never generated."""
+    try:
+        with open(os.path.join(project_dir, PROJECT_STATE_FILE)) as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return {"steps": {}}
+    state.setdefault("steps", {})
+    return state
+
+def save_project_state(project_dir, state):
+    """Atomically write a project's generation state."""
+    path = os.path.join(project_dir, PROJECT_STATE_FILE)
+    with open(path + ".tmp", "w") as file:
+        json.dump(state, file, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def _step_up_to_date(project_dir, previous, inputs):
+    """A step is up to date when its inputs are unchanged and every file it generated still exists."""
+    return (previous is not None and previous.get("inputs") == inputs
+            and all(os.path.exists(os.path.join(project_dir, relpath)) for relpath in previous.get("files", {})))
+
+def _edited_files(project_dir, files):
+    """Return the recorded files whose content on disk no longer matches their recorded hash."""
+    return [relpath for relpath, digest in files.items()
+            if os.path.exists(os.path.join(project_dir, relpath)) and _file_digest(os.path.join(project_dir, relpath)) != digest]
+
+@contextlib.contextmanager
+def generation_step(project_dir, previous, force=False):
+    """Track the files write_project_file writes for one generation step of a project."""
+    step = {"root": project_dir, "previous": (previous or {}).get("files", {}), "force": force,
+            "files": {}, "written": [], "unchanged": [], "conflicts": []}
+    _generation_local.step = step
+    try:
+        yield step
+    finally:
+        _generation_local.step = None
+    # Remove files an earlier run generated that this run no longer produces, unless the user edited them
+    for relpath, digest in step["previous"].items():
+        path = os.path.join(project_dir, relpath)
+        if relpath not in step["files"] and os.path.exists(path):
+            if force or _file_digest(path) == digest:
+                os.remove(path)
+                parent = os.path.dirname(path)
+                while parent != project_dir and not os.listdir(parent):
+                    os.rmdir(parent)
+                    parent = os.path.dirname(parent)
+            else:
+                step["conflicts"].append(relpath)
+                step["files"][relpath] = digest
+
+def record_project_tree(step, directory):
+    """Record the hashes of files an external generator wrote under directory, outside node_modules."""
+    for root, dirs, filenames in os.walk(directory):
+        dirs[:] = [name for name in dirs if name not in ("node_modules", ".git")]
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            step["files"][os.path.relpath(path, step["root"]).replace(os.sep, "/")] = _file_digest(path)
+
+def final_project_path(path):
+    """Return where a path inside a project's staging directory ends up once the project is renamed into place."""
+    return os.sep.join(re.sub(r"^\.(.+)\.staging$", r"\1", part) for part in path.split(os.sep))
+
+def create_project(extension_name, extension_description, language, framework, base_dir=None, generator=None, force=False,
+                   bundle=False, server_template="sample", profile="dev"):
+    """Create or incrementally update an extension project and its server code without changing the working directory."""
+    generator = generator or EXTENSION_GENERATOR
+    project_dir = os.path.abspath(os.path.join(base_dir or os.getcwd(), extension_name))
+    identifier = generate_extension_name_and_identifier(extension_name)[1]
+    # A new project is generated next to its destination and renamed into place only once complete,
+    # so a failed run never leaves a half-written project behind; a rerun continues the staging tree.
+    staging_dir = None
+    if not os.path.exists(project_dir):
+        staging_dir = os.path.join(os.path.dirname(project_dir), f".{os.path.basename(project_dir)}.staging")
+    work_dir = staging_dir or project_dir
+    journal = current_run_journal()
+    with span(f"create {extension_name}", "create", language=language, framework=framework):
+        state = load_project_state(work_dir)
+        steps = {
+            "registry": {"proxy": REGISTRY_PROXY_URL, "language": language},
+            "extension": {"name": extension_name, "description": extension_description, "generator": generator,
+                          "template_version": LANGUAGE_SERVER_TEMPLATE_VERSION, "bundle": bundle,
+                          "server_template": server_template},
+            "server": {"language": language, "framework": framework, "profile": profile},
+        }
+        if profile == "production":
+            # Production scaffolds are sized to the host, so moving to a different machine regenerates them
+            steps["server"]["cores"] = os.cpu_count()
+        conflicts = []
+        if not REGISTRY_PROXY_URL:
+            del steps["registry"]
+        for name, inputs in steps.items():
+            previous = state["steps"].get(name)
+            if not force and _step_up_to_date(work_dir, previous, inputs):
+                print(f"The {name} step of '{extension_name}' is up to date.")
+                record_journal_step(journal, f"generate {name}", "ok")
+                continue
+            with generation_step(work_dir, previous, force) as step:
+                if name == "server":
+                    os.makedirs(work_dir, exist_ok=True)
+                    create_server_code(language, framework, work_dir, profile)
+                elif name == "registry":
+                    write_registry_config(work_dir, language, identifier, REGISTRY_PROXY_URL)
+                elif generator == "yeoman" and not force and _edited_files(work_dir, step["previous"]):
+                    # Yeoman rewrites its whole tree, so leave it alone while it holds user edits
+                    step["conflicts"] = _edited_files(work_dir, step["previous"])
+                    step["files"] = dict(step["previous"])
+                else:
+                    try:
+                        created = create_extension_project(extension_name, extension_description, base_dir, generator, work_dir,
+                                                           bundle, server_template)
+                    except Exception as e:
+                        record_journal_step(journal, f"generate {name}", "failed", str(e))
+                        raise
+                    if created is None:
+                        record_journal_step(journal, f"generate {name}", "failed")
+                        raise RuntimeError(f"Could not create extension project '{extension_name}'")
+                    if generator == "yeoman":
+                        record_project_tree(step, os.path.join(work_dir, identifier))
+            # A step that kept user edits is re-checked next time instead of being marked up to date
+            state["steps"][name] = {"inputs": None if step["conflicts"] else inputs, "files": step["files"]}
+            # Saved after every step so a rerun after a failure skips the steps that finished
+            save_project_state(work_dir, state)
+            record_journal_step(journal, f"generate {name}", "ok")
+            conflicts += step["conflicts"]
+            print(f"The {name} step of '{extension_name}' wrote {len(step['written'])} files "
+                  f"({len(step['unchanged'])} unchanged, {len(step['conflicts'])} kept).")
+        if staging_dir:
+            os.rename(staging_dir, project_dir)
+            record_journal_step(journal, "finalize", "ok")
+        if conflicts:
+            print("Kept files edited since they were generated (re-run create with --force to overwrite them):")
+            for relpath in conflicts:
+                print(f"  {relpath}")
+    return project_dir
+
+def load_structured_file(path):
+    """Parse a JSON file, or a YAML file if its name ends in .yaml or .yml."""
+    with open(path) as file:
+        if path.endswith((".yaml", ".yml")):
+            # Imported here so PyYAML's import cost stays off the interactive startup path
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError(f"PyYAML is required to read {path}. Install it with 'pip install pyyaml'.")
+            return yaml.safe_load(file)
+        return json.load(file)
+
+def load_manifest(path):
+    """Load and validate a JSON or YAML manifest describing extensions to generate."""
+    manifest = load_structured_file(path)
+    entries = manifest.get("extensions", []) if isinstance(manifest, dict) else manifest
+    names = set()
+    for i, entry in enumerate(entries, 1):
+        for key in ("name", "language", "framework"):
+            if not entry.get(key):
+                raise ValueError(f"Manifest entry {i} is missing '{key}'")
+        if entry["language"] not in LANGUAGE_FRAMEWORKS:
+            raise ValueError(f"Manifest entry {i}: unsupported language '{entry['language']}'")
+        if entry["framework"] not in LANGUAGE_FRAMEWORKS[entry["language"]]:
+            raise ValueError(f"Manifest entry {i}: unsupported framework '{entry['framework']}' for {entry['language']}")
+        if entry["name"] in names:
+            raise ValueError(f"Manifest entry {i}: duplicate extension name '{entry['name']}'")
+        names.add(entry["name"])
+        generator = entry.get("generator", EXTENSION_GENERATOR)
+        if generator not in EXTENSION_SCAFFOLD_STEPS:
+            raise ValueError(f"Manifest entry {i}: unknown generator '{generator}'")
+        if entry.get("server_template", "sample") not in SERVER_TEMPLATES:
+            raise ValueError(f"Manifest entry {i}: unknown server template '{entry['server_template']}'")
+        if entry.get("profile", "dev") not in SERVER_PROFILES:
+            raise ValueError(f"Manifest entry {i}: unknown profile '{entry['profile']}'")
+        entry.setdefault("description", "")
+    return entries
+
+def _create_manifest_entry(entry, base_dir, trace=False):
+    """Create one manifest entry in a worker process and report its outcome."""
+    if trace:
+        enable_tracing()
+        _trace["events"].clear()
+    started = time.perf_counter()
+    try:
+        project_dir = create_project(entry["name"], entry["description"], entry["language"], entry["framework"],
+                                     base_dir, entry.get("generator"), entry.get("force", False), entry.get("bundle", False),
+                                     entry.get("server_template", "sample"), entry.get("profile", "dev"))
+        status, error = "ok", None
+    except SystemExit as e:
+        project_dir, status, error = None, "failed", f"exited with status {e.code}"
+    except Exception as e:
+        project_dir, status, error = None, "failed", str(e)
+    return {"name": entry["name"], "status": status, "error": error,
+            "project_dir": project_dir, "elapsed": time.perf_counter() - started,
+            "trace_events": _trace["events"] if trace else []}
+
+def run_manifest(path, workers=None, base_dir=None):
+    """Generate every extension described by a manifest on a process pool. Returns the number of failures."""
+    entries = load_manifest(path)
+    base_dir = os.path.abspath(base_dir or os.getcwd())
+    print(f"Generating {len(entries)} extensions from {path} into {base_dir}")
+    started = time.perf_counter()
+
+    # Provision the union of every entry's toolchains once, before any project is generated
+    steps = []
+    for entry in entries:
+        for step in provision_steps_for_languages([entry["language"]], entry.get("generator")):
+            if step not in steps:
+                steps.append(step)
+    provision_or_raise(steps)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_create_manifest_entry, entry, base_dir, _trace["enabled"]) for entry in entries]
+        for future in as_completed(futures):
+            result = future.result()
+            # Spans recorded in worker processes are merged into this process's trace
+            with _trace_lock:
+                _trace["events"].extend(result.pop("trace_events"))
+            results.append(result)
+
+    elapsed = time.perf_counter() - started
+    failures = [result for result in results if result["status"] != "ok"]
+    print("\nManifest summary:")
+    for result in sorted(results, key=lambda result: result["name"]):
+        line = f"  {result['name']}: {result['status']} in {result['elapsed']:.2f}s"
+        if result["error"]:
+            line += f" - {result['error']}"
+        print(line)
+    print(f"{len(results) - len(failures)} created, {len(failures)} failed in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.2f} extensions/s)")
+    return len(failures)
+
+def select_framework(language):
+    """Prompt the user to pick one of the frameworks available for a language."""
     print(f"\nAvailable frameworks for {language}:")
     for i, framework in enumerate(LANGUAGE_FRAMEWORKS[language], 1):
         print(f"{i}. {framework}")
     
     while True:
-        choice = input("\nSelect a framework (enter the number): ")
+        with completion_choices(LANGUAGE_FRAMEWORKS[language]):
+            choice = input("\nSelect a framework (enter the number or name): ")
+        named = [framework for framework in LANGUAGE_FRAMEWORKS[language] if framework.lower() == choice.strip().lower()]
+        if named:
+            framework = named[0]
+            break
         try:
             index = int(choice) - 1
             if 0 <= index < len(LANGUAGE_FRAMEWORKS[language]):
@@ -260,22 +2306,6 @@ def setup_environment_for_language(language):
             print("Please enter a valid number.")
     
     print(f"\nSelected framework: {framework}")
-    
-    if language == "python":
-        setup_python_environment(framework)
-    elif language in ["javascript", "typescript"]:
-        setup_js_environment(language, framework)
-    elif language == "c#":
-        check_and_install_dotnet()
-    elif language == "java":
-        install_maven()
-    elif language == "ruby":
-        install_ruby()
-    elif language == "php":
-        install_php()
-    elif language == "go":
-        install_go()
-    
     return framework
 
 def setup_python_environment():
@@ -283,33 +2313,503 @@ def setup_python_environment():
     print("Setting up Python environment...")
     # You can add Python-specific setup code here if needed
 
-def setup_js_environment(language):
-    """Set up the JavaScript/TypeScript environment."""
-    print(f"Setting up {language} environment...")
-    install_node()
-    install_yeoman_and_generator()
+# Project names the serve daemon accepts: no path separators or dot segments
+SERVE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9 _-]{0,99}$")
+# Where the serve daemon writes its per-process bearer token (mode 0600); HTTP clients must send it
+SERVE_TOKEN_FILE = os.path.join(CACHE_DIR, "serve.token")
+
+# State of the serve daemon: request counters, recent latencies and steps already provisioned
+_serve_state = {"started": time.time(), "received": 0, "completed": 0, "failed": 0,
+                "queued": 0, "running": 0, "latencies": collections.deque(maxlen=1000)}
+_serve_lock = threading.Lock()
+_provisioned_steps = set()
+_provision_lock = threading.Lock()
+
+def provision_once(step_names):
+    """Provision steps not yet provisioned by this process, serializing concurrent callers."""
+    with _provision_lock:
+        missing = [step for step in resolve_provision_plan(step_names) if step not in _provisioned_steps]
+        if missing:
+            provision_or_raise(missing)
+            _provisioned_steps.update(missing)
+
+def serve_create(request, default_base_dir):
+    """Validate and run one create request from the serve daemon."""
+    for key in ("name", "language", "framework"):
+        if not request.get(key):
+            raise ValueError(f"missing '{key}'")
+    if not isinstance(request["name"], str) or not SERVE_NAME_PATTERN.match(request["name"]):
+        raise ValueError("'name' must be letters, digits, spaces, '_' or '-' and start with a letter or digit")
+    for key in ("force", "bundle"):
+        if not isinstance(request.get(key, False), bool):
+            raise ValueError(f"'{key}' must be a boolean")
+    output_dir = request.get("output_dir") or default_base_dir
+    if not isinstance(output_dir, str):
+        raise ValueError("'output_dir' must be a string")
+    # Relative directories are under the daemon's base directory; nothing may escape it, symlinks included
+    base = os.path.realpath(default_base_dir)
+    output_dir = os.path.realpath(os.path.join(base, output_dir))
+    if os.path.commonpath([base, output_dir]) != base:
+        raise ValueError(f"'output_dir' must be inside {default_base_dir}")
+    language, framework = request["language"], request["framework"]
+    if language not in LANGUAGE_FRAMEWORKS or framework not in LANGUAGE_FRAMEWORKS[language]:
+        raise ValueError(f"unsupported language/framework '{language}/{framework}'")
+    generator = request.get("generator")
+    if generator is not None and generator not in EXTENSION_SCAFFOLD_STEPS:
+        raise ValueError(f"unknown generator '{generator}'")
+    server_template = request.get("server_template", "sample")
+    if server_template not in SERVER_TEMPLATES:
+        raise ValueError(f"unknown server template '{server_template}'")
+    profile = request.get("profile", "dev")
+    if profile not in SERVER_PROFILES:
+        raise ValueError(f"unknown profile '{profile}'")
+    provision_once(provision_steps_for_languages([language], generator))
+    return create_project(request["name"], request.get("description", ""), language, framework,
+                          output_dir, generator, request.get("force", False),
+                          request.get("bundle", False), server_template, profile)
+
+def serve_stats():
+    """Return queue depth, throughput counters and latency percentiles of the serve daemon."""
+    with _serve_lock:
+        latencies = sorted(_serve_state["latencies"])
+        stats = {key: value for key, value in _serve_state.items() if key != "latencies"}
+    stats["uptime_s"] = round(time.time() - stats.pop("started"), 1)
+    stats["queue_depth"] = stats.pop("queued")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        stats[f"latency_{label}_s"] = round(_percentile(latencies, fraction), 3) if latencies else None
+    return stats
+
+def dispatch_serve_request(request, pool, default_base_dir):
+    """Handle a decoded JSON request and return the JSON-serializable response."""
+    action = request.get("action", "create")
+    if action == "stats":
+        return {"status": "ok", "stats": serve_stats()}
+    if action != "create":
+        return {"status": "error", "error": f"unknown action '{action}'"}
+
+    def job():
+        with _serve_lock:
+            _serve_state["queued"] -= 1
+            _serve_state["running"] += 1
+        started = time.perf_counter()
+        try:
+            return {"status": "ok", "project_dir": serve_create(request, default_base_dir)}
+        except SystemExit as e:
+            return {"status": "error", "error": f"exited with status {e.code}"}
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+        finally:
+            elapsed = time.perf_counter() - started
+            with _serve_lock:
+                _serve_state["running"] -= 1
+                _serve_state["latencies"].append(elapsed)
+
+    with _serve_lock:
+        _serve_state["received"] += 1
+        _serve_state["queued"] += 1
+    queued = time.perf_counter()
+    response = pool.submit(job).result()
+    with _serve_lock:
+        _serve_state["completed" if response["status"] == "ok" else "failed"] += 1
+    response["elapsed_s"] = round(time.perf_counter() - queued, 3)
+    return response
+
+def write_serve_token():
+    """Create a fresh bearer token for this daemon and store it where only the current user can read it."""
+    token = secrets.token_urlsafe(32)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if os.path.exists(SERVE_TOKEN_FILE):
+        os.remove(SERVE_TOKEN_FILE)
+    fd = os.open(SERVE_TOKEN_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    with os.fdopen(fd, "w") as file:
+        file.write(token)
+    return token
+
+def serve(port=None, socket_path=None, workers=PROVISION_MAX_WORKERS, base_dir=None):
+    """Serve JSON create requests over localhost HTTP or a Unix socket from one warm process."""
+    base_dir = os.path.abspath(base_dir or os.getcwd())
+    # Warm the caches every request relies on before accepting connections
+    get_toolchain_inventory()
+    render_language_server_template("warmup", "warmup", "")
+    pool = ThreadPoolExecutor(max_workers=workers)
 
-def create_server_code(language, framework):
-    """Create server code based on the specified language and framework."""
-    if language == "python":
-        create_python_server_code(framework)
+    if socket_path:
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                    except ValueError as e:
+                        response = {"status": "error", "error": f"invalid JSON: {e}"}
+                    else:
+                        if isinstance(request, dict):
+                            response = dispatch_serve_request(request, pool, base_dir)
+                        else:
+                            response = {"status": "error", "error": "request must be a JSON object"}
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+                    self.wfile.flush()
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        # Bind under a restrictive umask so no other user can connect before the chmod
+        previous_umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+        finally:
+            os.umask(previous_umask)
+        os.chmod(socket_path, 0o600)
+        address = socket_path
+    else:
+        token = write_serve_token()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def _respond(self, code, body):
+                payload = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _authorized(self):
+                # A per-daemon token keeps other local users and cross-site browser requests out
+                header = self.headers.get("Authorization", "")
+                if header.startswith("Bearer ") and secrets.compare_digest(header[len("Bearer "):], token):
+                    return True
+                self._respond(401, {"status": "error", "error": f"missing or wrong bearer token (see {SERVE_TOKEN_FILE})"})
+                return False
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if self.path == "/stats":
+                    self._respond(200, {"status": "ok", "stats": serve_stats()})
+                else:
+                    self._respond(404, {"status": "error", "error": "not found"})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                if self.path != "/create":
+                    self._respond(404, {"status": "error", "error": "not found"})
+                    return
+                content_type = self.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+                if content_type != "application/json":
+                    self._respond(415, {"status": "error", "error": "Content-Type must be application/json"})
+                    return
+                try:
+                    request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                except ValueError as e:
+                    self._respond(400, {"status": "error", "error": f"invalid JSON: {e}"})
+                    return
+                if not isinstance(request, dict):
+                    self._respond(400, {"status": "error", "error": "request body must be a JSON object"})
+                    return
+                request["action"] = "create"
+                response = dispatch_serve_request(request, pool, base_dir)
+                self._respond(200 if response["status"] == "ok" else 422, response)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        address = f"http://127.0.0.1:{server.server_address[1]}"
+        print(f"Bearer token for this daemon is in {SERVE_TOKEN_FILE}")
+
+    print(f"Serving create requests on {address} with {workers} workers (projects in {base_dir}). Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        pool.shutdown(wait=True)
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+        if not socket_path and os.path.exists(SERVE_TOKEN_FILE):
+            os.remove(SERVE_TOKEN_FILE)
+
+# Counters of the registry proxy, and one lock per upstream URL so concurrent misses fetch it once
+_registry_stats = {"hits": 0, "misses": 0, "stale": 0, "errors": 0}
+_registry_lock = threading.Lock()
+_registry_url_locks = {}
+
+def _registry_is_metadata(ecosystem, path):
+    """Whether a registry path names mutable metadata rather than an immutable artifact."""
+    path = path.split("?", 1)[0]
+    if ecosystem == "npm":
+        return "/-/" not in path
+    if ecosystem == "maven2":
+        return "maven-metadata.xml" in path
+    if ecosystem == "go":
+        return path.endswith(("/@v/list", "/@latest")) or (path.startswith("sumdb/") and "/tile/" not in path)
+    return ecosystem == "pypi"
+
+def fetch_registry_object(url, metadata):
+    """Return (cached body path, content type, cache outcome) for an upstream URL, fetching it only when needed."""
+    key = hashlib.sha256(url.encode()).hexdigest()
+    body_path = os.path.join(REGISTRY_CACHE_DIR, key[:2], key)
+    info_path = body_path + ".json"
+    with _registry_lock:
+        url_lock = _registry_url_locks.setdefault(url, threading.Lock())
+    with url_lock:
+        try:
+            with open(info_path) as file:
+                info = json.load(file)
+        except (OSError, ValueError):
+            info = None
+        cached = info is not None and os.path.exists(body_path)
+        if cached and (not metadata or time.time() - info["fetched"] < REGISTRY_METADATA_TTL):
+            return body_path, info["content_type"], "hit"
+
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        fd, partial_path = tempfile.mkstemp(dir=os.path.dirname(body_path), suffix=".partial")
+        try:
+            # PyPI serves JSON or HTML simple pages by Accept header; always cache the HTML form
+            request = urllib.request.Request(url, headers={"Accept": "text/html" if "/simple/" in url else "*/*",
+                                                           "User-Agent": "vscode-extension-creator"})
+            with os.fdopen(fd, "wb") as file, urllib.request.urlopen(request, timeout=60) as response:
+                shutil.copyfileobj(response, file, 1024 * 1024)
+                content_type = response.headers.get("Content-Type", "application/octet-stream")
+            os.replace(partial_path, body_path)
+        except (urllib.error.URLError, OSError) as e:
+            # Serve stale metadata when the upstream is unreachable, so warmed-up builds work offline
+            if getattr(e, "code", None) in (404, 410) or not cached:
+                raise
+            return body_path, info["content_type"], "stale"
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        with open(info_path + ".tmp", "w") as file:
+            json.dump({"url": url, "content_type": content_type, "fetched": time.time()}, file)
+        os.replace(info_path + ".tmp", info_path)
+        return body_path, content_type, "miss"
+
+def make_registry_proxy(port=4873, upstreams=None):
+    """Return an unstarted HTTP server proxying npm, Maven, Go module proxy and PyPI requests through the cache."""
+    upstreams = {name: url.rstrip("/") for name, url in dict(REGISTRY_UPSTREAMS, **(upstreams or {})).items()}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def _respond(self, code, body, content_type="application/json", outcome=None):
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            if outcome:
+                self.send_header("X-Cache", outcome)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/-/stats":
+                with _registry_lock:
+                    self._respond(200, json.dumps(dict(_registry_stats, upstreams=upstreams)).encode())
+                return
+            ecosystem, _, rest = self.path.lstrip("/").partition("/")
+            if ecosystem not in upstreams:
+                self._respond(404, b'{"error": "unknown registry"}')
+                return
+            metadata = _registry_is_metadata(ecosystem, rest)
+            try:
+                body_path, content_type, outcome = fetch_registry_object(f"{upstreams[ecosystem]}/{rest}", metadata)
+            except urllib.error.HTTPError as e:
+                self._respond(e.code, json.dumps({"error": str(e)}).encode())
+                return
+            except (urllib.error.URLError, OSError) as e:
+                with _registry_lock:
+                    _registry_stats["errors"] += 1
+                self._respond(502, json.dumps({"error": f"upstream unavailable: {e}"}).encode())
+                return
+            with _registry_lock:
+                _registry_stats[{"hit": "hits", "miss": "misses", "stale": "stale"}[outcome]] += 1
+
+            if metadata and ecosystem in ("npm", "pypi"):
+                # Point tarball and wheel links at this proxy; the cache keeps upstream URLs so it is host-independent
+                proxy_base = f"http://{self.headers.get('Host', f'127.0.0.1:{port}')}"
+                source, target = ((upstreams["npm"], f"{proxy_base}/npm") if ecosystem == "npm"
+                                  else (upstreams["pypi-files"], f"{proxy_base}/pypi-files"))
+                with open(body_path, "rb") as file:
+                    body = file.read().replace(source.encode(), target.encode())
+                self._respond(200, body, content_type, outcome)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(os.path.getsize(body_path)))
+            self.send_header("X-Cache", outcome)
+            self.end_headers()
+            with open(body_path, "rb") as file:
+                shutil.copyfileobj(file, self.wfile, 1024 * 1024)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.upstreams = upstreams
+    return server
+
+def registry_proxy(port=4873, upstreams=None):
+    """Serve npm, Maven, Go module proxy and PyPI simple-index requests from an on-disk cache."""
+    server = make_registry_proxy(port, upstreams)
+    address = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"Registry proxy listening on {address} (cache in {REGISTRY_CACHE_DIR}). Press Ctrl+C to stop.")
+    for name, url in server.upstreams.items():
+        print(f"  {address}/{name}/ -> {url}/")
+    print(f"Set VSCODE_EXT_CREATOR_REGISTRY_PROXY={address} to configure generated projects to use it.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+
+def write_registry_config(project_dir, language, identifier, proxy_url):
+    """Configure a generated project's package managers to fetch through the registry proxy."""
+    proxy_url = proxy_url.rstrip("/")
+    npmrc = f"registry={proxy_url}/npm/\n"
+    write_project_file(project_dir, "registry-proxy.env", f"""# Load these variables to build through the local registry proxy at {proxy_url}
+NPM_CONFIG_REGISTRY={proxy_url}/npm/
+GOPROXY={proxy_url}/go
+PIP_INDEX_URL={proxy_url}/pypi/simple/
+""")
+    # The extension itself installs its dependencies from npm
+    write_project_file(os.path.join(project_dir, identifier), ".npmrc", npmrc)
+    if language in ("javascript", "typescript"):
+        write_project_file(project_dir, ".npmrc", npmrc)
+    elif language == "java":
+        write_project_file(project_dir, ".mvn/maven.config", "--settings .mvn/settings.xml\n")
+        write_project_file(project_dir, ".mvn/settings.xml", f"""<settings>
+  <mirrors>
+    <mirror>
+      <id>vscode-extension-creator-proxy</id>
+      <mirrorOf>*</mirrorOf>
+      <url>{proxy_url}/maven2</url>
+    </mirror>
+  </mirrors>
+</settings>
+""")
+
+# Server scaffold profiles: "dev" writes a single-file hello world, "production" a multi-file scaffold
+# with worker processes or thread pools sized to the host's cores, keep-alive, compression,
+# connection limits and a /healthz endpoint
+SERVER_PROFILES = ("dev", "production")
+
+# Production scaffolds live in templates/production/<framework>/, one directory per framework; JavaScript
+# and TypeScript share the Node.js ones, whose package.json holds only their dependencies. Their settings
+# are read from the environment when the server starts, except __CPU_COUNT__, __IO_THREADS__,
+# __BLOCKING_THREADS__ and __PHP_WORKERS__, which are filled in from the host's core count. Flask and Django
+# run Gunicorn gthread workers, which ignore worker_connections, so their threads carry MAX_CONNECTIONS;
+# FastAPI runs one async Uvicorn worker per core.
+def production_template(framework):
+    """Return the production scaffold template of a framework."""
+    return load_template("production/" + re.sub(r"[^a-z0-9]+", "-", framework.lower()).strip("-"))
+
+def _node_production_files(language, framework):
+    """Return a Node.js production scaffold as JavaScript (ES modules) or TypeScript files."""
+    template = production_template(framework)
+    sources = {relpath: content for relpath, content in template.items() if relpath != "package.json"}
+    packages = json.loads(template["package.json"])
+    # Nest.js relies on CommonJS decorators metadata; the others are ES modules
+    esm = framework != "Nest.js"
+    manifest = {"name": "server", "version": "1.0.0", "private": True, "engines": {"node": ">=18.14"},
+                "scripts": {"start": "node cluster.js"}, "dependencies": packages["dependencies"]}
+    if esm:
+        manifest["type"] = "module"
+    files = {}
+    if language == "typescript":
+        files = {relpath.rsplit(".", 1)[0] + ".ts": content for relpath, content in sources.items()}
+        manifest["scripts"] = {"build": "tsc", "start": "node dist/cluster.js"}
+        manifest["devDependencies"] = dict(packages["devDependencies"],
+                                           **{"@types/node": "^20.14.0", "typescript": "^5.5.4"})
+        compiler_options = {"target": "es2022", "module": "NodeNext", "moduleResolution": "NodeNext", "outDir": "dist",
+                            "strict": True, "esModuleInterop": True, "skipLibCheck": True}
+        if not esm:
+            compiler_options.update({"module": "commonjs", "moduleResolution": "node", "experimentalDecorators": True,
+                                     "emitDecoratorMetadata": True})
+        files["tsconfig.json"] = json.dumps({"compilerOptions": compiler_options, "include": ["*.ts"]}, indent=2) + "\n"
+    else:
+        files = sources
+    files["package.json"] = json.dumps(manifest, indent=2) + "\n"
+    return files
+
+def production_server_files(language, framework):
+    """Return the production scaffold of a framework as {relative path: content}, sized to this host's cores."""
+    if language in ("javascript", "typescript"):
+        files = _node_production_files(language, framework)
+    else:
+        files = dict(production_template(framework))
+    cores = os.cpu_count() or 1
+    values = {
+        "__CPU_COUNT__": str(cores),
+        "__IO_THREADS__": str(cores * 2),
+        "__BLOCKING_THREADS__": str(max(64, cores * 16)),
+        "__PHP_WORKERS__": str(cores * 4)
+    }
+    for relpath, content in files.items():
+        for placeholder, value in values.items():
+            content = content.replace(placeholder, value)
+        files[relpath] = content
+    return files
+
+def create_production_server_code(language, framework, project_dir="."):
+    """Write the multi-worker production scaffold of a framework."""
+    files = production_server_files(language, framework)
+    for relpath, content in files.items():
+        write_project_file(project_dir, relpath, content)
+    if "run.sh" in files:
+        os.chmod(os.path.join(project_dir, "run.sh"), 0o755)
+    print(f"Wrote the {framework} production scaffold ({len(files)} files) sized for a {os.cpu_count() or 1}-core host.")
+
+@traced("generate")
+def create_server_code(language, framework, project_dir=".", profile="dev"):
+    """Create server code based on the specified language, framework and profile."""
+    if profile == "production" and language in LANGUAGE_FRAMEWORKS:
+        create_production_server_code(language, framework, project_dir)
+    elif language == "python":
+        create_python_server_code(framework, project_dir)
     elif language in ["javascript", "typescript"]:
-        create_js_server_code(language, framework)
+        create_js_server_code(language, framework, project_dir)
     elif language == "c#":
-        create_csharp_server_code(framework)
+        create_csharp_server_code(framework, project_dir)
     elif language == "java":
-        create_java_server_code(framework)
+        create_java_server_code(framework, project_dir)
     elif language == "ruby":
-        create_ruby_server_code(framework)
+        create_ruby_server_code(framework, project_dir)
     elif language == "php":
-        create_php_server_code(framework)
+        create_php_server_code(framework, project_dir)
     elif language == "go":
-        create_go_server_code(framework)
+        create_go_server_code(framework, project_dir)
     else:
         print(f"Unsupported language: {language}")
         sys.exit(1)
 
-def create_python_server_code(framework):
+def write_project_file(project_dir, filename, content):
+    """Write a generated file into a project directory, creating parent directories as needed. Returns whether it was written."""
+    path = os.path.join(project_dir, filename)
+    step = getattr(_generation_local, "step", None)
+    if step is not None:
+        relpath = os.path.relpath(path, step["root"]).replace(os.sep, "/")
+        digest = _text_digest(content.encode("utf-8"))
+        step["files"][relpath] = digest
+        if os.path.exists(path):
+            current = _file_digest(path)
+            if current == digest:
+                step["unchanged"].append(relpath)
+                return False
+            # Only files whose content still matches what was last generated may be overwritten
+            if not step["force"] and step["previous"].get(relpath) != current:
+                step["conflicts"].append(relpath)
+                if relpath in step["previous"]:
+                    step["files"][relpath] = step["previous"][relpath]
+                else:
+                    del step["files"][relpath]
+                return False
+        step["written"].append(relpath)
+    with span(f"write {filename}", "file", bytes=len(content)):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+    return True
+
+def create_python_server_code(framework, project_dir="."):
     """Create a Python server code based on the selected framework."""
     if framework == "Flask":
         server_code = """
@@ -352,10 +2852,9 @@ async def root():
     else:
         server_code = f"# Add {framework}-specific code here"
 
-    with open("server.py", "w") as file:
-        file.write(server_code)
+    write_project_file(project_dir, "server.py", server_code)
 
-def create_js_server_code(language, framework):
+def create_js_server_code(language, framework, project_dir="."):
     """Create a JavaScript or TypeScript server code based on the selected framework."""
     if framework == "Express":
         server_code = """
@@ -426,10 +2925,9 @@ bootstrap();
         server_code = f"// Add {framework}-specific code here"
 
     file_extension = "ts" if language == "typescript" else "js"
-    with open(f"server.{file_extension}", "w") as file:
-        file.write(server_code)
+    write_project_file(project_dir, f"server.{file_extension}", server_code)
 
-def create_csharp_server_code(framework):
+def create_csharp_server_code(framework, project_dir="."):
     """Create a C# server code based on the selected framework."""
     if framework == "ASP.NET Core":
         server_code = """
@@ -492,10 +2990,9 @@ public class Program
     else:
         server_code = f"// Add {framework}-specific code here"
 
-    with open("Program.cs", "w") as file:
-        file.write(server_code)
+    write_project_file(project_dir, "Program.cs", server_code)
 
-def create_java_server_code(framework):
+def create_java_server_code(framework, project_dir="."):
     """Create a Java server code based on the selected framework."""
     if framework == "Spring Boot":
         server_code = """
@@ -552,10 +3049,9 @@ public class HelloController {
     else:
         server_code = f"// Add {framework}-specific code here"
 
-    with open("Application.java", "w") as file:
-        file.write(server_code)
+    write_project_file(project_dir, "Application.java", server_code)
 
-def create_ruby_server_code(framework):
+def create_ruby_server_code(framework, project_dir="."):
     """Create a Ruby server code based on the selected framework."""
     if framework == "Ruby on Rails":
         server_code = """
@@ -582,10 +3078,9 @@ end
     else:
         server_code = f"# Add {framework}-specific code here"
 
-    with open("server.rb", "w") as file:
-        file.write(server_code)
+    write_project_file(project_dir, "server.rb", server_code)
 
-def create_php_server_code(framework):
+def create_php_server_code(framework, project_dir="."):
     """Create a PHP server code based on the selected framework."""
     if framework == "Laravel":
         server_code = """
@@ -637,10 +3132,9 @@ $app->run();
     else:
         server_code = f"<?php\n// Add {framework}-specific code here\n"
 
-    with open("server.php", "w") as file:
-        file.write(server_code)
+    write_project_file(project_dir, "server.php", server_code)
 
-def create_go_server_code(framework):
+def create_go_server_code(framework, project_dir="."):
     """Create a Go server code based on the selected framework."""
     if framework == "Gin":
         server_code = """
@@ -695,8 +3189,7 @@ func main() {
     else:
         server_code = f"// Add {framework}-specific code here"
 
-    with open("server.go", "w") as file:
-        file.write(server_code)
+    write_project_file(project_dir, "server.go", server_code)
     """Create a basic Java server code."""
     server_code = """
 import com.sun.net.httpserver.HttpServer;
@@ -725,16 +3218,935 @@ public class SimpleHttpServer {
     }
 }
 """
-    with open("SimpleHttpServer.java", "w") as file:
-        file.write(server_code)
+    write_project_file(project_dir, "SimpleHttpServer.java", server_code)
+
+# How `bench` builds and starts a generated server: (language, framework, profile) -> (build command, start command, port).
+# Production scaffolds listen on $PORT; dev scaffolds listen on their framework's default port. Other scaffolds
+# need a full framework application around them and are benchmarked with --cmd and --port.
+BENCH_SERVER_COMMANDS = {
+    ("python", "Flask", "dev"): (None, "python server.py", 5000),
+    ("python", "FastAPI", "dev"): (None, "uvicorn server:app --port 8000", 8000),
+    ("python", "Flask", "production"): (None, "gunicorn -c gunicorn.conf.py server:app", 8000),
+    ("python", "Django", "production"): (None, "gunicorn -c gunicorn.conf.py project.wsgi", 8000),
+    ("python", "FastAPI", "production"): (None, "gunicorn -c gunicorn.conf.py server:app", 8000),
+    ("javascript", "Express", "dev"): ("npm install express", "node server.js", 3000),
+    ("javascript", "Koa", "dev"): ("npm install koa", "node server.js", 3000),
+    ("javascript", "Hapi", "dev"): ("npm install @hapi/hapi", "node server.js", 3000),
+    **{("javascript", framework, "production"): ("npm install", "npm start", 3000) for framework in ("Express", "Koa", "Hapi")},
+    **{("typescript", framework, "production"): ("npm install && npm run build", "npm start", 3000)
+       for framework in ("Express", "Nest.js", "Koa")},
+    **{("c#", framework, "production"): ("dotnet build -c Release", "dotnet run -c Release --no-build", 8080)
+       for framework in ("ASP.NET Core", "Nancy")},
+    **{("java", framework, "production"): ("mvn -q package -DskipTests", "sh run.sh", 8080)
+       for framework in ("Spring Boot", "Quarkus", "Micronaut")},
+    ("ruby", "Sinatra", "dev"): (None, "ruby server.rb", 4567),
+    ("ruby", "Sinatra", "production"): ("bundle install", "bundle exec puma -C config/puma.rb", 3000),
+    ("go", "Gin", "production"): ("go mod tidy", "go run .", 8080),
+    ("go", "Echo", "production"): ("go mod tidy", "go run .", 8080),
+    ("go", "Fiber", "production"): ("go mod tidy", "go run .", 3000),
+}
+
+# Seconds to wait for a started server to accept connections, and for one response during a load test
+BENCH_STARTUP_TIMEOUT = 120
+BENCH_REQUEST_TIMEOUT = 30
+
+def _percentile(sorted_values, fraction):
+    """Return the value at a fraction of an ascending list, or None if it is empty."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))] if sorted_values else None
+
+async def _http_exchange(reader, writer, request):
+    """Send one HTTP/1.1 request on a keep-alive connection and read the full response; return (status, keep_alive)."""
+    writer.write(request)
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by the server")
+    status = int(status_line.split()[1])
+    # HTTP/1.0 servers close the connection unless they say otherwise
+    length, chunked, keep_alive = 0, False, status_line.startswith(b"HTTP/1.1")
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding":
+            chunked = "chunked" in value
+        elif name == "connection":
+            keep_alive = value == "keep-alive" or (keep_alive and value != "close")
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            # Each chunk (and the final empty one) is followed by CRLF
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(length)
+    return status, keep_alive
+
+async def _run_load(host, port, request, mode, concurrency, duration, rate, warmup):
+    """Drive the server for warmup + duration seconds and return the measured (latencies, statuses, errors, elapsed)."""
+    latencies, statuses, errors = [], collections.Counter(), collections.Counter()
+    idle = []
+    slots = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def exchange(intended):
+        # Latency is measured from when the request was meant to be sent, so time spent waiting for
+        # a free connection under overload is counted instead of hidden (no coordinated omission)
+        async with slots:
+            connection = idle.pop() if idle else None
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(host, port)
+                status, keep_alive = await asyncio.wait_for(_http_exchange(*connection, request), BENCH_REQUEST_TIMEOUT)
+            except (OSError, ValueError, IndexError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                if intended >= measure_from:
+                    errors[type(e).__name__] += 1
+                if connection is not None:
+                    connection[1].close()
+                return False
+            finished = time.perf_counter()
+            if keep_alive:
+                idle.append(connection)
+            else:
+                connection[1].close()
+            if measure_from <= intended < deadline:
+                latencies.append(finished - intended)
+                statuses[status] += 1
+            return True
+
+    if mode == "closed":
+        # Each client sends its next request as soon as the previous response arrives
+        async def client():
+            while time.perf_counter() < deadline:
+                if not await exchange(time.perf_counter()):
+                    await asyncio.sleep(0.01)
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    else:
+        # Requests are sent on a fixed schedule whether or not earlier ones have completed
+        tasks, sent = [], 0
+        while True:
+            intended = started + sent / rate
+            if intended >= deadline:
+                break
+            await asyncio.sleep(max(0.0, intended - time.perf_counter()))
+            tasks.append(asyncio.ensure_future(exchange(intended)))
+            sent += 1
+        await asyncio.gather(*tasks)
+    for reader, writer in idle:
+        writer.close()
+    return latencies, statuses, errors, time.perf_counter() - measure_from
+
+def run_load_test(url, mode="closed", concurrency=64, duration=10.0, rate=None, warmup=2.0):
+    """Load an HTTP endpoint with a closed- or open-loop asyncio client and return throughput and latency statistics."""
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme != "http":
+        raise ValueError(f"Only http:// URLs can be benchmarked, not {url}")
+    if mode not in ("closed", "open"):
+        raise ValueError(f"Unknown load mode '{mode}'")
+    if mode == "open" and not rate:
+        raise ValueError("Open-loop mode needs a request rate")
+    host, port = parsed.hostname, parsed.port or 80
+    path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    request = (f"GET {path} HTTP/1.1\r\nHost: {parsed.netloc}\r\nAccept-Encoding: gzip, br\r\n"
+               f"Connection: keep-alive\r\n\r\n").encode()
+    latencies, statuses, errors, elapsed = asyncio.run(
+        _run_load(host, port, request, mode, concurrency, duration, rate, warmup))
+    latencies.sort()
+    results = {
+        "url": url,
+        "mode": mode,
+        "concurrency": concurrency,
+        "rate": rate,
+        "duration_s": round(elapsed, 3),
+        "warmup_s": warmup,
+        "requests": len(latencies),
+        "errors": dict(errors),
+        "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_ms": {"mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None},
+    }
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0)):
+        value = _percentile(latencies, fraction)
+        results["latency_ms"][label] = round(value * 1000, 3) if value is not None else None
+    return results
+
+def wait_for_port(host, port, process=None, timeout=BENCH_STARTUP_TIMEOUT):
+    """Wait until host:port accepts TCP connections; return False on timeout or if process exits first."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+
+def _stop_bench_server(process, timeout=10):
+    """Stop a server started by bench_project and every process it started, waiting until they have exited."""
+    if platform.system() == "Windows":
+        process.terminate()
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        return
+    deadline = time.monotonic() + timeout
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        # Wait for the whole process group: launchers like `npm start` or `dotnet run` exit before their server does
+        while True:
+            process.poll()
+            os.killpg(process.pid, 0)
+            if time.monotonic() >= deadline:
+                os.killpg(process.pid, signal.SIGKILL)
+                deadline = float("inf")
+            time.sleep(0.1)
+    except ProcessLookupError:
+        pass
+    process.wait()
+
+def bench_project(project_dir=".", command=None, port=None, build=None, url=None, path="/", mode="closed",
+                  concurrency=64, duration=10.0, rate=None, warmup=2.0, out=None):
+    """Start a generated server, load it over HTTP and write the results as JSON; returns the results."""
+    project_dir = os.path.abspath(project_dir)
+    server_inputs = (load_project_state(project_dir)["steps"].get("server") or {}).get("inputs") or {}
+    language, framework = server_inputs.get("language"), server_inputs.get("framework")
+    profile = server_inputs.get("profile", "dev")
+    process = None
+    if url is None:
+        if command is None:
+            if (language, framework, profile) not in BENCH_SERVER_COMMANDS:
+                raise ValueError(f"Don't know how to start the {profile} {framework or 'server'} scaffold in {project_dir}; "
+                                 "pass --cmd and --port")
+            default_build, command, default_port = BENCH_SERVER_COMMANDS[(language, framework, profile)]
+            build = build or default_build
+            port = port or default_port
+        if port is None:
+            raise ValueError("--cmd needs --port")
+        if wait_for_port("127.0.0.1", port, timeout=0):
+            raise RuntimeError(f"Port {port} is already in use; stop that server or pass --url to benchmark it")
+        if build and run_command(build, cwd=project_dir, stream_output=True) != 0:
+            raise RuntimeError(f"Build command failed: {build}")
+        url = f"http://127.0.0.1:{port}{path}"
+        log_path = os.path.join(project_dir, "bench-server.log")
+        print(f"Starting '{command}' (output in {log_path})...")
+        with open(log_path, "w") as log:
+            session = {} if platform.system() == "Windows" else {"start_new_session": True}
+            process = subprocess.Popen(command, shell=True, cwd=project_dir, stdout=log, stderr=subprocess.STDOUT,
+                                       env=dict(os.environ, PORT=str(port)), **session)
+    try:
+        with span(f"bench {framework or url}", "bench", mode=mode, concurrency=concurrency):
+            if process is not None:
+                started = time.perf_counter()
+                if not wait_for_port("127.0.0.1", port, process):
+                    raise RuntimeError(f"The server did not start listening on port {port}; see {log_path}")
+                print(f"Server accepting connections after {time.perf_counter() - started:.1f}s.")
+            load = f"{rate:g} req/s open loop" if mode == "open" else f"{concurrency} connections closed loop"
+            print(f"Loading {url} with {load} for {duration:g}s after {warmup:g}s of warmup...")
+            results = run_load_test(url, mode, concurrency, duration, rate, warmup)
+    finally:
+        if process is not None:
+            _stop_bench_server(process)
+
+    results.update({"language": language, "framework": framework, "profile": profile, "command": command,
+                    "cpu_count": os.cpu_count(), "platform": platform.platform(),
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")})
+    latency = results["latency_ms"]
+    errors = sum(results["errors"].values())
+    print(f"{results['requests']} requests in {results['duration_s']:.1f}s: {results['throughput_rps']:.1f} req/s, "
+          f"p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms, max {latency['max']} ms, "
+          f"{errors} errors")
+    non_2xx = sum(count for status, count in results["status_counts"].items() if not status.startswith("2"))
+    if non_2xx:
+        print(f"Warning: {non_2xx} responses were not 2xx: {results['status_counts']}")
+    slug = re.sub(r"[^a-z0-9]+", "-", f"{language or 'server'}-{framework or 'custom'}-{profile}".lower()).strip("-")
+    out = out or os.path.join(project_dir, f"bench-{slug}.json")
+    with open(out, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {out}")
+    return results
+
+def handle_bench_command(args):
+    """Handle the 'bench [options]' REPL command."""
+    parser = argparse.ArgumentParser(prog="bench", description="Benchmark the generated server in the current project.")
+    parser.add_argument("--cmd", help="Command that starts the server (default: by language, framework and profile)")
+    parser.add_argument("--build", help="Command run once before starting the server")
+    parser.add_argument("--port", type=int, help="Port the started server listens on")
+    parser.add_argument("--url", help="Benchmark an already running server instead of starting one")
+    parser.add_argument("--path", default="/", help="Request path (default: /)")
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed",
+                        help="closed: each connection sends back to back; open: a fixed request rate (default: closed)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Connections (closed) or maximum in flight (open)")
+    parser.add_argument("--rate", type=float, help="Requests per second in open-loop mode")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds (default: 10)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before measuring (default: 2)")
+    parser.add_argument("--out", help="JSON results file (default: bench-<language>-<framework>-<profile>.json)")
+    try:
+        options = parser.parse_args(args)
+    except SystemExit:
+        return
+    try:
+        bench_project(os.getcwd(), options.cmd, options.port, options.build, options.url, options.path, options.mode,
+                      options.concurrency, options.duration, options.rate, options.warmup, options.out)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+
+# Default number of targets `--fleet` provisions at once
+FLEET_FANOUT = 8
+
+# Results of `--fleet` runs, and the last outcome per target used to skip targets already up to date
+FLEET_DIR = os.path.join(CACHE_DIR, "fleet")
+
+# Directory, relative to a target's home, that receives the pushed script and archives
+FLEET_REMOTE_DIR = ".vscode-extension-creator"
+
+# Prefix of the JSON line `--provision` prints for the `--fleet` controller
+PROVISION_RESULT_MARKER = "@@vscode-extension-creator "
+
+# Tool whose presence means a provisioning step has nothing left to install
+PROVISION_STEP_TOOLS = {"python": "python3", "npm": "npm", **ENV_BUNDLE_COMPONENTS}
+
+def expand_provision_names(names):
+    """Turn a list of provisioning step and language names into provisioning steps."""
+    steps = []
+    for name in names:
+        name = name.strip()
+        if name in PROVISION_STEPS:
+            expanded = [name]
+        elif name.lower() in LANGUAGE_PROVISION_STEPS:
+            expanded = LANGUAGE_PROVISION_STEPS[name.lower()]
+        else:
+            raise ValueError(f"Unknown provisioning step or language: {name}")
+        for step in expanded:
+            if step not in steps:
+                steps.append(step)
+    return steps
+
+def provision_step_satisfied(name):
+    """Return whether a provisioning step would find nothing to install on this machine."""
+    if name == "yeoman":
+        return not unmet_global_npm_packages()
+    return find_tool(PROVISION_STEP_TOOLS[name]) is not None
+
+def provision_check(step_names):
+    """Report which steps of a plan still have work to do here and which of their archives are not cached."""
+    plan = resolve_provision_plan(step_names)
+    missing = [name for name in plan if not provision_step_satisfied(name)]
+    system = platform.system()
+    index = _load_download_index()
+    artifacts = []
+    for name in missing:
+        artifact = PROVISION_ARTIFACTS.get(name, {}).get(system)
+        if artifact is None:
+            continue
+        entry = index.get(artifact["url"])
+        pinned = _pinned_sha256(artifact["url"])
+        if not (entry and pinned in (None, entry["sha256"]) and os.path.exists(_cached_object_path(entry))):
+            artifacts.append(artifact["url"])
+    return {"host": socket.gethostname(), "system": system, "plan": plan, "missing": missing, "artifacts": artifacts}
+
+def import_artifact(url, path):
+    """Move a file into the download cache as the archive at url, so fetch_artifact finds it cached."""
+    filename = url.rsplit("/", 1)[-1]
+    sha256 = _sha256_of_file(path)
+    pinned = _pinned_sha256(url)
+    try:
+        _require_pin(url, pinned)
+    except RuntimeError:
+        os.remove(path)
+        raise
+    if pinned is not None and sha256 != pinned:
+        os.remove(path)
+        raise RuntimeError(f"Checksum mismatch for pushed {filename}: expected {pinned}, got {sha256}")
+    size = os.path.getsize(path)
+    object_dir = os.path.join(DOWNLOAD_CACHE_DIR, "objects", sha256)
+    os.makedirs(object_dir, exist_ok=True)
+    shutil.move(path, os.path.join(object_dir, filename))
+    with _download_index_locked():
+        index = _load_download_index()
+        index[url] = {"sha256": sha256, "filename": filename, "size": size, "last_used": time.time()}
+        _prune_download_index(index, DOWNLOAD_CACHE_MAX_BYTES, keep=url)
+        _save_download_index(index)
+    print(f"Imported {filename} into the download cache (sha256 {sha256[:12]})")
+
+def provision_headless(step_names, check_only=False, artifacts=()):
+    """Provision this machine without prompts and print the outcome as one marked JSON line. Returns the exit status."""
+    for url, path in artifacts:
+        import_artifact(url, path)
+    result = provision_check(step_names)
+    if check_only or not result["missing"]:
+        result["status"] = "outdated" if result["missing"] else "up-to-date"
+    else:
+        steps = run_provisioning_plan(result["missing"])
+        result["steps"] = {name: {"status": step["status"], "error": step["error"], "duration": round(step["duration"], 3)}
+                           for name, step in steps.items()}
+        failed = any(step["status"] != "ok" for step in steps.values())
+        result["status"] = "failed" if failed else "provisioned"
+    result["lock_waits"] = {name: round(stats["waited"], 3) for name, stats in lease_stats().items() if stats["contended"]}
+    print(PROVISION_RESULT_MARKER + json.dumps(result), flush=True)
+    return 1 if result["status"] == "failed" else 0
+
+def _stream_process(args, on_line, **kwargs):
+    """Run a process, passing each line of its combined output to on_line. Returns its exit status."""
+    process = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, errors="replace", **kwargs)
+    with process.stdout:
+        for line in process.stdout:
+            on_line(line.rstrip("\n"))
+    return process.wait()
+
+def _ssh_options(target):
+    """Return the ssh/scp options shared by every connection to a target."""
+    # One master connection per target carries the check, the copies and the provisioning run
+    control_path = os.path.join(tempfile.gettempdir(), "vscode-ext-fleet-%C")
+    options = ["-o", "BatchMode=yes", "-o", "ControlMaster=auto", "-o", f"ControlPath={control_path}",
+               "-o", "ControlPersist=60"]
+    if target.get("identity"):
+        options += ["-i", target["identity"]]
+    return options
+
+def _ssh_destination(target):
+    """Return the user@host an ssh target is reached at."""
+    return f"{target['user']}@{target['host']}" if target.get("user") else target["host"]
+
+def _ssh_run(target, command, on_line):
+    """Run a shell command on an ssh target."""
+    port = ["-p", str(target["port"])] if target.get("port") else []
+    return _stream_process(["ssh"] + _ssh_options(target) + port + [_ssh_destination(target), command], on_line)
+
+def _ssh_put(target, local_path, remote_path):
+    """Copy a file to an ssh target with scp."""
+    port = ["-P", str(target["port"])] if target.get("port") else []
+    result = subprocess.run(["scp", "-q"] + _ssh_options(target) + port + [local_path, f"{_ssh_destination(target)}:{remote_path}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"scp failed: {result.stderr.strip() or f'exit status {result.returncode}'}")
+
+def _fleet_local_env(home):
+    """Return the environment of a local or chroot target whose home directory is home."""
+    env = dict(os.environ, HOME=home)
+    # The target keeps its own download cache under its home, as a separate machine would
+    env.pop("VSCODE_EXT_CREATOR_CACHE", None)
+    return env
+
+def _local_run(target, command, on_line):
+    """Run a shell command for a local target, with its root directory as home."""
+    os.makedirs(target["root"], exist_ok=True)
+    return _stream_process(["/bin/sh", "-c", command], on_line, cwd=target["root"], env=_fleet_local_env(target["root"]))
+
+def _local_put(target, local_path, remote_path):
+    """Copy a file into a local target's root directory."""
+    shutil.copyfile(local_path, os.path.join(target["root"], remote_path))
+
+def _chroot_run(target, command, on_line):
+    """Run a shell command inside a chroot target."""
+    home = target.get("home", "/root")
+    return _stream_process(["chroot", target["root"], "/bin/sh", "-c", f"cd {shlex.quote(home)} && {command}"],
+                           on_line, env=_fleet_local_env(home))
+
+def _chroot_put(target, local_path, remote_path):
+    """Copy a file into the home directory of a chroot target."""
+    shutil.copyfile(local_path, os.path.join(target["root"], target.get("home", "/root").lstrip("/"), remote_path))
+
+# How `--fleet` reaches a target: "run" executes a shell command from the target's home directory,
+# "put" copies a file to a path relative to it. "local" and "chroot" stand in for machines in tests.
+FLEET_TRANSPORTS = {
+    "ssh": {"run": _ssh_run, "put": _ssh_put, "requires": ["host"]},
+    "local": {"run": _local_run, "put": _local_put, "requires": ["root"]},
+    "chroot": {"run": _chroot_run, "put": _chroot_put, "requires": ["root"]}
+}
+
+def load_fleet_inventory(path):
+    """Load and validate a JSON or YAML fleet inventory. Returns its targets and its default plan."""
+    inventory = load_structured_file(path)
+    entries = inventory.get("targets", []) if isinstance(inventory, dict) else inventory
+    plan = inventory.get("plan", []) if isinstance(inventory, dict) else []
+    targets, names = [], set()
+    for i, entry in enumerate(entries, 1):
+        # A bare string is an ssh host
+        target = {"host": entry} if isinstance(entry, str) else dict(entry)
+        target.setdefault("transport", "ssh")
+        if target["transport"] not in FLEET_TRANSPORTS:
+            raise ValueError(f"Fleet target {i}: unknown transport '{target['transport']}'")
+        for key in FLEET_TRANSPORTS[target["transport"]]["requires"]:
+            if not target.get(key):
+                raise ValueError(f"Fleet target {i} is missing '{key}'")
+        target.setdefault("name", target.get("host") or target["root"])
+        if target["name"] in names:
+            raise ValueError(f"Fleet target {i}: duplicate target name '{target['name']}'")
+        names.add(target["name"])
+        targets.append(target)
+    return targets, plan
+
+def provision_target(target, plan):
+    """Check one fleet target, push the archives it lacks and provision it. Returns its result."""
+    name = target["name"]
+    transport = FLEET_TRANSPORTS[target["transport"]]
+    script = f"{FLEET_REMOTE_DIR}/setup_vscode_extension.py"
+    provision = f"{target.get('python', 'python3')} {script} --provision {shlex.quote(','.join(plan))}"
+    result = {"name": name, "transport": target["transport"], "plan": plan, "status": "failed", "error": None,
+              "missing": [], "pushed": [], "pushed_bytes": 0, "steps": {}, "timings": {}}
+    reported = {}
+    output = collections.deque(maxlen=5)
+
+    def on_line(line, echo):
+        if line.startswith(PROVISION_RESULT_MARKER):
+            reported.update(json.loads(line[len(PROVISION_RESULT_MARKER):]))
+            return
+        output.append(line)
+        if echo:
+            print(f"[{name}] {line}", flush=True)
+
+    def run_remote(command, echo=False):
+        reported.clear()
+        status = transport["run"](target, command, lambda line: on_line(line, echo))
+        if not reported:
+            detail = f": {output[-1]}" if output else ""
+            raise RuntimeError(f"'{command}' exited with status {status} without a result{detail}")
+        return status
+
+    started = time.perf_counter()
+    phase_started = started
+    phase = "connect"
+    try:
+        with span(f"fleet {name}", "fleet", transport=target["transport"]):
+            status = transport["run"](target, f"mkdir -p {FLEET_REMOTE_DIR}/incoming", lambda line: on_line(line, False))
+            if status != 0:
+                raise RuntimeError(f"could not reach the target (exit status {status}){f': {output[-1]}' if output else ''}")
+            transport["put"](target, os.path.abspath(__file__), script)
+            result["timings"]["connect"] = time.perf_counter() - phase_started
+
+            phase, phase_started = "check", time.perf_counter()
+            run_remote(f"{provision} --check")
+            result["timings"]["check"] = time.perf_counter() - phase_started
+            result["missing"] = reported["missing"]
+            if not result["missing"]:
+                result["status"] = "up-to-date"
+                print(f"[{name}] up to date ({', '.join(plan)})", flush=True)
+                return result
+
+            phase, phase_started = "push", time.perf_counter()
+            artifacts = []
+            for url in reported["artifacts"]:
+                # fetch_artifact's lease makes targets needing the same archive wait for one download
+                path = fetch_artifact(url)
+                remote_path = f"{FLEET_REMOTE_DIR}/incoming/{os.path.basename(os.path.dirname(path))}"
+                print(f"[{name}] pushing {os.path.basename(path)} ({os.path.getsize(path) / 1024 ** 2:.1f} MB)", flush=True)
+                transport["put"](target, path, remote_path)
+                result["pushed"].append(url)
+                result["pushed_bytes"] += os.path.getsize(path)
+                artifacts.append(f"--artifact {shlex.quote(f'{url}={remote_path}')}")
+            result["timings"]["push"] = time.perf_counter() - phase_started
+
+            phase, phase_started = "provision", time.perf_counter()
+            print(f"[{name}] provisioning {', '.join(result['missing'])}", flush=True)
+            status = run_remote(" ".join([provision] + artifacts), echo=True)
+            result["timings"]["provision"] = time.perf_counter() - phase_started
+            result["status"] = reported["status"]
+            result["steps"] = reported.get("steps", {})
+            if result["status"] == "failed":
+                failed = [step for step, outcome in result["steps"].items() if outcome["status"] != "ok"]
+                result["error"] = f"failed steps: {', '.join(failed)}" if failed else f"exit status {status}"
+    except Exception as e:
+        result["timings"].setdefault(phase, time.perf_counter() - phase_started)
+        result["status"], result["error"] = "failed", f"{phase}: {e}"
+        print(f"[{name}] failed during {phase}: {e}", flush=True)
+    finally:
+        result["elapsed"] = time.perf_counter() - started
+    return result
+
+def _load_fleet_state():
+    """Load the last outcome of every fleet target."""
+    try:
+        with open(os.path.join(FLEET_DIR, "state.json")) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def _save_fleet_state(state):
+    """Atomically write the last outcome of every fleet target."""
+    os.makedirs(FLEET_DIR, exist_ok=True)
+    state_path = os.path.join(FLEET_DIR, "state.json")
+    with open(state_path + ".tmp", "w") as file:
+        json.dump(state, file, indent=2)
+    os.replace(state_path + ".tmp", state_path)
+
+def print_fleet_summary(results, elapsed):
+    """Print the status, phase timings and pushed bytes of every target of a fleet run."""
+    print("\nFleet summary:")
+    width = max(len(result["name"]) for result in results)
+    for result in results:
+        line = f"  {result['name'].ljust(width)}  {result['status'].ljust(11)}  {result.get('elapsed', 0.0):7.2f}s"
+        phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in result["timings"].items())
+        if phases:
+            line += f"  ({phases})"
+        if result["pushed_bytes"]:
+            line += f"  pushed {result['pushed_bytes'] / 1024 ** 2:.1f} MB"
+        if result["error"]:
+            line += f" - {result['error']}"
+        print(line)
+    counts = collections.Counter(result["status"] for result in results)
+    print(f"Total wall time: {elapsed:.2f}s ({', '.join(f'{count} {status}' for status, count in counts.items())})")
+
+def run_fleet(inventory_path, plan=None, fanout=FLEET_FANOUT, force=False):
+    """Provision every target of an inventory, at most fanout at a time. Returns the number of failed targets."""
+    targets, default_plan = load_fleet_inventory(inventory_path)
+    plans = {}
+    for target in targets:
+        names = plan or target.get("plan") or default_plan
+        if isinstance(names, str):
+            names = names.split(",")
+        plans[target["name"]] = resolve_provision_plan(expand_provision_names(names))
+        if not plans[target["name"]]:
+            raise ValueError(f"No provisioning plan for fleet target '{target['name']}'; pass --plan or set 'plan' in {inventory_path}")
+
+    state = _load_fleet_state()
+    results, pending = {}, []
+    for target in targets:
+        name = target["name"]
+        previous = state.get(name)
+        if not force and previous and previous["plan"] == plans[name] and previous["status"] in ("up-to-date", "provisioned"):
+            since = time.strftime("%Y-%m-%d %H:%M", time.localtime(previous["finished"]))
+            print(f"[{name}] up to date since {since}; skipping (--force checks it again)")
+            results[name] = {"name": name, "transport": target["transport"], "plan": plans[name], "status": "skipped",
+                             "error": None, "missing": [], "pushed": [], "pushed_bytes": 0, "steps": {}, "timings": {},
+                             "elapsed": 0.0, "up_to_date_since": previous["finished"]}
+        else:
+            pending.append(target)
+
+    print(f"Provisioning {len(pending)} of {len(targets)} targets, {fanout} at a time")
+    started = time.perf_counter()
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(fanout, len(pending)))) as pool:
+            futures = [pool.submit(provision_target, target, plans[target["name"]]) for target in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["name"]] = result
+                if result["status"] in ("up-to-date", "provisioned"):
+                    state[result["name"]] = {"plan": result["plan"], "status": result["status"], "finished": time.time()}
+                else:
+                    state.pop(result["name"], None)
+                _save_fleet_state(state)
+
+    results = [results[target["name"]] for target in targets]
+    print_fleet_summary(results, time.perf_counter() - started)
+    os.makedirs(FLEET_DIR, exist_ok=True)
+    report_path = os.path.join(FLEET_DIR, f"run-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(report_path, "w") as file:
+        json.dump({"inventory": os.path.abspath(inventory_path), "targets": results}, file, indent=2)
+    print(f"Results: {report_path}")
+    up_to_date = [result["name"] for result in results if result["status"] in ("up-to-date", "provisioned", "skipped")]
+    if up_to_date:
+        print(f"Skipped on the next run unless --force: {', '.join(up_to_date)}")
+    return sum(result["status"] == "failed" for result in results)
+
+# "session" keeps one shell alive for pass-through commands; "system" runs each through os.system.
+# The session is POSIX-only: the shell reads commands from a /dev/fd pipe and the REPL waits for its
+# report with select() on another, neither of which Windows has, so there it is always "system".
+# Output is not captured between sentinels: commands write straight to the REPL's terminal so
+# interactive programs work, and only the status report on its own pipe marks the end of a command.
+SHELL_MODE = os.environ.get("VSCODE_EXT_CREATOR_SHELL_MODE", "session" if os.name == "posix" else "system")
+
+# The REPL's persistent shell coprocess, the pipes it reads commands from and reports status on,
+# and the state it last reported
+_shell_session = {"process": None, "script": None, "report": None, "report_path": None, "cwd": None, "status": 0}
+
+def start_shell_session():
+    """Start the persistent shell coprocess used for pass-through commands."""
+    # Always a POSIX shell: the commands below are sh syntax, which fish or csh in $SHELL would not parse
+    shell = shutil.which("bash") or "/bin/sh"
+    script_read, script_write = os.pipe()
+    report_read, report_write = os.pipe()
+    # The shell reads its script from one pipe and reports on another, so commands keep the REPL's
+    # terminal and interactive programs (vim, less, python, git commit) work. When the REPL's input is
+    # not a terminal, commands get /dev/null so they cannot consume the REPL's remaining input.
+    try:
+        process = subprocess.Popen(
+            [shell, f"/dev/fd/{script_read}"], stdin=None if sys.stdin.isatty() else subprocess.DEVNULL,
+            pass_fds=(script_read, report_write)
+        )
+    finally:
+        os.close(script_read)
+        os.close(report_write)
+    _shell_session.update(process=process, script=os.fdopen(script_write, "wb", buffering=0), report=report_read,
+                          report_path=f"/dev/fd/{report_write}", cwd=None)
+    # Lets each command see the previous command's status as $?, and keeps Ctrl+C from ending the shell
+    # itself; a trap (unlike an ignored signal) is reset in the commands, so Ctrl+C still stops them
+    _shell_session["script"].write(b'__vscode_ext_creator_status() { return "$1"; }\ntrap : INT\n')
 
+def close_shell_session():
+    """Stop the persistent shell coprocess if one is running."""
+    process = _shell_session["process"]
+    _shell_session["process"] = None
+    if process is None:
+        return
+    try:
+        _shell_session["script"].close()
+        process.wait(timeout=2)
+    except (OSError, subprocess.TimeoutExpired):
+        process.kill()
+        process.wait()
+    finally:
+        os.close(_shell_session["report"])
+
+def run_in_shell_session(command):
+    """Run a command in the persistent shell on the REPL's terminal; return the exit status or None if the shell died."""
+    if _shell_session["process"] is None or _shell_session["process"].poll() is not None:
+        close_shell_session()
+        start_shell_session()
+    process = _shell_session["process"]
+    script = ""
+    if _shell_session["cwd"] != os.getcwd():
+        script += f"cd {shlex.quote(os.getcwd())}\n"
+    script += f"__vscode_ext_creator_status {_shell_session['status']}; eval {shlex.quote(command)}\n"
+    # The status, working directory and PATH, NUL-separated since directories may contain spaces
+    script += f"printf '%s\\0%s\\0%s\\n' \"$?\" \"$PWD\" \"$PATH\" > {_shell_session['report_path']}\n"
+
+    # Like a shell, leave Ctrl+C to the foreground command while it runs
+    previous_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        _shell_session["script"].write(script.encode())
+        report = b""
+        while not report.endswith(b"\n"):
+            # A background job may hold the report pipe open, so notice the shell exiting on its own
+            ready, _, _ = select.select([_shell_session["report"]], [], [], 0.5)
+            chunk = os.read(_shell_session["report"], 65536) if ready else b""
+            if not chunk and (ready or process.poll() is not None):
+                close_shell_session()
+                return None
+            report += chunk
+    except BrokenPipeError:
+        close_shell_session()
+        return None
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+    status, cwd, path = report[:-1].decode(errors="surrogateescape").split("\0", 2)
+    _shell_session["status"] = int(status)
+    _shell_session["cwd"] = cwd
+    if cwd and cwd != os.getcwd():
+        os.chdir(cwd)
+    # Keep tools and the completion index on the PATH the shell exports, e.g. after activating a virtualenv
+    if path and path != os.environ.get("PATH"):
+        os.environ["PATH"] = path
+    return int(status)
+
+def run_shell_command(command):
+    """Run a pass-through REPL command in the shell session, falling back to os.system, and print its timing."""
+    global SHELL_MODE
+    if SHELL_MODE == "session" and os.name != "posix":
+        print("The shell session needs a POSIX system; running commands through os.system instead.")
+        SHELL_MODE = "system"
+    started = time.perf_counter()
+    if SHELL_MODE == "session":
+        try:
+            status = run_in_shell_session(command)
+        except KeyboardInterrupt:
+            close_shell_session()
+            print("\nInterrupted; the shell session will be restarted.")
+            return
+        except OSError as e:
+            print(f"Shell session unavailable ({e}); running the command directly.")
+            close_shell_session()
+            status = os.system(command)
+        if status is None:
+            print("The shell session exited; it will be restarted for the next command.")
+            return
+    else:
+        status = os.system(command)
+        if os.name == "posix":
+            status = os.waitstatus_to_exitcode(status)
+    print(f"[exit {status} in {(time.perf_counter() - started) * 1000:.1f} ms]")
+
+# Options accepted by the REPL's create command
+CREATE_FLAGS = {'--force', '--bundle', '--fast-server'} | {f'--profile={profile}' for profile in SERVER_PROFILES}
+
+# Custom REPL commands and the words completed after them; None completes directory names
+REPL_COMMANDS = {
+    "create": sorted(CREATE_FLAGS),
+    "resume": [],
+    "cd": None,
+    "pwd": [],
+    "template": ["parity"],
+    "tools": ["refresh"],
+    "cache": ["list", "prune", "locks"],
+    "env": ["export", "import"],
+    "bench": ["--cmd", "--build", "--port", "--url", "--path", "--mode", "--concurrency", "--rate", "--duration",
+              "--warmup", "--out", "--help"],
+    "exit": []
+}
+
+# Seconds between checks of the PATH directories for added or removed executables
+PATH_INDEX_INTERVAL = 2
+
+# Executables on PATH and the custom commands, sorted for prefix lookups, and the directory listings
+# the executables were merged from
+_path_index = {"names": sorted(REPL_COMMANDS), "dirs": {}}
+_path_index_lock = threading.Lock()
+
+# Words offered instead of commands while a prompt asks for one of a fixed set of choices, and the
+# readline module once completion is enabled
+_completion = {"choices": None, "matches": [], "readline": None}
+
+def _list_executables(directory):
+    """Return the names of the executable files in a directory."""
+    names = set()
+    extensions = os.environ.get("PATHEXT", ".EXE;.BAT;.CMD").lower().split(";") if platform.system() == "Windows" else None
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                if extensions is not None:
+                    stem, extension = os.path.splitext(entry.name)
+                    if extension.lower() in extensions:
+                        names.add(stem)
+                elif os.access(entry.path, os.X_OK):
+                    names.add(entry.name)
+    except OSError:
+        pass
+    return names
+
+def refresh_path_index():
+    """Re-list the PATH directories that changed since the last refresh and rebuild the executable index."""
+    directories = list(dict.fromkeys(directory for directory in os.environ.get("PATH", "").split(os.pathsep) if directory))
+    previous = _path_index["dirs"]
+    listings = {}
+    for directory in directories:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+        if directory in previous and previous[directory][0] == mtime:
+            listings[directory] = previous[directory]
+        else:
+            listings[directory] = (mtime, frozenset(_list_executables(directory)))
+    if listings.keys() == previous.keys() and all(listings[d] is previous[d] for d in listings):
+        return False
+    names = sorted(set(REPL_COMMANDS).union(*(names for _, names in listings.values())))
+    with _path_index_lock:
+        _path_index["names"], _path_index["dirs"] = names, listings
+    return True
+
+def _path_index_loop():
+    """Refresh the executable index every PATH_INDEX_INTERVAL seconds."""
+    while True:
+        refresh_path_index()
+        time.sleep(PATH_INDEX_INTERVAL)
+
+def start_path_index():
+    """Build the executable index in a background thread and keep it current while the REPL runs."""
+    threading.Thread(target=_path_index_loop, name="path-index", daemon=True).start()
+
+def _prefixed(names, prefix):
+    """Return the entries of a sorted list that start with prefix."""
+    start = bisect.bisect_left(names, prefix)
+    end = bisect.bisect_left(names, prefix + "\U0010ffff")
+    return names[start:end]
+
+def _complete_path(text, directories_only=False):
+    """Complete a file or directory path, keeping the text as typed (including ~)."""
+    head, tail = os.path.split(text)
+    try:
+        with os.scandir(os.path.expanduser(head) or ".") as entries:
+            found = []
+            for entry in entries:
+                if not entry.name.startswith(tail) or (entry.name.startswith(".") and not tail.startswith(".")):
+                    continue
+                is_dir = entry.is_dir()
+                if is_dir:
+                    found.append(os.path.join(head, entry.name) + os.sep)
+                elif not directories_only:
+                    found.append(os.path.join(head, entry.name))
+    except OSError:
+        return []
+    return sorted(found)
+
+def repl_completions(line, begidx, text):
+    """Return the completions of the word text, which starts at begidx in the REPL input line."""
+    if _completion["choices"] is not None:
+        return [choice for choice in _completion["choices"] if choice.lower().startswith(text.lower())]
+    words = line[:begidx].split()
+    if not words:
+        if os.sep in text or (os.altsep and os.altsep in text):
+            return _complete_path(text)
+        with _path_index_lock:
+            return _prefixed(_path_index["names"], text)
+    if words[0] in REPL_COMMANDS:
+        options = REPL_COMMANDS[words[0]]
+        if options is None:
+            return _complete_path(text, directories_only=True)
+        if words[0] != "create" and len(words) > 1 and not text.startswith("-"):
+            return _complete_path(text)
+        return [option for option in options if option.startswith(text) and option not in words[1:]]
+    return _complete_path(text)
+
+@contextlib.contextmanager
+def completion_choices(choices):
+    """Complete from choices instead of commands while a prompt asks for one of them."""
+    previous = _completion["choices"]
+    _completion["choices"] = list(choices)
+    # Choices such as "Spring Boot" contain spaces, so the whole line is the word being completed
+    readline = _completion["readline"]
+    delims = readline.get_completer_delims() if readline else None
+    if readline:
+        readline.set_completer_delims("")
+    try:
+        yield
+    finally:
+        _completion["choices"] = previous
+        if readline:
+            readline.set_completer_delims(delims)
+
+def enable_repl_completion():
+    """Turn on tab completion for the REPL if readline is available. Returns whether it was enabled."""
+    # readline is missing on Windows unless a replacement such as pyreadline3 is installed
+    try:
+        import readline
+    except ImportError:
+        return False
+
+    def complete(text, state):
+        if state == 0:
+            line = readline.get_line_buffer()
+            _completion["matches"] = repl_completions(line, readline.get_begidx(), text)
+        return _completion["matches"][state] if state < len(_completion["matches"]) else None
+
+    readline.set_completer(complete)
+    readline.set_completer_delims(" \t\n;|&<>")
+    _completion["readline"] = readline
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    start_path_index()
+    return True
 
 def process_command(command):
     """Process user commands."""
     if command.lower() == 'exit':
         return False
-    elif command.lower() == 'create':
-        # Run the extension creation process
+    elif command.lower().split()[:1] == ['create'] and set(command.lower().split()[1:]) <= CREATE_FLAGS:
+        # Run the extension creation process; --force overwrites generated files the user has edited,
+        # --bundle builds the extension with esbuild and adds a package script and activation benchmark,
+        # --fast-server uses the language server with debounced, cached and worker-offloaded validation,
+        # --profile=production writes a multi-worker server scaffold sized to this host's cores
+        flags = set(command.lower().split()[1:])
+        force = '--force' in flags
         extension_name = input("Enter the extension name: ")
         extension_description = input("Enter a brief description of the extension: ")
         
@@ -743,7 +4155,12 @@ def process_command(command):
             print(f"{i}. {lang}")
         
         while True:
-            lang_choice = input("\nSelect a language (enter the number): ")
+            with completion_choices(LANGUAGE_FRAMEWORKS):
+                lang_choice = input("\nSelect a language (enter the number or name): ")
+            named = [lang for lang in LANGUAGE_FRAMEWORKS if lang.lower() == lang_choice.strip().lower()]
+            if named:
+                language = named[0]
+                break
             try:
                 lang_index = int(lang_choice) - 1
                 if 0 <= lang_index < len(LANGUAGE_FRAMEWORKS):
@@ -756,21 +4173,30 @@ def process_command(command):
         
         print(f"\nSelected language: {language}")
         
+        framework = select_framework(language)
+        journal = start_run_journal({"name": extension_name, "description": extension_description, "language": language,
+                                     "framework": framework, "generator": EXTENSION_GENERATOR,
+                                     "base_dir": os.getcwd(), "force": force, "bundle": '--bundle' in flags,
+                                     "server_template": "fast" if '--fast-server' in flags else "sample",
+                                     "profile": "production" if '--profile=production' in flags else "dev"})
         try:
-            framework = setup_environment_for_language(language)
+            project_dir = run_journaled_create(journal)
         except Exception as e:
-            print(f"Error setting up environment: {e}")
+            print(f"Error creating extension project: {e}")
+            print("Fix the problem and enter 'resume' to continue from the failed step.")
             return True
+        os.chdir(project_dir)
 
-        create_extension_project(extension_name, extension_description)
-        
+        print("\nSetup complete!")
+    elif command.lower() == 'resume':
         try:
-            create_server_code(language, framework)
+            project_dir = resume_run()
         except Exception as e:
-            print(f"Error creating server code: {e}")
+            print(f"Error resuming the run: {e}")
             return True
-
-        print("\nSetup complete!")
+        if project_dir:
+            os.chdir(project_dir)
+            print("\nSetup complete!")
     else:
         # Execute the command in the current process
         try:
@@ -782,8 +4208,18 @@ def process_command(command):
                     print(f"Current directory: {os.getcwd()}")
             elif args[0] == 'pwd':
                 print(os.getcwd())
+            elif args[0] == 'template' and args[1:] == ['parity']:
+                check_template_parity()
+            elif args[0] == 'tools':
+                handle_tools_command(args[1:])
+            elif args[0] == 'cache':
+                handle_cache_command(args[1:])
+            elif args[0] == 'env' and args[1:2] in (['export'], ['import']):
+                handle_env_command(args[1:])
+            elif args[0] == 'bench':
+                handle_bench_command(args[1:])
             else:
-                os.system(command)
+                run_shell_command(command)
         except FileNotFoundError:
             print(f"Directory not found: {args[1]}")
         except PermissionError:
@@ -793,21 +4229,111 @@ def process_command(command):
     return True
 
 def main():
+    parser = argparse.ArgumentParser(description="Create VSCode extension projects and their development environments.")
+    parser.add_argument("--manifest", help="JSON or YAML file describing extensions to generate non-interactively")
+    parser.add_argument("--workers", type=int, help=f"Number of concurrent --manifest, --serve or --fleet jobs (default: CPU count for --manifest, 4 for --serve, {FLEET_FANOUT} for --fleet)")
+    parser.add_argument("--output-dir", help="Directory to generate --manifest or --serve projects in (default: current directory)")
+    parser.add_argument("--serve", action="store_true", help="Run as a daemon serving JSON create requests")
+    parser.add_argument("--port", type=int, help="Localhost HTTP port for --serve (default: 8765) or --registry-proxy (default: 4873)")
+    parser.add_argument("--socket", help="Serve over this Unix socket instead of HTTP")
+    parser.add_argument("--registry-proxy", action="store_true", help="Run a caching proxy for the npm, Maven, Go and PyPI registries")
+    parser.add_argument("--upstream", action="append", default=[], metavar="NAME=URL",
+                        help=f"Override a --registry-proxy upstream ({', '.join(REGISTRY_UPSTREAMS)}); may be repeated")
+    parser.add_argument("--provision", metavar="STEPS", help="Provision comma-separated steps or languages without prompts and exit")
+    parser.add_argument("--check", action="store_true", help="With --provision, only report the steps and archives still missing")
+    parser.add_argument("--artifact", action="append", default=[], metavar="URL=PATH",
+                        help="With --provision, add PATH to the download cache as the archive at URL first; may be repeated")
+    parser.add_argument("--fleet", metavar="INVENTORY", help="Provision every target of a JSON or YAML inventory over ssh (or a local test transport)")
+    parser.add_argument("--plan", metavar="STEPS", help="Comma-separated steps or languages for --fleet, overriding the inventory's plans")
+    parser.add_argument("--force", action="store_true", help="With --fleet, also check targets the last run found up to date")
+    parser.add_argument("--resume", action="store_true", help="Continue the last failed create run from its first incomplete step and exit")
+    parser.add_argument("--trace", metavar="OUT_JSON", help="Record timing spans and write them as a Chrome trace to OUT_JSON on exit")
+    options = parser.parse_args()
+
+    if options.trace:
+        enable_tracing()
+    try:
+        run(options)
+    finally:
+        if options.trace:
+            print_trace_summary()
+            write_trace(options.trace)
+
+def run(options):
+    """Run the mode selected on the command line."""
+    if options.manifest:
+        try:
+            failures = run_manifest(options.manifest, options.workers, options.output_dir)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(1 if failures else 0)
+
+    if options.provision:
+        try:
+            artifacts = [spec.rpartition("=")[::2] for spec in options.artifact]
+            if not all(url and path for url, path in artifacts):
+                raise ValueError("--artifact takes URL=PATH")
+            status = provision_headless(expand_provision_names(options.provision.split(",")), options.check, artifacts)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        sys.exit(status)
+
+    if options.fleet:
+        try:
+            failures = run_fleet(options.fleet, options.plan and options.plan.split(","),
+                                 options.workers or FLEET_FANOUT, options.force)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(1 if failures else 0)
+
+    if options.resume:
+        try:
+            project_dir = resume_run()
+        except Exception as e:
+            print(f"Error resuming the run: {e}")
+            sys.exit(1)
+        sys.exit(0 if project_dir else 1)
+
+    if options.registry_proxy:
+        upstreams = dict(upstream.split("=", 1) for upstream in options.upstream if "=" in upstream)
+        unknown = set(upstreams) - set(REGISTRY_UPSTREAMS)
+        if unknown or len(upstreams) != len(options.upstream):
+            print(f"Error: --upstream takes NAME=URL with NAME one of {', '.join(REGISTRY_UPSTREAMS)}")
+            sys.exit(2)
+        registry_proxy(options.port or 4873, upstreams)
+        return
+
+    if options.serve:
+        serve(options.port or 8765, options.socket, options.workers or PROVISION_MAX_WORKERS, options.output_dir)
+        return
+
     print("Welcome to the VSCode Extension Creator Command Prompt!")
     print("Available custom commands:")
-    print("  create  - Start the extension creation process")
+    print("  create  - Start the extension creation process (create [--force] [--bundle] [--fast-server] [--profile=production])")
+    print("  resume  - Continue the last failed create from its first incomplete step")
     print("  cd      - Change directory")
     print("  pwd     - Print working directory")
+    print("  template parity - Diff the built-in extension template against Yeoman's output")
+    print("  tools   - Show detected toolchains and versions (tools refresh to re-probe)")
+    print("  cache   - List or prune the download cache, or show host-wide locks (cache list | cache prune [size] | cache locks)")
+    print("  env     - Bundle installed toolchains or unpack a bundle (env export [bundle] | env import <bundle>)")
+    print("  bench   - Start the project's server and measure its throughput and latency (bench --help)")
     print("  exit    - Exit the program")
     print("All standard system commands are also available.")
+    enable_repl_completion()
     
     while True:
         current_dir = os.getcwd()
         user_input = input(f"\n{current_dir}> ")
         if not process_command(user_input):
             break
+    close_shell_session()
 
     print("Thank you for using VSCode Extension Creator!")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
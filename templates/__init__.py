@@ -0,0 +1 @@
+"""Project templates rendered by setup_vscode_extension, one directory per template."""
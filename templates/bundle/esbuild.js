@@ -0,0 +1,35 @@
+const esbuild = require('esbuild');
+
+const production = process.argv.includes('--production');
+const watch = process.argv.includes('--watch');
+
+async function main() {
+	const ctx = await esbuild.context({
+		entryPoints: {
+			extension: 'client/src/extension.ts',
+			server: 'server/src/server.ts'
+		},
+		bundle: true,
+		format: 'cjs',
+		platform: 'node',
+		target: 'node18',
+		minify: production,
+		sourcemap: !production,
+		sourcesContent: false,
+		external: ['vscode'],
+		outdir: 'dist',
+		logLevel: 'info'
+	});
+	if (watch) {
+		// Rebuilds incrementally on every change
+		await ctx.watch();
+	} else {
+		await ctx.rebuild();
+		await ctx.dispose();
+	}
+}
+
+main().catch(e => {
+	console.error(e);
+	process.exit(1);
+});
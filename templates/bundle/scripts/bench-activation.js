@@ -0,0 +1,87 @@
+// Measures language-server module load and initialize-handshake time of the unbundled (tsc)
+// and bundled (esbuild) builds. Run with: npm run bench:activation [-- --runs 20]
+const { spawn } = require('child_process');
+const fs = require('fs');
+const path = require('path');
+
+const root = path.join(__dirname, '..');
+const runsIndex = process.argv.indexOf('--runs');
+const runs = runsIndex > 0 ? Number(process.argv[runsIndex + 1]) : 10;
+const builds = {
+	unbundled: path.join(root, 'server', 'out', 'server.js'),
+	bundled: path.join(root, 'dist', 'server.js')
+};
+
+function median(values) {
+	const sorted = values.filter(value => value !== null).sort((a, b) => a - b);
+	return sorted.length ? sorted[Math.floor(sorted.length / 2)] : null;
+}
+
+function handshake(file) {
+	return new Promise((resolve, reject) => {
+		const started = process.hrtime.bigint();
+		const child = spawn(process.execPath, ['-r', path.join(__dirname, 'load-timer.js'), file, '--stdio']);
+		let loadMs = null;
+		let handshakeMs = null;
+		let buffer = Buffer.alloc(0);
+		child.stderr.on('data', chunk => {
+			const match = /LOAD_MS ([\d.]+)/.exec(chunk.toString());
+			if (match) {
+				loadMs = Number(match[1]);
+			}
+		});
+		child.stdout.on('data', chunk => {
+			buffer = Buffer.concat([buffer, chunk]);
+			for (;;) {
+				const header = buffer.indexOf('\r\n\r\n');
+				if (header < 0) {
+					return;
+				}
+				const length = Number(/Content-Length: (\d+)/i.exec(buffer.subarray(0, header).toString())[1]);
+				if (buffer.length < header + 4 + length) {
+					return;
+				}
+				const message = JSON.parse(buffer.subarray(header + 4, header + 4 + length).toString());
+				buffer = buffer.subarray(header + 4 + length);
+				if (message.id === 1) {
+					handshakeMs = Number(process.hrtime.bigint() - started) / 1e6;
+					child.kill();
+				}
+			}
+		});
+		child.on('error', reject);
+		child.on('close', () => handshakeMs === null ? reject(new Error(`${file} exited before answering initialize`)) : resolve({ loadMs, handshakeMs }));
+		const body = JSON.stringify({ jsonrpc: '2.0', id: 1, method: 'initialize', params: { processId: null, rootUri: null, capabilities: {} } });
+		child.stdin.write(`Content-Length: ${Buffer.byteLength(body)}\r\n\r\n${body}`);
+	});
+}
+
+async function main() {
+	const results = {};
+	for (const [name, file] of Object.entries(builds)) {
+		if (!fs.existsSync(file)) {
+			console.error(`${path.relative(root, file)} not found; run "npm run compile" first.`);
+			process.exit(1);
+		}
+		// The first run warms the file system cache and is not counted
+		await handshake(file);
+		const samples = [];
+		for (let i = 0; i < runs; i++) {
+			samples.push(await handshake(file));
+		}
+		results[name] = {
+			file: path.relative(root, file),
+			bytes: fs.statSync(file).size,
+			loadMs: median(samples.map(sample => sample.loadMs)),
+			handshakeMs: median(samples.map(sample => sample.handshakeMs)),
+			runs
+		};
+	}
+	console.table(results);
+	fs.writeFileSync(path.join(root, 'bench-activation.json'), JSON.stringify(results, null, 2) + '\n');
+}
+
+main().catch(e => {
+	console.error(e);
+	process.exit(1);
+});
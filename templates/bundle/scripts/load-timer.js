@@ -0,0 +1,13 @@
+// Preloaded with `node -r` by bench-activation.js: reports how long the server module took to load
+const Module = require('module');
+
+const start = process.hrtime.bigint();
+const load = Module._load;
+Module._load = function (request, parent, isMain) {
+	const result = load.apply(this, arguments);
+	if (isMain) {
+		Module._load = load;
+		process.stderr.write(`LOAD_MS ${Number(process.hrtime.bigint() - start) / 1e6}\n`);
+	}
+	return result;
+};
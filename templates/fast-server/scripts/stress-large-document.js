@@ -0,0 +1,150 @@
+// Opens a large synthetic document in the language server and types into it. After every keystroke
+// a completion request is sent; its round trip is the per-keystroke latency the user feels.
+// Run with: npm run stress [-- --lines 100000 --keystrokes 300 --interval 20 --server dist/server.js]
+const { spawn } = require('child_process');
+const fs = require('fs');
+const path = require('path');
+
+function option(name, fallback) {
+	const index = process.argv.indexOf(`--${name}`);
+	return index > 0 ? process.argv[index + 1] : fallback;
+}
+
+const root = path.join(__dirname, '..');
+const serverModule = path.resolve(root, option('server', path.join('server', 'out', 'server.js')));
+const lineCount = Number(option('lines', 100000));
+const keystrokes = Number(option('keystrokes', 300));
+const interval = Number(option('interval', 20));
+const quietMs = Number(option('quiet', 1000));
+const jsonPath = option('json', null);
+
+const child = spawn(process.execPath, [serverModule, '--stdio'], { stdio: ['pipe', 'pipe', 'inherit'] });
+const pending = new Map();
+const published = [];
+let nextId = 1;
+let buffer = Buffer.alloc(0);
+
+function send(message) {
+	const body = JSON.stringify({ jsonrpc: '2.0', ...message });
+	child.stdin.write(`Content-Length: ${Buffer.byteLength(body)}\r\n\r\n${body}`);
+}
+
+function request(method, params) {
+	const id = nextId++;
+	send({ id, method, params });
+	return new Promise(resolve => pending.set(id, resolve));
+}
+
+function notify(method, params) {
+	send({ method, params });
+}
+
+child.stdout.on('data', chunk => {
+	buffer = Buffer.concat([buffer, chunk]);
+	for (;;) {
+		const header = buffer.indexOf('\r\n\r\n');
+		if (header < 0) {
+			return;
+		}
+		const length = Number(/Content-Length: (\d+)/i.exec(buffer.subarray(0, header).toString())[1]);
+		if (buffer.length < header + 4 + length) {
+			return;
+		}
+		const message = JSON.parse(buffer.subarray(header + 4, header + 4 + length).toString());
+		buffer = buffer.subarray(header + 4 + length);
+		if (message.method === 'textDocument/publishDiagnostics') {
+			published.push({ at: performance.now(), count: message.params.diagnostics.length });
+		} else if (message.method !== undefined && message.id !== undefined) {
+			// Answer server-to-client requests such as client/registerCapability
+			send({ id: message.id, result: null });
+		} else if (pending.has(message.id)) {
+			pending.get(message.id)(message.result);
+			pending.delete(message.id);
+		}
+	}
+});
+
+function sleep(ms) {
+	return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+async function waitForQuiet(since) {
+	// Diagnostics have settled once none arrived for quietMs after typing stopped
+	while (performance.now() - Math.max(since, published[published.length - 1].at) < quietMs) {
+		await sleep(50);
+	}
+}
+
+function percentile(values, fraction) {
+	const sorted = [...values].sort((a, b) => a - b);
+	return sorted[Math.min(sorted.length - 1, Math.floor(fraction * sorted.length))];
+}
+
+function syntheticLine(i) {
+	return i % 7 === 0 ? `const value${i} = compute(${i}); // TODO check the edge case` : `let value${i} = value${i - 1} + ${i % 13};`;
+}
+
+async function main() {
+	await request('initialize', { processId: process.pid, rootUri: null, capabilities: {} });
+	notify('initialized', {});
+
+	const uri = 'file:///stress/large-document.txt';
+	const text = Array.from({ length: lineCount }, (_, i) => syntheticLine(i)).join('\n');
+	let version = 1;
+	const openedAt = performance.now();
+	notify('textDocument/didOpen', { textDocument: { uri, languageId: 'plaintext', version, text } });
+	while (published.length === 0) {
+		await sleep(5);
+	}
+	const initialMs = published[0].at - openedAt;
+	const publishedBeforeTyping = published.length;
+
+	const latencies = [];
+	for (let i = 0; i < keystrokes; i++) {
+		const line = Math.floor(Math.random() * lineCount);
+		version++;
+		const sent = performance.now();
+		notify('textDocument/didChange', {
+			textDocument: { uri, version },
+			contentChanges: [{ range: { start: { line, character: 0 }, end: { line, character: 0 } }, text: i % 10 === 0 ? 'TODO ' : 'x' }]
+		});
+		await request('textDocument/completion', { textDocument: { uri }, position: { line, character: 1 } });
+		latencies.push(performance.now() - sent);
+		await sleep(Math.max(0, interval - (performance.now() - sent)));
+	}
+	const typedAt = performance.now();
+	await waitForQuiet(typedAt);
+	const last = published[published.length - 1];
+
+	const results = {
+		server: path.relative(root, serverModule),
+		lines: lineCount,
+		keystrokes,
+		intervalMs: interval,
+		initialDiagnosticsMs: initialMs,
+		keystrokeLatencyMs: {
+			p50: percentile(latencies, 0.5),
+			p95: percentile(latencies, 0.95),
+			p99: percentile(latencies, 0.99),
+			max: Math.max(...latencies)
+		},
+		diagnosticsPublished: published.length - publishedBeforeTyping,
+		settledAfterLastKeystrokeMs: Math.max(0, last.at - typedAt),
+		finalDiagnostics: last.count
+	};
+	console.log(`${results.server}: ${lineCount} lines, ${keystrokes} keystrokes every ${interval} ms`);
+	console.log(`  initial diagnostics     ${initialMs.toFixed(1)} ms`);
+	console.log(`  keystroke latency       p50 ${results.keystrokeLatencyMs.p50.toFixed(1)} ms, p95 ${results.keystrokeLatencyMs.p95.toFixed(1)} ms, p99 ${results.keystrokeLatencyMs.p99.toFixed(1)} ms, max ${results.keystrokeLatencyMs.max.toFixed(1)} ms`);
+	console.log(`  diagnostics published   ${results.diagnosticsPublished} for ${keystrokes} edits`);
+	console.log(`  settled after typing    ${results.settledAfterLastKeystrokeMs.toFixed(1)} ms`);
+	if (jsonPath) {
+		fs.writeFileSync(jsonPath, JSON.stringify(results, null, 2) + '\n');
+	}
+	child.kill();
+}
+
+main().catch(e => {
+	console.error(e);
+	child.kill();
+	process.exit(1);
+});
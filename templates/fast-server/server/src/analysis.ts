@@ -0,0 +1,16 @@
+export interface LineProblem {
+	start: number;
+	end: number;
+	message: string;
+}
+
+// The validator reports all uppercase words of length 2 and more on a line
+export function analyzeLine(text: string): LineProblem[] {
+	const problems: LineProblem[] = [];
+	const pattern = /\b[A-Z]{2,}\b/g;
+	let m: RegExpExecArray | null;
+	while ((m = pattern.exec(text))) {
+		problems.push({ start: m.index, end: m.index + m[0].length, message: `${m[0]} is all uppercase.` });
+	}
+	return problems;
+}
@@ -0,0 +1,8 @@
+import { parentPort } from 'worker_threads';
+
+import { analyzeLine } from './analysis';
+
+// Analyzes a batch of lines sent by the WorkerPool and posts back the problems of each line
+parentPort!.on('message', (lines: string[]) => {
+	parentPort!.postMessage(lines.map(analyzeLine));
+});
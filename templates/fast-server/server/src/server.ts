@@ -0,0 +1,247 @@
+import * as path from 'path';
+import {
+	createConnection,
+	TextDocuments,
+	Diagnostic,
+	DiagnosticSeverity,
+	ProposedFeatures,
+	InitializeParams,
+	DidChangeConfigurationNotification,
+	CompletionItem,
+	CompletionItemKind,
+	TextDocumentPositionParams,
+	TextDocumentSyncKind,
+	InitializeResult
+} from 'vscode-languageserver/node';
+
+import {
+	TextDocument
+} from 'vscode-languageserver-textdocument';
+
+import { analyzeLine, LineProblem } from './analysis';
+import { WorkerPool } from './workerPool';
+
+// Documents with fewer uncached lines than this are analyzed inline; larger batches go to the
+// worker pool in chunks of this many lines.
+const INLINE_LINES = 2000;
+
+// Create a connection for the server, using Node's IPC as a transport.
+// Also include all preview / proposed LSP features.
+const connection = createConnection(ProposedFeatures.all);
+
+// The client sends only the changed ranges; TextDocuments applies them in place.
+const documents: TextDocuments<TextDocument> = new TextDocuments(TextDocument);
+
+// Heavy analysis runs here so this thread stays free to answer requests while the user types.
+const pool = new WorkerPool(path.join(__dirname, 'analysisWorker.js'));
+
+let hasConfigurationCapability = false;
+let hasWorkspaceFolderCapability = false;
+
+connection.onInitialize((params: InitializeParams) => {
+	const capabilities = params.capabilities;
+
+	hasConfigurationCapability = !!(
+		capabilities.workspace && !!capabilities.workspace.configuration
+	);
+	hasWorkspaceFolderCapability = !!(
+		capabilities.workspace && !!capabilities.workspace.workspaceFolders
+	);
+
+	const result: InitializeResult = {
+		capabilities: {
+			textDocumentSync: TextDocumentSyncKind.Incremental,
+			completionProvider: {
+				resolveProvider: true
+			}
+		}
+	};
+	if (hasWorkspaceFolderCapability) {
+		result.capabilities.workspace = {
+			workspaceFolders: {
+				supported: true
+			}
+		};
+	}
+	return result;
+});
+
+connection.onInitialized(() => {
+	if (hasConfigurationCapability) {
+		connection.client.register(DidChangeConfigurationNotification.type, undefined);
+	}
+});
+
+// The settings of this extension
+interface ExtensionSettings {
+	maxNumberOfProblems: number;
+	validationDelay: number;
+}
+
+const defaultSettings: ExtensionSettings = { maxNumberOfProblems: 1000, validationDelay: 150 };
+let globalSettings: ExtensionSettings = defaultSettings;
+
+const documentSettings: Map<string, Thenable<ExtensionSettings>> = new Map();
+
+function getDocumentSettings(resource: string): Thenable<ExtensionSettings> {
+	if (!hasConfigurationCapability) {
+		return Promise.resolve(globalSettings);
+	}
+	let result = documentSettings.get(resource);
+	if (!result) {
+		result = connection.workspace.getConfiguration({
+			scopeUri: resource,
+			section: '__EXTENSION_IDENTIFIER__'
+		}).then(settings => ({ ...defaultSettings, ...settings }));
+		documentSettings.set(resource, result);
+	}
+	return result;
+}
+
+// Per-document validation state
+interface DocumentState {
+	// Latest version seen; a validation of an older version is abandoned
+	version: number;
+	// Pending debounced validation
+	timer?: NodeJS.Timeout;
+	// Parse cache: analysis results by line text, limited to lines still in the document
+	lines: Map<string, LineProblem[]>;
+}
+
+const states: Map<string, DocumentState> = new Map();
+
+function scheduleValidation(uri: string, version: number): void {
+	let state = states.get(uri);
+	if (!state) {
+		state = { version, lines: new Map() };
+		states.set(uri, state);
+	}
+	state.version = version;
+	if (state.timer) {
+		clearTimeout(state.timer);
+	}
+	const scheduled = state;
+	getDocumentSettings(uri).then(settings => {
+		if (scheduled.version !== version) {
+			return;
+		}
+		scheduled.timer = setTimeout(() => {
+			scheduled.timer = undefined;
+			const document = documents.get(uri);
+			if (document && document.version === version) {
+				validateTextDocument(document, scheduled, settings).catch(error => connection.console.error(String(error)));
+			}
+		}, settings.validationDelay);
+	});
+}
+
+connection.onDidChangeConfiguration(change => {
+	if (hasConfigurationCapability) {
+		documentSettings.clear();
+	} else {
+		globalSettings = { ...defaultSettings, ...(change.settings['__EXTENSION_IDENTIFIER__'] || {}) };
+	}
+	documents.all().forEach(document => scheduleValidation(document.uri, document.version));
+});
+
+documents.onDidClose(e => {
+	const state = states.get(e.document.uri);
+	if (state && state.timer) {
+		clearTimeout(state.timer);
+	}
+	states.delete(e.document.uri);
+	documentSettings.delete(e.document.uri);
+	connection.sendDiagnostics({ uri: e.document.uri, diagnostics: [] });
+});
+
+// Emitted when a document is opened or changed; every keystroke only restarts the debounce timer.
+documents.onDidChangeContent(change => {
+	scheduleValidation(change.document.uri, change.document.version);
+});
+
+async function validateTextDocument(textDocument: TextDocument, state: DocumentState, settings: ExtensionSettings): Promise<void> {
+	const version = textDocument.version;
+	const lines = textDocument.getText().split(/\r?\n/);
+
+	// Only lines whose text was not analyzed before need work
+	const missing = [...new Set(lines.filter(line => !state.lines.has(line)))];
+	const fresh: Map<string, LineProblem[]> = new Map();
+	if (missing.length < INLINE_LINES) {
+		missing.forEach(line => fresh.set(line, analyzeLine(line)));
+	} else {
+		const chunks: string[][] = [];
+		for (let i = 0; i < missing.length; i += INLINE_LINES) {
+			chunks.push(missing.slice(i, i + INLINE_LINES));
+		}
+		const results = await Promise.all(chunks.map(chunk => pool.run(chunk, () => state.version !== version)));
+		if (state.version !== version) {
+			// A newer edit arrived while the workers were busy; its own validation is already scheduled
+			return;
+		}
+		results.forEach((problems, c) => problems!.forEach((lineProblems, i) => fresh.set(chunks[c][i], lineProblems)));
+	}
+
+	const cache: Map<string, LineProblem[]> = new Map();
+	const diagnostics: Diagnostic[] = [];
+	lines.forEach((text, line) => {
+		const problems = state.lines.get(text) || fresh.get(text)!;
+		cache.set(text, problems);
+		for (const problem of problems) {
+			if (diagnostics.length >= settings.maxNumberOfProblems) {
+				break;
+			}
+			diagnostics.push({
+				severity: DiagnosticSeverity.Warning,
+				range: {
+					start: { line, character: problem.start },
+					end: { line, character: problem.end }
+				},
+				message: problem.message,
+				source: '__EXTENSION_IDENTIFIER__'
+			});
+		}
+	});
+	state.lines = cache;
+
+	connection.sendDiagnostics({ uri: textDocument.uri, version, diagnostics });
+}
+
+// This handler provides the initial list of the completion items.
+connection.onCompletion(
+	(_textDocumentPosition: TextDocumentPositionParams): CompletionItem[] => {
+		return [
+			{
+				label: 'TypeScript',
+				kind: CompletionItemKind.Text,
+				data: 1
+			},
+			{
+				label: 'JavaScript',
+				kind: CompletionItemKind.Text,
+				data: 2
+			}
+		];
+	}
+);
+
+// This handler resolves additional information for the item selected in
+// the completion list.
+connection.onCompletionResolve(
+	(item: CompletionItem): CompletionItem => {
+		if (item.data === 1) {
+			item.detail = 'TypeScript details';
+			item.documentation = 'TypeScript documentation';
+		} else if (item.data === 2) {
+			item.detail = 'JavaScript details';
+			item.documentation = 'JavaScript documentation';
+		}
+		return item;
+	}
+);
+
+// Make the text document manager listen on the connection
+// for open, change and close text document events
+documents.listen(connection);
+
+// Listen on the connection
+connection.listen();
@@ -0,0 +1,67 @@
+import * as os from 'os';
+import { Worker } from 'worker_threads';
+
+import { LineProblem } from './analysis';
+
+interface Job {
+	lines: string[];
+	isCancelled: () => boolean;
+	resolve: (problems: LineProblem[][] | null) => void;
+	reject: (error: Error) => void;
+}
+
+// A fixed set of analysis workers fed from one queue. Jobs whose document changed before a worker
+// picked them up resolve to null without running.
+export class WorkerPool {
+	private idle: Worker[] = [];
+	private queue: Job[] = [];
+	private running: Map<Worker, Job> = new Map();
+
+	constructor(private script: string, size = Math.max(1, os.cpus().length - 1)) {
+		for (let i = 0; i < size; i++) {
+			this.idle.push(this.spawn());
+		}
+	}
+
+	run(lines: string[], isCancelled: () => boolean): Promise<LineProblem[][] | null> {
+		return new Promise((resolve, reject) => {
+			this.queue.push({ lines, isCancelled, resolve, reject });
+			this.dispatch();
+		});
+	}
+
+	private spawn(): Worker {
+		const worker = new Worker(this.script);
+		// Idle workers must not keep the server process alive
+		worker.unref();
+		worker.on('message', (problems: LineProblem[][]) => {
+			const job = this.running.get(worker);
+			this.running.delete(worker);
+			this.idle.push(worker);
+			job?.resolve(problems);
+			this.dispatch();
+		});
+		worker.on('error', error => {
+			// A worker that threw is gone; replace it
+			const job = this.running.get(worker);
+			this.running.delete(worker);
+			this.idle.push(this.spawn());
+			job?.reject(error);
+			this.dispatch();
+		});
+		return worker;
+	}
+
+	private dispatch(): void {
+		while (this.idle.length && this.queue.length) {
+			const job = this.queue.shift()!;
+			if (job.isCancelled()) {
+				job.resolve(null);
+				continue;
+			}
+			const worker = this.idle.pop()!;
+			this.running.set(worker, job);
+			worker.postMessage(job.lines);
+		}
+	}
+}
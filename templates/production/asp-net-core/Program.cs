@@ -0,0 +1,27 @@
+using System.IO.Compression;
+using Microsoft.AspNetCore.ResponseCompression;
+
+// Start with enough pool threads for blocking work on every core instead of ramping up slowly
+ThreadPool.GetMinThreads(out _, out var completionPortThreads);
+ThreadPool.SetMinThreads(Environment.ProcessorCount * 4, completionPortThreads);
+
+var builder = WebApplication.CreateBuilder(args);
+// Listen on every interface on PORT, 8080 by default
+builder.WebHost.UseUrls($"http://0.0.0.0:{Environment.GetEnvironmentVariable("PORT") ?? "8080"}");
+builder.Services.AddResponseCompression(options =>
+{
+    options.EnableForHttps = true;
+    options.Providers.Add<BrotliCompressionProvider>();
+    options.Providers.Add<GzipCompressionProvider>();
+});
+builder.Services.Configure<BrotliCompressionProviderOptions>(options => options.Level = CompressionLevel.Fastest);
+builder.Services.Configure<GzipCompressionProviderOptions>(options => options.Level = CompressionLevel.Fastest);
+builder.Services.AddHealthChecks();
+
+var app = builder.Build();
+app.UseResponseCompression();
+
+app.MapGet("/", () => "Hello, ASP.NET Core server!");
+app.MapHealthChecks("/healthz");
+
+app.Run();
@@ -0,0 +1,16 @@
+from django.http import HttpResponse, JsonResponse
+from django.urls import path
+
+
+def hello(request):
+    return HttpResponse("Hello, Django server!")
+
+
+def healthz(request):
+    return JsonResponse({"status": "ok"})
+
+
+urlpatterns = [
+    path('', hello, name='hello'),
+    path('healthz', healthz, name='healthz'),
+]
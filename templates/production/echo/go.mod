@@ -0,0 +1,10 @@
+module server
+
+go 1.22
+
+// Run `go mod tidy` once to resolve indirect dependencies
+require (
+	github.com/labstack/echo/v4 v4.12.0
+	go.uber.org/automaxprocs v1.6.0
+	golang.org/x/net v0.30.0
+)
@@ -0,0 +1,24 @@
+import express from 'express';
+import compression from 'compression';
+
+const port = Number(process.env.PORT) || 3000;
+const app = express();
+app.disable('x-powered-by');
+app.use(compression());
+
+app.get('/', (req, res) => {
+  res.send('Hello, Express server!');
+});
+
+app.get('/healthz', (req, res) => {
+  res.json({ status: 'ok' });
+});
+
+const server = app.listen(port, () => {
+  console.log(`Worker ${process.pid} listening on http://localhost:${port}/`);
+});
+// Longer than a typical load balancer idle timeout (60 s), so the balancer closes idle connections first
+server.keepAliveTimeout = 65000;
+server.headersTimeout = 66000;
+server.requestTimeout = 30000;
+server.maxConnections = Number(process.env.MAX_CONNECTIONS) || 10000;
@@ -0,0 +1,23 @@
+# Gunicorn settings for production; the environment overrides the defaults
+import multiprocessing
+import os
+
+bind = "0.0.0.0:" + os.environ.get("PORT", "8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.ProductionUvicornWorker"
+# Simultaneous clients: the cap of each async worker, or shared out as threads among gthread workers
+max_connections = int(os.environ.get("MAX_CONNECTIONS", 1000))
+worker_connections = max_connections
+# Each Uvicorn worker is one event loop, so THREADS does not apply
+# The listen queue in front of the workers
+backlog = 2048
+# Longer than a typical load balancer idle timeout (60 s), so the balancer closes idle connections first
+keepalive = 65
+timeout = 30
+graceful_timeout = 30
+# Recycle workers to bound memory growth; the jitter keeps them from restarting all at once
+max_requests = 10000
+max_requests_jitter = 1000
+# Import the app once in the master so workers share its memory copy-on-write
+preload_app = True
+accesslog = "-"
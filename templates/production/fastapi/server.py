@@ -0,0 +1,18 @@
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+
+app = FastAPI()
+# Compresses responses of 1 KB and more for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+
+@app.get("/")
+async def root():
+    return {"message": "Hello, FastAPI server!"}
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+# Run with: gunicorn -c gunicorn.conf.py server:app
@@ -0,0 +1,9 @@
+import os
+
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionUvicornWorker(UvicornWorker):
+    """Uvicorn worker on uvloop and httptools with a cap on concurrent connections (MAX_CONNECTIONS)."""
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools",
+                     "limit_concurrency": int(os.environ.get("MAX_CONNECTIONS", 1000)), "backlog": 2048}
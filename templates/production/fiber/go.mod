@@ -0,0 +1,9 @@
+module server
+
+go 1.22
+
+// Run `go mod tidy` once to resolve indirect dependencies
+require (
+	github.com/gofiber/fiber/v2 v2.52.5
+	go.uber.org/automaxprocs v1.6.0
+)
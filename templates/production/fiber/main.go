@@ -0,0 +1,46 @@
+package main
+
+import (
+	"log"
+	"os"
+	"strconv"
+	"time"
+
+	"github.com/gofiber/fiber/v2"
+	"github.com/gofiber/fiber/v2/middleware/compress"
+	// Sets GOMAXPROCS to the container CPU quota instead of the host's core count
+	_ "go.uber.org/automaxprocs"
+)
+
+func main() {
+	maxConnections, err := strconv.Atoi(getenv("MAX_CONNECTIONS", "10000"))
+	if err != nil {
+		log.Fatal(err)
+	}
+	app := fiber.New(fiber.Config{
+		// One process per core (GOMAXPROCS), all accepting on the same port with SO_REUSEPORT
+		Prefork:      true,
+		Concurrency:  maxConnections,
+		ReadTimeout:  30 * time.Second,
+		WriteTimeout: 30 * time.Second,
+		// Longer than a typical load balancer idle timeout (60 s), so the balancer closes idle connections first
+		IdleTimeout: 65 * time.Second,
+	})
+	app.Use(compress.New(compress.Config{Level: compress.LevelBestSpeed}))
+
+	app.Get("/", func(c *fiber.Ctx) error {
+		return c.SendString("Hello, Fiber server!")
+	})
+	app.Get("/healthz", func(c *fiber.Ctx) error {
+		return c.JSON(fiber.Map{"status": "ok"})
+	})
+
+	log.Fatal(app.Listen(":" + getenv("PORT", "3000")))
+}
+
+func getenv(key, fallback string) string {
+	if value := os.Getenv(key); value != "" {
+		return value
+	}
+	return fallback
+}
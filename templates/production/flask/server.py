@@ -0,0 +1,18 @@
+from flask import Flask, jsonify
+from flask_compress import Compress
+
+app = Flask(__name__)
+# Compresses responses for clients that accept gzip or brotli
+Compress(app)
+
+
+@app.route('/')
+def hello():
+    return 'Hello, Flask server!'
+
+
+@app.route('/healthz')
+def healthz():
+    return jsonify(status='ok')
+
+# Run with: gunicorn -c gunicorn.conf.py server:app
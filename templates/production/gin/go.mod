@@ -0,0 +1,11 @@
+module server
+
+go 1.22
+
+// Run `go mod tidy` once to resolve indirect dependencies
+require (
+	github.com/gin-contrib/gzip v1.0.1
+	github.com/gin-gonic/gin v1.10.0
+	go.uber.org/automaxprocs v1.6.0
+	golang.org/x/net v0.30.0
+)
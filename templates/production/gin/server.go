@@ -0,0 +1,61 @@
+package main
+
+import (
+	"context"
+	"errors"
+	"log"
+	"net"
+	"net/http"
+	"os"
+	"os/signal"
+	"strconv"
+	"syscall"
+	"time"
+
+	// Sets GOMAXPROCS to the container CPU quota instead of the host's core count
+	_ "go.uber.org/automaxprocs"
+	"golang.org/x/net/netutil"
+)
+
+// serve runs handler with production timeouts and a connection cap, and drains in-flight
+// requests on SIGINT or SIGTERM.
+func serve(handler http.Handler) {
+	srv := &http.Server{
+		Handler:           handler,
+		ReadHeaderTimeout: 10 * time.Second,
+		ReadTimeout:       30 * time.Second,
+		WriteTimeout:      30 * time.Second,
+		// Longer than a typical load balancer idle timeout (60 s), so the balancer closes idle connections first
+		IdleTimeout:    65 * time.Second,
+		MaxHeaderBytes: 1 << 20,
+	}
+	ln, err := net.Listen("tcp", ":"+getenv("PORT", "8080"))
+	if err != nil {
+		log.Fatal(err)
+	}
+	maxConnections, err := strconv.Atoi(getenv("MAX_CONNECTIONS", "10000"))
+	if err != nil {
+		log.Fatal(err)
+	}
+	go func() {
+		if err := srv.Serve(netutil.LimitListener(ln, maxConnections)); !errors.Is(err, http.ErrServerClosed) {
+			log.Fatal(err)
+		}
+	}()
+
+	ctx, stop := signal.NotifyContext(context.Background(), syscall.SIGINT, syscall.SIGTERM)
+	defer stop()
+	<-ctx.Done()
+	shutdownCtx, cancel := context.WithTimeout(context.Background(), 30*time.Second)
+	defer cancel()
+	if err := srv.Shutdown(shutdownCtx); err != nil {
+		log.Fatal(err)
+	}
+}
+
+func getenv(key, fallback string) string {
+	if value := os.Getenv(key); value != "" {
+		return value
+	}
+	return fallback
+}
@@ -0,0 +1,31 @@
+import Hapi from '@hapi/hapi';
+
+// hapi compresses responses with gzip or deflate when the client accepts them
+const server = Hapi.server({
+  port: Number(process.env.PORT) || 3000,
+  host: '0.0.0.0',
+  compression: { minBytes: 1024 }
+});
+
+server.route([
+  {
+    method: 'GET',
+    path: '/',
+    handler: () => 'Hello, Hapi server!'
+  },
+  {
+    method: 'GET',
+    path: '/healthz',
+    handler: () => ({ status: 'ok' })
+  }
+]);
+
+// Longer than a typical load balancer idle timeout (60 s), so the balancer closes idle connections first
+server.listener.keepAliveTimeout = 65000;
+server.listener.headersTimeout = 66000;
+server.listener.requestTimeout = 30000;
+server.listener.maxConnections = Number(process.env.MAX_CONNECTIONS) || 10000;
+
+server.start().then(() => {
+  console.log(`Worker ${process.pid} listening on ${server.info.uri}`);
+});
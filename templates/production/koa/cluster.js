@@ -0,0 +1,26 @@
+// Starts one server process per core and replaces workers that exit.
+// WEB_CONCURRENCY overrides the worker count.
+import cluster from 'node:cluster';
+import os from 'node:os';
+
+const workers = Number(process.env.WEB_CONCURRENCY) || os.availableParallelism();
+
+if (cluster.isPrimary) {
+  for (let i = 0; i < workers; i++) {
+    cluster.fork();
+  }
+  cluster.on('exit', (worker, code, signal) => {
+    if (!worker.exitedAfterDisconnect) {
+      console.error(`Worker ${worker.process.pid} exited (${signal || code}), starting a new one`);
+      cluster.fork();
+    }
+  });
+  // Workers stop accepting connections and finish in-flight requests before exiting
+  process.on('SIGTERM', () => {
+    for (const worker of Object.values(cluster.workers ?? {})) {
+      worker?.disconnect();
+    }
+  });
+} else {
+  import('./server.js');
+}
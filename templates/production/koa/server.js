@@ -0,0 +1,23 @@
+import Koa from 'koa';
+import compress from 'koa-compress';
+
+const port = Number(process.env.PORT) || 3000;
+const app = new Koa();
+app.use(compress());
+
+app.use(async ctx => {
+  if (ctx.path === '/healthz') {
+    ctx.body = { status: 'ok' };
+    return;
+  }
+  ctx.body = 'Hello, Koa server!';
+});
+
+const server = app.listen(port, () => {
+  console.log(`Worker ${process.pid} listening on http://localhost:${port}/`);
+});
+// Longer than a typical load balancer idle timeout (60 s), so the balancer closes idle connections first
+server.keepAliveTimeout = 65000;
+server.headersTimeout = 66000;
+server.requestTimeout = 30000;
+server.maxConnections = Number(process.env.MAX_CONNECTIONS) || 10000;
@@ -0,0 +1,13 @@
+<?php
+
+// Merge into an application created with `composer create-project laravel/laravel`
+
+use Illuminate\Support\Facades\Route;
+
+Route::get('/', function () {
+    return 'Hello, Laravel server!';
+});
+
+Route::get('/healthz', function () {
+    return response()->json(['status' => 'ok']);
+});
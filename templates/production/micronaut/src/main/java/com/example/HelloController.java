@@ -0,0 +1,19 @@
+package com.example;
+
+import io.micronaut.http.MediaType;
+import io.micronaut.http.annotation.Controller;
+import io.micronaut.http.annotation.Get;
+
+@Controller("/")
+public class HelloController {
+
+    @Get(produces = MediaType.TEXT_PLAIN)
+    public String index() {
+        return "Hello, Micronaut server!";
+    }
+
+    @Get(uri = "/healthz", produces = MediaType.APPLICATION_JSON)
+    public String healthz() {
+        return "{\"status\":\"ok\"}";
+    }
+}
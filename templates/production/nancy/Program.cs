@@ -0,0 +1,37 @@
+using System.IO.Compression;
+using Microsoft.AspNetCore.ResponseCompression;
+using Nancy;
+using Nancy.Owin;
+
+// Start with enough pool threads for blocking work on every core instead of ramping up slowly
+ThreadPool.GetMinThreads(out _, out var completionPortThreads);
+ThreadPool.SetMinThreads(Environment.ProcessorCount * 4, completionPortThreads);
+
+var builder = WebApplication.CreateBuilder(args);
+// Listen on every interface on PORT, 8080 by default
+builder.WebHost.UseUrls($"http://0.0.0.0:{Environment.GetEnvironmentVariable("PORT") ?? "8080"}");
+builder.Services.AddResponseCompression(options =>
+{
+    options.EnableForHttps = true;
+    options.Providers.Add<BrotliCompressionProvider>();
+    options.Providers.Add<GzipCompressionProvider>();
+});
+builder.Services.Configure<BrotliCompressionProviderOptions>(options => options.Level = CompressionLevel.Fastest);
+builder.Services.Configure<GzipCompressionProviderOptions>(options => options.Level = CompressionLevel.Fastest);
+// Nancy writes responses synchronously
+builder.WebHost.ConfigureKestrel(options => options.AllowSynchronousIO = true);
+
+var app = builder.Build();
+app.UseResponseCompression();
+app.UseOwin(pipeline => pipeline.UseNancy());
+
+app.Run();
+
+public class HelloModule : NancyModule
+{
+    public HelloModule()
+    {
+        Get("/", _ => "Hello, Nancy server!");
+        Get("/healthz", _ => Response.AsJson(new { status = "ok" }));
+    }
+}
@@ -0,0 +1,18 @@
+import { NestFactory } from '@nestjs/core';
+import compression from 'compression';
+import { AppModule } from './app.module';
+
+async function bootstrap() {
+  const app = await NestFactory.create(AppModule);
+  app.use(compression());
+  app.enableShutdownHooks();
+  await app.listen(Number(process.env.PORT) || 3000);
+
+  const server = app.getHttpServer();
+  // Longer than a typical load balancer idle timeout (60 s), so the balancer closes idle connections first
+  server.keepAliveTimeout = 65000;
+  server.headersTimeout = 66000;
+  server.requestTimeout = 30000;
+  server.maxConnections = Number(process.env.MAX_CONNECTIONS) || 10000;
+}
+bootstrap();
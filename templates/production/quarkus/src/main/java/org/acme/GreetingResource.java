@@ -0,0 +1,25 @@
+package org.acme;
+
+import java.util.Map;
+
+import jakarta.ws.rs.GET;
+import jakarta.ws.rs.Path;
+import jakarta.ws.rs.Produces;
+import jakarta.ws.rs.core.MediaType;
+
+@Path("/")
+public class GreetingResource {
+
+    @GET
+    @Produces(MediaType.TEXT_PLAIN)
+    public String hello() {
+        return "Hello, Quarkus server!";
+    }
+
+    @GET
+    @Path("healthz")
+    @Produces(MediaType.APPLICATION_JSON)
+    public Map<String, String> healthz() {
+        return Map.of("status", "ok");
+    }
+}
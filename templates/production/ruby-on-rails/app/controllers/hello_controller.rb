@@ -0,0 +1,5 @@
+class HelloController < ApplicationController
+  def index
+    render plain: "Hello, Ruby on Rails server!"
+  end
+end
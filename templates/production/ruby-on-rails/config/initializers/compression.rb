@@ -0,0 +1,2 @@
+# Compresses responses for clients that accept gzip
+Rails.application.config.middleware.use Rack::Deflater
@@ -0,0 +1,5 @@
+# Merge into an application created with `rails new`
+Rails.application.routes.draw do
+  root "hello#index"
+  get "healthz" => "rails/health#show"
+end
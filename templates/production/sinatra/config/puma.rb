@@ -0,0 +1,16 @@
+# Puma settings for production; the environment overrides the defaults
+require "etc"
+
+# One worker process per core, each serving requests on a small thread pool
+workers Integer(ENV.fetch("WEB_CONCURRENCY") { Etc.nprocessors })
+max_threads = Integer(ENV.fetch("MAX_THREADS", 5))
+threads max_threads, max_threads
+# Load the app before forking so workers share its memory copy-on-write
+preload_app!
+
+# The listen queue in front of the workers
+bind "tcp://0.0.0.0:#{ENV.fetch("PORT", 3000)}?backlog=1024"
+# Longer than a typical load balancer idle timeout (60 s), so the balancer closes idle connections first
+persistent_timeout 65
+first_data_timeout 30
+environment ENV.fetch("RACK_ENV", "production")
@@ -0,0 +1,16 @@
+require "sinatra/base"
+require "json"
+
+class Server < Sinatra::Base
+  # Compresses responses for clients that accept gzip
+  use Rack::Deflater
+
+  get "/" do
+    "Hello, Sinatra server!"
+  end
+
+  get "/healthz" do
+    content_type :json
+    { status: "ok" }.to_json
+  end
+end
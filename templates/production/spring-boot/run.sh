@@ -0,0 +1,3 @@
+#!/bin/sh
+# JAVA_OPTS adds to or overrides these settings
+exec java -XX:+UseG1GC -XX:MaxRAMPercentage=75 -XX:+ExitOnOutOfMemoryError $JAVA_OPTS -jar target/server-1.0.0.jar "$@"
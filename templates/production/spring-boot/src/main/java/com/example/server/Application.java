@@ -0,0 +1,27 @@
+package com.example.server;
+
+import java.util.Map;
+
+import org.springframework.boot.SpringApplication;
+import org.springframework.boot.autoconfigure.SpringBootApplication;
+import org.springframework.web.bind.annotation.GetMapping;
+import org.springframework.web.bind.annotation.RestController;
+
+@SpringBootApplication
+@RestController
+public class Application {
+
+    @GetMapping("/")
+    public String hello() {
+        return "Hello, Spring Boot server!";
+    }
+
+    @GetMapping("/healthz")
+    public Map<String, String> healthz() {
+        return Map.of("status", "ok");
+    }
+
+    public static void main(String[] args) {
+        SpringApplication.run(Application.class, args);
+    }
+}
@@ -0,0 +1,24 @@
+<?php
+
+// Merge into an application created with `composer create-project symfony/skeleton`
+
+namespace App\Controller;
+
+use Symfony\Component\HttpFoundation\JsonResponse;
+use Symfony\Component\HttpFoundation\Response;
+use Symfony\Component\Routing\Attribute\Route;
+
+class HelloController
+{
+    #[Route('/')]
+    public function index(): Response
+    {
+        return new Response('Hello, Symfony server!');
+    }
+
+    #[Route('/healthz')]
+    public function healthz(): JsonResponse
+    {
+        return new JsonResponse(['status' => 'ok']);
+    }
+}
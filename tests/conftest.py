@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Keep the cache, locks and journals of the module under test out of the user's home directory;
+# CACHE_DIR and the paths derived from it are read once at import time
+os.environ["VSCODE_EXT_CREATOR_CACHE"] = tempfile.mkdtemp(prefix="vscode-extension-creator-tests-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
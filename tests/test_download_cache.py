@@ -0,0 +1,53 @@
+import hashlib
+
+import pytest
+
+import setup_vscode_extension as creator
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(creator, "DOWNLOAD_CACHE_DIR", str(tmp_path / "downloads"))
+    monkeypatch.setattr(creator, "DOWNLOAD_MIRROR", None)
+    monkeypatch.setattr(creator, "ARTIFACT_PINS_FILE", None)
+    monkeypatch.setattr(creator, "ALLOW_UNPINNED_ARTIFACTS", False)
+    path = tmp_path / "sdk-1.0.tar.gz"
+    path.write_bytes(b"archive contents" * 1000)
+    return path.as_uri(), hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_digest_mismatch_is_rejected_and_not_cached(archive):
+    url, _ = archive
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        creator.fetch_artifact(url, "0" * 64)
+    assert url not in creator._load_download_index()
+
+
+def test_matching_download_is_cached_and_reused(archive, capsys):
+    url, sha256 = archive
+    path = creator.fetch_artifact(url, sha256)
+    assert creator._sha256_of_file(path) == sha256
+    assert creator._load_download_index()[url]["sha256"] == sha256
+    assert creator.fetch_artifact(url, sha256) == path
+    assert "Using cached" in capsys.readouterr().out
+
+
+def test_corrupt_cache_entry_is_downloaded_again(archive):
+    url, sha256 = archive
+    path = creator.fetch_artifact(url, sha256)
+    with open(path, "ab") as file:
+        file.write(b"corruption")
+    assert creator._sha256_of_file(creator.fetch_artifact(url, sha256)) == sha256
+
+
+def test_unpinned_archive_is_refused_unless_allowed(archive, monkeypatch, tmp_path):
+    url, sha256 = archive
+    with pytest.raises(RuntimeError, match="No SHA-256 is pinned"):
+        creator.fetch_artifact(url)
+    pins = tmp_path / "pins.json"
+    pins.write_text(f'{{"{url}": "{sha256}"}}')
+    monkeypatch.setattr(creator, "ARTIFACT_PINS_FILE", str(pins))
+    assert creator._sha256_of_file(creator.fetch_artifact(url)) == sha256
+    monkeypatch.setattr(creator, "ARTIFACT_PINS_FILE", None)
+    monkeypatch.setattr(creator, "ALLOW_UNPINNED_ARTIFACTS", True)
+    assert creator._sha256_of_file(creator.fetch_artifact(url)) == sha256
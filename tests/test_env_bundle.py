@@ -0,0 +1,74 @@
+import io
+import tarfile
+
+import pytest
+
+import setup_vscode_extension as creator
+
+
+def make_archive(entries):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, kind, linkname in entries:
+            info = tarfile.TarInfo(name)
+            info.type = kind
+            info.linkname = linkname or ""
+            tar.addfile(info, io.BytesIO(b"") if kind == tarfile.REGTYPE else None)
+    buffer.seek(0)
+    return tarfile.open(fileobj=buffer)
+
+
+def test_contained_entries_are_accepted(tmp_path):
+    archive = make_archive([("bin/node", tarfile.REGTYPE, None),
+                            ("bin/npm", tarfile.SYMTYPE, "../lib/node_modules/npm/bin/npm-cli.js"),
+                            ("lib/node", tarfile.LNKTYPE, "bin/node")])
+    creator._check_tar_members(archive, str(tmp_path / "node.partial"))
+
+
+@pytest.mark.parametrize("entries, message", [
+    ([("../escape", tarfile.REGTYPE, None)], "outside the extraction directory"),
+    ([("/etc/passwd", tarfile.REGTYPE, None)], "outside the extraction directory"),
+    ([("bin/../../escape", tarfile.REGTYPE, None)], "outside the extraction directory"),
+    ([("lib", tarfile.SYMTYPE, "../../etc")], "links outside"),
+    ([("lib", tarfile.SYMTYPE, "/usr/share/java")], "links outside"),
+    ([("lib", tarfile.LNKTYPE, "../outside")], "links outside"),
+    ([("dev/null", tarfile.CHRTYPE, None)], "device file"),
+])
+def test_escaping_entries_are_rejected(tmp_path, entries, message):
+    with pytest.raises(ValueError, match=message):
+        creator._check_tar_members(make_archive(entries), str(tmp_path / "node.partial"))
+
+
+@pytest.mark.parametrize("has_filter", [True, False])
+def test_unpack_rejects_absolute_symlinks_with_or_without_the_filter(tmp_path, monkeypatch, has_filter):
+    if not has_filter:
+        monkeypatch.delattr(tarfile, "tar_filter", raising=False)
+    elif not hasattr(tarfile, "tar_filter"):
+        pytest.skip("tarfile has no extraction filters")
+    archive_path = tmp_path / "maven.tar.gz"
+    with tarfile.open(archive_path, "w:gz") as tar:
+        info = tarfile.TarInfo("lib")
+        info.type, info.linkname = tarfile.SYMTYPE, "/usr/share/java"
+        tar.addfile(info)
+    with pytest.raises(ValueError, match="links outside"):
+        creator._unpack_component(str(archive_path), str(tmp_path / "maven"))
+    assert not (tmp_path / "maven").exists()
+
+
+def test_toolchain_root_refuses_roots_linking_outside(tmp_path, monkeypatch):
+    monkeypatch.setattr(creator, "_owned_by_package_manager", lambda root: False)
+    (tmp_path / "maven" / "bin").mkdir(parents=True)
+    (tmp_path / "maven" / "bin" / "mvn").write_text("")
+    (tmp_path / "maven" / "boot").symlink_to("bin")
+    root = str((tmp_path / "maven").resolve())
+    assert creator._toolchain_root(str(tmp_path / "maven" / "bin" / "mvn")) == (root, "bin")
+    (tmp_path / "maven" / "lib").symlink_to("/usr/share/java")
+    with pytest.raises(RuntimeError, match=r"lib -> /usr/share/java"):
+        creator._toolchain_root(str(tmp_path / "maven" / "bin" / "mvn"))
+
+
+def test_package_managed_roots_are_system_prefixes(monkeypatch):
+    monkeypatch.setattr(creator.shutil, "which", lambda name: None)
+    assert creator._owned_by_package_manager("/opt/homebrew/Cellar/maven/3.9.6/libexec")
+    assert not creator._owned_by_package_manager("/usr/lib/go-1.22")
+    assert not creator._owned_by_package_manager("/opt/maven")
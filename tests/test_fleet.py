@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+
+import pytest
+
+import setup_vscode_extension as creator
+
+
+@pytest.fixture
+def inventory(tmp_path, monkeypatch):
+    monkeypatch.setattr(creator, "FLEET_DIR", str(tmp_path / "fleet"))
+    targets = [
+        {"name": "alpha", "transport": "local", "root": str(tmp_path / "alpha"), "python": sys.executable},
+        {"name": "beta", "transport": "local", "root": str(tmp_path / "beta"), "python": sys.executable},
+        {"name": "broken", "transport": "local", "root": str(tmp_path / "broken"), "python": str(tmp_path / "no-python")},
+    ]
+    path = tmp_path / "inventory.json"
+    path.write_text(json.dumps({"plan": ["python"], "targets": targets}))
+    return str(path)
+
+
+def last_report(fleet_dir):
+    reports = sorted(name for name in os.listdir(fleet_dir) if name.startswith("run-"))
+    with open(os.path.join(fleet_dir, reports[-1])) as file:
+        return {target["name"]: target for target in json.load(file)["targets"]}
+
+
+def test_local_targets_are_checked_and_skipped_once_up_to_date(inventory, tmp_path):
+    assert creator.run_fleet(inventory) == 1
+    report = last_report(creator.FLEET_DIR)
+    assert report["alpha"]["status"] == report["beta"]["status"] == "up-to-date"
+    assert report["alpha"]["missing"] == []
+    assert (tmp_path / "alpha" / creator.FLEET_REMOTE_DIR / "setup_vscode_extension.py").exists()
+    assert report["broken"]["status"] == "failed"
+    assert report["broken"]["error"].startswith("check:")
+
+    # Targets that were up to date are skipped until --force
+    creator.run_fleet(inventory)
+    report = last_report(creator.FLEET_DIR)
+    assert report["alpha"]["status"] == "skipped"
+    assert report["broken"]["status"] == "failed"
+    creator.run_fleet(inventory, force=True)
+    assert last_report(creator.FLEET_DIR)["alpha"]["status"] == "up-to-date"
+
+
+def test_inventory_validation(tmp_path):
+    path = tmp_path / "inventory.json"
+    path.write_text(json.dumps([{"transport": "local"}]))
+    with pytest.raises(ValueError, match="missing 'root'"):
+        creator.load_fleet_inventory(str(path))
+    path.write_text(json.dumps([{"transport": "telnet", "host": "a"}]))
+    with pytest.raises(ValueError, match="unknown transport"):
+        creator.load_fleet_inventory(str(path))
+    path.write_text(json.dumps(["a.example", "a.example"]))
+    with pytest.raises(ValueError, match="duplicate"):
+        creator.load_fleet_inventory(str(path))
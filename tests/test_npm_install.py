@@ -0,0 +1,15 @@
+import pytest
+
+import setup_vscode_extension as creator
+
+
+def test_failed_npm_install_raises_and_removes_partial_node_modules(tmp_path, monkeypatch):
+    def failing_install(command, cwd=None, **kwargs):
+        (tmp_path / "node_modules" / "typescript").mkdir(parents=True)
+        return 1
+
+    monkeypatch.setattr(creator, "find_tool", lambda name: "/usr/bin/npm")
+    monkeypatch.setattr(creator, "run_command", failing_install)
+    with pytest.raises(RuntimeError, match="'npm install' exited with status 1"):
+        creator.install_extension_dependencies(str(tmp_path), mode="install")
+    assert not (tmp_path / "node_modules").exists()
@@ -0,0 +1,113 @@
+import http.server
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import setup_vscode_extension as creator
+
+
+class FakeUpstream(http.server.BaseHTTPRequestHandler):
+    """Serves a fixed set of paths and counts how often each one is requested."""
+    files = {}
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        if self.path not in self.files:
+            self.send_error(404)
+            return
+        content_type, body = self.files[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(server):
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def proxy(tmp_path, monkeypatch):
+    monkeypatch.setattr(creator, "REGISTRY_CACHE_DIR", str(tmp_path / "registry"))
+    monkeypatch.setattr(creator, "_registry_stats", {"hits": 0, "misses": 0, "stale": 0, "errors": 0})
+    upstream = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FakeUpstream)
+    upstream_url = start(upstream)
+    FakeUpstream.requests = []
+    FakeUpstream.files = {
+        "/left-pad": ("application/json", json.dumps(
+            {"name": "left-pad", "versions": {"1.3.0": {"dist": {"tarball": f"{upstream_url}/left-pad/-/left-pad-1.3.0.tgz"}}}}
+        ).encode()),
+        "/left-pad/-/left-pad-1.3.0.tgz": ("application/octet-stream", b"tarball bytes"),
+    }
+    server = creator.make_registry_proxy(0, {"npm": upstream_url})
+    proxy_url = start(server)
+    yield proxy_url, upstream, upstream_url
+    server.shutdown()
+    server.server_close()
+    upstream.shutdown()
+    upstream.server_close()
+
+
+def get(url):
+    with urllib.request.urlopen(url) as response:
+        return response.headers.get("X-Cache"), response.read()
+
+
+def test_artifacts_are_fetched_once(proxy):
+    proxy_url, _, _ = proxy
+    assert get(f"{proxy_url}/npm/left-pad/-/left-pad-1.3.0.tgz") == ("miss", b"tarball bytes")
+    assert get(f"{proxy_url}/npm/left-pad/-/left-pad-1.3.0.tgz") == ("hit", b"tarball bytes")
+    assert FakeUpstream.requests == ["/left-pad/-/left-pad-1.3.0.tgz"]
+
+
+def test_metadata_links_point_at_the_proxy(proxy):
+    proxy_url, _, upstream_url = proxy
+    outcome, body = get(f"{proxy_url}/npm/left-pad")
+    assert outcome == "miss"
+    tarball = json.loads(body)["versions"]["1.3.0"]["dist"]["tarball"]
+    assert tarball == f"{proxy_url}/npm/left-pad/-/left-pad-1.3.0.tgz"
+    assert upstream_url not in body.decode()
+
+
+def test_expired_metadata_is_revalidated(proxy, monkeypatch):
+    proxy_url, _, _ = proxy
+    get(f"{proxy_url}/npm/left-pad")
+    assert get(f"{proxy_url}/npm/left-pad")[0] == "hit"
+    monkeypatch.setattr(creator, "REGISTRY_METADATA_TTL", 0)
+    assert get(f"{proxy_url}/npm/left-pad")[0] == "miss"
+    assert FakeUpstream.requests == ["/left-pad", "/left-pad"]
+
+
+def test_stale_metadata_is_served_when_the_upstream_is_down(proxy, monkeypatch):
+    proxy_url, upstream, _ = proxy
+    get(f"{proxy_url}/npm/left-pad")
+    upstream.shutdown()
+    upstream.server_close()
+    monkeypatch.setattr(creator, "REGISTRY_METADATA_TTL", 0)
+    assert get(f"{proxy_url}/npm/left-pad")[0] == "stale"
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(f"{proxy_url}/npm/right-pad")
+    assert error.value.code == 502
+
+
+def test_upstream_errors_and_stats(proxy):
+    proxy_url, _, _ = proxy
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(f"{proxy_url}/npm/missing-package")
+    assert error.value.code == 404
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(f"{proxy_url}/unknown/left-pad")
+    assert error.value.code == 404
+    get(f"{proxy_url}/npm/left-pad")
+    get(f"{proxy_url}/npm/left-pad")
+    stats = json.loads(get(f"{proxy_url}/-/stats")[1])
+    assert (stats["hits"], stats["misses"]) == (1, 1)
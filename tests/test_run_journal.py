@@ -0,0 +1,54 @@
+import pytest
+
+import setup_vscode_extension as creator
+
+
+@pytest.fixture
+def fake_run(tmp_path, monkeypatch):
+    """Point the journal at a temporary directory and replace provisioning with two fake steps."""
+    monkeypatch.setattr(creator, "RUN_JOURNAL_DIR", str(tmp_path / "runs"))
+    monkeypatch.setattr(creator, "COMMAND_LOG_DIR", str(tmp_path / "logs"))
+    calls = []
+    outcome = {"server": RuntimeError("download failed")}
+
+    def step(name):
+        def run():
+            calls.append(name)
+            if outcome.get(name):
+                raise outcome[name]
+        return {"func": run, "deps": [], "resources": {}}
+
+    monkeypatch.setattr(creator, "PROVISION_STEPS", {"toolchain": step("toolchain"),
+                                                     "server": dict(step("server"), deps=["toolchain"])})
+    monkeypatch.setattr(creator, "provision_steps_for_languages", lambda languages, generator=None: ["toolchain", "server"])
+    monkeypatch.setattr(creator, "create_project", lambda *args: calls.append("create") or str(tmp_path / "project"))
+    inputs = {"name": "Demo", "description": "", "language": "go", "framework": "Gin", "base_dir": str(tmp_path)}
+    return inputs, calls, outcome
+
+
+def test_resume_skips_completed_steps(fake_run):
+    inputs, calls, outcome = fake_run
+    journal = creator.start_run_journal(inputs)
+    with pytest.raises(RuntimeError, match="Provisioning failed for: server"):
+        creator.run_journaled_create(journal)
+    assert calls == ["toolchain", "server"]
+
+    outcome.clear()
+    calls.clear()
+    assert creator.resume_run().endswith("project")
+    assert calls == ["server", "create"]
+    assert creator.load_latest_run_journal() is None
+
+
+def test_journal_owned_by_a_live_process_is_not_resumed(fake_run):
+    inputs, _, _ = fake_run
+    journal = creator.start_run_journal(inputs)
+    assert creator.load_latest_run_journal() is None
+    journal["pid"] = 2 ** 22 + 1
+    creator.save_run_journal(journal)
+    assert creator.load_latest_run_journal()["run_id"] == journal["run_id"]
+
+
+def test_nothing_to_resume(fake_run, capsys):
+    assert creator.resume_run() is None
+    assert "no incomplete run" in capsys.readouterr().out
@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+import setup_vscode_extension as creator
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="the shell session is POSIX-only")
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PATH", os.environ["PATH"])
+    yield tmp_path
+    creator.close_shell_session()
+
+
+def test_state_carries_over_between_commands(session):
+    (session / "sub").mkdir()
+    assert creator.run_in_shell_session("export DEMO_VALUE=kept; cd sub") == 0
+    assert os.getcwd() == str((session / "sub").resolve())
+    assert creator.run_in_shell_session('test "$DEMO_VALUE" = kept') == 0
+    assert creator.run_in_shell_session("exit_with() { return $1; }; exit_with 3") == 3
+    assert creator.run_in_shell_session('test "$?" = 3') == 0
+
+
+def test_exported_path_is_synced(session):
+    assert creator.run_in_shell_session(f'export PATH="{session}:$PATH"') == 0
+    assert os.environ["PATH"].split(os.pathsep)[0] == str(session)
+
+
+def test_shell_exit_is_reported(session):
+    assert creator.run_in_shell_session("exit 0") is None
+    assert creator.run_in_shell_session("true") == 0
@@ -0,0 +1,48 @@
+"""Checks the built-in language-server renderer against a recorded generator run.
+
+The fixture is the output of one real run, recorded with:
+
+    yo code --type=ext-language-server --extensionName="Parity Check" --extensionDisplayName="Parity Check" \
+        --extensionDescription="Template parity check" --extensionIdentifier=parity-check \
+        --gitInit=false --pkgManager=npm --skip-install
+    mv parity-check tests/fixtures/ext-language-server
+
+Re-record it, and bump LANGUAGE_SERVER_TEMPLATE_VERSION, whenever the generator's template changes.
+"""
+import json
+import os
+
+import pytest
+
+import setup_vscode_extension as creator
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "ext-language-server")
+
+
+def render(tmp_path):
+    creator.render_extension_project(str(tmp_path), "Parity Check", "parity-check", "Template parity check",
+                                     install_dependencies=False)
+    return creator._list_project_files(os.path.join(str(tmp_path), "parity-check"))
+
+
+@pytest.mark.skipif(not os.path.isdir(FIXTURE_DIR), reason="no recorded generator run in tests/fixtures")
+def test_renderer_matches_recorded_generator_output(tmp_path):
+    rendered = render(tmp_path)
+    recorded = creator._list_project_files(FIXTURE_DIR)
+    assert sorted(rendered) == sorted(recorded)
+    for relpath, path in recorded.items():
+        with open(path, encoding="utf-8") as expected, open(rendered[relpath], encoding="utf-8") as actual:
+            assert actual.read() == expected.read(), relpath
+
+
+def test_renderer_substitutes_every_placeholder(tmp_path):
+    rendered = render(tmp_path)
+    for relpath, path in rendered.items():
+        with open(path, encoding="utf-8") as file:
+            content = file.read()
+        assert "__EXTENSION_" not in content, relpath
+        if relpath.endswith("package.json"):
+            json.loads(content)
+    with open(rendered["package.json"], encoding="utf-8") as file:
+        manifest = json.load(file)
+    assert (manifest["name"], manifest["displayName"]) == ("parity-check", "Parity Check")
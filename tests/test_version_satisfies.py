@@ -0,0 +1,32 @@
+import pytest
+
+import setup_vscode_extension as creator
+
+
+@pytest.mark.parametrize("version, requirement, expected", [
+    ("4.3.1", "*", True),
+    ("4.3.1", "latest", True),
+    ("4.3.1", ">=4.0.0", True),
+    ("3.9.9", ">=4.0.0", False),
+    ("v1.7.0", ">=1.7.0", True),
+    ("1.7.0", "1.7.0", True),
+    ("1.7.1", "=1.7.0", False),
+    ("1.9.0", "^1.7.0", True),
+    ("2.0.0", "^1.7.0", False),
+    ("0.2.5", "^0.2.3", True),
+    ("0.3.0", "^0.2.3", False),
+    ("1.7.9", "~1.7.0", True),
+    ("1.8.0", "~1.7.0", False),
+    ("4.5.0", ">=4.0.0 <5.0.0", True),
+    ("5.0.0", ">=4.0.0 <5.0.0", False),
+    ("5", ">4", True),
+    ("4.0.0-beta.1", ">=4.0.0", True),
+    (None, "*", False),
+])
+def test_version_satisfies(version, requirement, expected):
+    assert creator.version_satisfies(version, requirement) is expected
+
+
+def test_invalid_version_is_rejected():
+    with pytest.raises(ValueError):
+        creator.version_satisfies("not-a-version", ">=1.0.0")
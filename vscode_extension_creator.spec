@@ -5,7 +5,7 @@ a = Analysis(
     ['setup_vscode_extension.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('templates', 'templates')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,69 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Startup-optimized build profile: a onedir bundle (no per-launch extraction to a temp
+# directory), no UPX decompression and a trimmed module set.
+#
+#   pyinstaller vscode_extension_creator_faststart.spec
+#
+# produces dist/vscode_extension_creator_faststart/vscode_extension_creator_faststart[.exe].
+
+
+a = Analysis(
+    ['setup_vscode_extension.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('templates', 'templates')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[
+        'tkinter',
+        'turtle',
+        'turtledemo',
+        'idlelib',
+        'unittest',
+        'doctest',
+        'pydoc',
+        'pydoc_data',
+        'lib2to3',
+        'distutils',
+        'setuptools',
+        'pkg_resources',
+        'pip',
+        'ensurepip',
+        'venv',
+        'xmlrpc',
+        'sqlite3',
+        'test',
+    ],
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='vscode_extension_creator_faststart',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='vscode_extension_creator_faststart',
+)